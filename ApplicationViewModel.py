@@ -1,13 +1,15 @@
 import logging
+import os
+import sys
 
-import requests
 from PySide2 import QtCore, QtNetwork
-from sys import platform
 
 from shared.components.NetworkImage import NetworkImage
 from util.lastfm import LastfmApiWrapper, LastfmSession
 from util.art_provider import ArtProvider
 from util.spotify_api import SpotifyApiWrapper
+from util.connectivity import ConnectivityMonitor
+from util.image_cache import ImageDiskCache
 from util import db_helper
 
 class ApplicationViewModel(QtCore.QObject):
@@ -38,7 +40,7 @@ class ApplicationViewModel(QtCore.QObject):
     self.__is_in_mini_mode: bool = None
 
     # Check operating system to dynamically adjust tray icon
-    if platform == 'win32':
+    if sys.platform == 'win32':
         self.__is_windows: bool = True
     else:
         self.__is_windows: bool = False
@@ -48,9 +50,26 @@ class ApplicationViewModel(QtCore.QObject):
     self.network_manager = QtNetwork.QNetworkAccessManager()
     NetworkImage.NETWORK_MANAGER = self.network_manager
 
+    # Keep downloaded images on disk (next to the database) so art that was seen before loads without the network
+    # on the next launch
+    image_cache_directory = os.path.join(db_helper.get_data_directory(), 'LastRedux-image-cache')
+
+    try:
+      NetworkImage.DISK_IMAGE_CACHE = ImageDiskCache(image_cache_directory)
+    except OSError as err:
+      logging.warning(f'Could not open the image cache: {err}')
+
+    if NetworkImage.DISK_IMAGE_CACHE and QtCore.QCoreApplication.instance():
+      QtCore.QCoreApplication.instance().aboutToQuit.connect(NetworkImage.DISK_IMAGE_CACHE.close)
+
     # Connect to SQLite
     db_helper.connect()
 
+    # Keep is_offline up to date in the background (it starts out assuming the internet can be reached)
+    self.connectivity_monitor = ConnectivityMonitor(self)
+    self.connectivity_monitor.is_online_changed.connect(lambda is_online: self.__set_is_offline(not is_online))
+    self.connectivity_monitor.probe()
+
   def log_in_after_onboarding(self, session: LastfmSession, media_player_preference: str) -> None:
     '''Save new login details to db, log in, and close onboarding'''
 
@@ -64,13 +83,6 @@ class ApplicationViewModel(QtCore.QObject):
     self.__set_is_logged_in(True)
     self.closeOnboarding.emit()
 
-  def update_is_offline(self) -> None:
-    try:
-      requests.get('https://1.1.1.1')
-      self.__set_is_offline(False)
-    except requests.exceptions.ConnectionError:
-      self.__set_is_offline(True)
-
   # --- Slots ---
 
   @QtCore.Slot()
@@ -1,13 +1,20 @@
-from dataclasses import asdict
-
 from PySide2 import QtCore
 
 from HistoryViewModel import HistoryViewModel
 from ApplicationViewModel import ApplicationViewModel
+from datatypes.Scrobble import Scrobble
+from util.variant_converter import CachedVariant
 
 class DetailsViewModel(QtCore.QObject):
   # Qt Property changed signals
   scrobble_changed = QtCore.Signal()
+  status_changed = QtCore.Signal()
+  is_current_scrobble_changed = QtCore.Signal()
+  track_changed = QtCore.Signal()
+  artist_changed = QtCore.Signal()
+  album_changed = QtCore.Signal()
+  images_changed = QtCore.Signal()
+  spotify_artists_changed = QtCore.Signal()
   is_player_paused_changed = QtCore.Signal()
   media_player_name_changed = QtCore.Signal()
   is_offline_changed = QtCore.Signal()
@@ -21,6 +28,59 @@ class DetailsViewModel(QtCore.QObject):
     # Store a reference to the application view model
     self.__application_reference: ApplicationViewModel = None
 
+    # Store the scrobble and loading status the view was last told about
+    self.__scrobble: Scrobble = None
+    self.__status = (False, False)
+
+    # Convert each section of the details pane for QML on its first read, so a change to one section (like a loved
+    # toggle or album art arriving) doesn't re-send the artist bio, tags and similar artists
+    self.__track = CachedVariant(lambda: self.__get_scrobble_field('lastfm_track'), self.track_changed)
+    self.__artist = CachedVariant(lambda: self.__get_scrobble_field('lastfm_artist'), self.artist_changed)
+    self.__album = CachedVariant(lambda: self.__get_scrobble_field('lastfm_album'), self.album_changed)
+    self.__images = CachedVariant(lambda: self.__get_scrobble_field('image_set'), self.images_changed)
+    self.__spotify_artists = CachedVariant(
+      lambda: self.__get_scrobble_field('spotify_artists'), self.spotify_artists_changed
+    )
+
+    # Pair each section with the signal that tells the view it changed
+    self.__sections = [
+      (self.__track, self.track_changed),
+      (self.__artist, self.artist_changed),
+      (self.__album, self.album_changed),
+      (self.__images, self.images_changed),
+      (self.__spotify_artists, self.spotify_artists_changed)
+    ]
+
+  # --- Private Methods ---
+
+  def __handle_selected_scrobble_changed(self) -> None:
+    '''Tell the view about only the sections of the selected scrobble that changed'''
+
+    new_scrobble = self.__history_reference.selected_scrobble
+
+    if new_scrobble is not self.__scrobble:
+      self.__scrobble = new_scrobble
+      self.scrobble_changed.emit()
+
+    new_status = (
+      self.__scrobble.is_loading if self.__scrobble else False,
+      self.__scrobble.has_error if self.__scrobble else False
+    )
+
+    if new_status != self.__status:
+      self.__status = new_status
+      self.status_changed.emit()
+
+    # The selected scrobble can stay the same while it stops being the current scrobble
+    self.is_current_scrobble_changed.emit()
+
+    for cached_variant, changed_signal in self.__sections:
+      if cached_variant.has_changed():
+        changed_signal.emit()
+
+  def __get_scrobble_field(self, field_name: str) -> object:
+    return getattr(self.__scrobble, field_name) if self.__scrobble else None
+
   # --- Qt Property Getters and Setters ---
 
   def set_history_reference(self, new_reference: HistoryViewModel) -> None:
@@ -30,9 +90,7 @@ class DetailsViewModel(QtCore.QObject):
     self.__history_reference = new_reference
 
     # Pass through signals from history view model
-    self.__history_reference.selected_scrobble_changed.connect(
-      lambda: self.scrobble_changed.emit()
-    )
+    self.__history_reference.selected_scrobble_changed.connect(self.__handle_selected_scrobble_changed)
     self.__history_reference.is_player_paused_changed.connect(
       lambda: self.is_player_paused_changed.emit()
     )
@@ -41,7 +99,7 @@ class DetailsViewModel(QtCore.QObject):
     )
 
     # Update details view immediately after connecting
-    self.scrobble_changed.emit()
+    self.__handle_selected_scrobble_changed()
     self.media_player_name_changed.emit()
 
   def set_application_reference(self, new_reference: ApplicationViewModel) -> None:
@@ -69,22 +127,79 @@ class DetailsViewModel(QtCore.QObject):
     fset=set_history_reference
   )
 
-  scrobble = QtCore.Property(
-    type='QVariant',
-    fget=lambda self: (
-      asdict(self.__history_reference.selected_scrobble)
-      if self.__history_reference.selected_scrobble else None
-    ) if self.__history_reference else None,
+  hasScrobble = QtCore.Property(
+    type=bool,
+    fget=lambda self: self.__scrobble is not None,
+    notify=scrobble_changed
+  )
+
+  trackTitle = QtCore.Property(
+    type=str,
+    fget=lambda self: self.__scrobble.track_title if self.__scrobble else None,
+    notify=scrobble_changed
+  )
+
+  artistName = QtCore.Property(
+    type=str,
+    fget=lambda self: self.__scrobble.artist_name if self.__scrobble else None,
     notify=scrobble_changed
   )
 
+  albumTitle = QtCore.Property(
+    type=str,
+    fget=lambda self: self.__scrobble.album_title if self.__scrobble else None,
+    notify=scrobble_changed
+  )
+
+  isLoading = QtCore.Property(
+    type=bool,
+    fget=lambda self: self.__status[0],
+    notify=status_changed
+  )
+
+  hasError = QtCore.Property(
+    type=bool,
+    fget=lambda self: self.__status[1],
+    notify=status_changed
+  )
+
+  track = QtCore.Property(
+    type='QVariant',
+    fget=lambda self: self.__track.get(),
+    notify=track_changed
+  )
+
+  artist = QtCore.Property(
+    type='QVariant',
+    fget=lambda self: self.__artist.get(),
+    notify=artist_changed
+  )
+
+  album = QtCore.Property(
+    type='QVariant',
+    fget=lambda self: self.__album.get(),
+    notify=album_changed
+  )
+
+  images = QtCore.Property(
+    type='QVariant',
+    fget=lambda self: self.__images.get(),
+    notify=images_changed
+  )
+
+  spotifyArtists = QtCore.Property(
+    type='QVariant',
+    fget=lambda self: self.__spotify_artists.get(),
+    notify=spotify_artists_changed
+  )
+
   isCurrentScrobble = QtCore.Property(
     type=bool,
     fget=lambda self: (
       self.__history_reference.get_selected_scrobble_index() == -1
       if self.__history_reference else None
     ),
-    notify=scrobble_changed
+    notify=is_current_scrobble_changed
   )
 
   isOffline = QtCore.Property(
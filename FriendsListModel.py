@@ -3,6 +3,7 @@ from typing import Union
 from PySide2 import QtCore
 
 from FriendsViewModel import FriendsViewModel
+from util.data_change_batcher import DataChangeBatcher
 
 class FriendsListModel(QtCore.QAbstractListModel):
   __URL_ROLE = QtCore.Qt.UserRole
@@ -18,11 +19,14 @@ class FriendsListModel(QtCore.QAbstractListModel):
   __IS_TRACK_LOVED_ROLE = QtCore.Qt.UserRole + 10
   __IS_LOADING_ROLE = QtCore.Qt.UserRole + 11
 
-  def __int__(self, parent=None):
+  def __init__(self, parent=None):
     QtCore.QAbstractListModel.__init__(self, parent)
 
     self.__friends_reference = None
 
+    # Album art for every friend arrives at about the same time, so send the changes once per frame
+    self.__data_change_batcher = DataChangeBatcher(self)
+
   # --- Qt Property Getters and Setters ---
 
   def get_friends_reference(self) -> None:
@@ -34,17 +38,47 @@ class FriendsListModel(QtCore.QAbstractListModel):
       self.__friends_reference = newReference
       self.endResetModel()
 
-      self.__friends_reference.begin_refresh_friends.connect(lambda: self.beginResetModel())
+      self.__friends_reference.begin_refresh_friends.connect(self.__begin_refresh)
       self.__friends_reference.end_refresh_friends.connect(lambda: self.endResetModel())
+      self.__friends_reference.pre_insert_friends.connect(self.__begin_insert_friends)
+      self.__friends_reference.post_insert_friends.connect(lambda: self.endInsertRows())
+      self.__friends_reference.pre_remove_friends.connect(self.__begin_remove_friends)
+      self.__friends_reference.post_remove_friends.connect(lambda: self.endRemoveRows())
+      self.__friends_reference.pre_move_friend.connect(self.__begin_move_friend)
+      self.__friends_reference.post_move_friend.connect(lambda: self.endMoveRows())
+      self.__friends_reference.friends_data_changed.connect(self.__friends_data_changed)
       self.__friends_reference.album_image_url_changed.connect(self.__track_album_image_url_changed)
 
   # --- List Model Implementation ---
 
+  def __begin_refresh(self) -> None:
+    self.__data_change_batcher.discard()
+    self.beginResetModel()
+
+  def __begin_insert_friends(self, first_row: int, last_row: int) -> None:
+    # Send queued changes first since they refer to rows by their current position
+    self.__data_change_batcher.flush()
+    self.beginInsertRows(QtCore.QModelIndex(), first_row, last_row)
+
+  def __begin_remove_friends(self, first_row: int, last_row: int) -> None:
+    self.__data_change_batcher.flush()
+    self.beginRemoveRows(QtCore.QModelIndex(), first_row, last_row)
+
+  def __begin_move_friend(self, row: int, destination_row: int) -> None:
+    '''Move one row in front of destination_row (counted before the move)'''
+
+    self.__data_change_batcher.flush()
+    self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), destination_row)
+
+  def __friends_data_changed(self, first_row: int, last_row: int) -> None:
+    '''Tell the list model that a friend's track or loading status changed'''
+
+    self.__data_change_batcher.mark_changed(first_row, last_row, list(self.roleNames()))
+
   def __track_album_image_url_changed(self, row: int) -> None:
     '''Tell the list model that the album image url has changed'''
 
-    index = self.createIndex(row, 0)
-    self.dataChanged.emit(index, index, [self.__TRACK_IMAGE_URL])
+    self.__data_change_batcher.mark_changed(row, row, [self.__TRACK_IMAGE_URL])
 
   def roleNames(self) -> dict:
     '''Create a mapping of our enum ints to their JS object key names'''
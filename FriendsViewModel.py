@@ -1,12 +1,13 @@
 import logging
-import copy
-from typing import List
+from bisect import bisect_left
+from typing import Dict, List, Set, Tuple
 
 from PySide2 import QtCore
 
 from ApplicationViewModel import ApplicationViewModel
 from tasks import FetchFriends, FetchFriendScrobble, FetchFriendScrobbleArt
 from util.lastfm import LastfmUser
+from util.helpers import group_consecutive_rows
 from datatypes.Friend import Friend
 from datatypes.FriendScrobble import FriendScrobble
 
@@ -17,6 +18,13 @@ class FriendsViewModel(QtCore.QObject):
   # Friends list model signals
   begin_refresh_friends = QtCore.Signal()
   end_refresh_friends = QtCore.Signal()
+  pre_insert_friends = QtCore.Signal(int, int)
+  post_insert_friends = QtCore.Signal()
+  pre_remove_friends = QtCore.Signal(int, int)
+  post_remove_friends = QtCore.Signal()
+  pre_move_friend = QtCore.Signal(int, int)
+  post_move_friend = QtCore.Signal()
+  friends_data_changed = QtCore.Signal(int, int)
   is_loading_changed = QtCore.Signal()
   album_image_url_changed = QtCore.Signal(int)
 
@@ -30,12 +38,15 @@ class FriendsViewModel(QtCore.QObject):
   def reset_state(self) -> None:
     # Store friends provided to the list model
     self.friends: List[Friend] = []
+
+    # Map usernames to their rows in friends (rebuilt once per update and kept up to date as rows move)
+    self.__friend_rows: Dict[str, int] = {}
     
-    # Store friends that are being processed before being pushed to list model
-    self.__new_friends: List[Friend] = []
+    # Store the usernames of friends whose tracks are loading, in the order their tasks were started
+    self.__loading_usernames: List[str] = []
 
-    self.__did_any_friend_scrobble_change: bool = None
-    self.__new_friends_with_track_loaded_count: int = 0
+    self.__changed_scrobble_usernames: Set[str] = set()
+    self.__friends_with_track_loaded_count: int = 0
     self.__should_show_loading_indicator: bool = False
     self.__is_loading: bool = False
 
@@ -68,8 +79,12 @@ class FriendsViewModel(QtCore.QObject):
 
   # --- Private Methods ---
 
+  def __handle_is_offline_changed(self) -> None:
+    if self.__is_enabled and not self.__application_reference.is_offline:
+      self.loadFriends()
+
   def __handle_lastfm_friends_fetched(self, lastfm_users: List[LastfmUser], has_error: bool) -> None:
-    '''Create Friend objects from Last.fm friends and run tasks to fetch their current/recent tracks'''
+    '''Add and remove rows for friends that changed and run tasks to fetch their current/recent tracks'''
 
     if not self.__is_enabled:
       return
@@ -88,99 +103,188 @@ class FriendsViewModel(QtCore.QObject):
       
       return
 
-    # Create two sets of usernames to compare for differences (check if any friends were added/removed)
-    new_usernames = [user.username for user in lastfm_users]
-    current_usernames = [friend.username for friend in self.friends] # Will be [] on first load
-    friends_changed = set(new_usernames) != set(current_usernames)
-
-    # Load and sort new list of friends if it doesn't match the current one
-    if friends_changed:
-      # Build Friend objects and save them to a temporary list
-      self.__new_friends = sorted(
-        [Friend.from_lastfm_user(user) for user in lastfm_users],
-        key=lambda friend: friend.username.lower() # Sort alphabetically by username
-      )
+    # Remove rows of users who are no longer friends (bottom up so the rows above don't shift)
+    usernames = set(user.username for user in lastfm_users)
+    removed_rows = [row for row, friend in enumerate(self.friends) if friend.username not in usernames]
 
-      self.begin_refresh_friends.emit()
+    for first_row, last_row in reversed(group_consecutive_rows(removed_rows)):
+      self.pre_remove_friends.emit(first_row, last_row)
+      del self.friends[first_row:last_row + 1]
+      self.post_remove_friends.emit()
 
-      # Create copies of all of the Friend objects to prevent pass by reference
-      self.friends = copy.deepcopy(self.__new_friends)
+    # Add rows for new friends in one block at the bottom, they're moved into place once their tracks load
+    current_usernames = set(friend.username for friend in self.friends)
+    new_friends = sorted(
+      [Friend.from_lastfm_user(user) for user in lastfm_users if user.username not in current_usernames],
+      key=lambda friend: friend.username.lower() # Sort alphabetically by username
+    )
 
-      self.end_refresh_friends.emit()
+    if new_friends:
+      self.pre_insert_friends.emit(len(self.friends), len(self.friends) + len(new_friends) - 1)
+      self.friends.extend(new_friends)
+      self.post_insert_friends.emit()
+
+    self.__friend_rows = {friend.username: row for row, friend in enumerate(self.friends)}
 
     # Reset loading tracker
-    self.__new_friends_with_track_loaded_count = 0
-    self.__did_any_friend_scrobble_change = False
+    self.__loading_usernames = [user.username for user in lastfm_users]
+    self.__friends_with_track_loaded_count = 0
+    self.__changed_scrobble_usernames = set()
 
     # Load each friend's most recent/currently playing track
-    for i, friend in enumerate(self.__new_friends):
+    for i, username in enumerate(self.__loading_usernames):
       fetch_friend_scrobble_task = FetchFriendScrobble(
         lastfm=self.__application_reference.lastfm,
-        username=friend.username,
+        username=username,
         friend_index=i
       )
       fetch_friend_scrobble_task.finished.connect(self.__handle_friend_scrobble_fetched)
       QtCore.QThreadPool.globalInstance().start(fetch_friend_scrobble_task)
 
-  def __handle_friend_scrobble_fetched(self, new_friend_scrobble: FriendScrobble, friend_index: int) -> None:
-    if not self.__is_enabled:
+  def __handle_friend_scrobble_fetched(self, new_friend_scrobble: FriendScrobble, friend_index: int, has_error: bool) -> None:
+    if not self.__is_enabled or friend_index >= len(self.__loading_usernames):
       return
 
-    friend = self.__new_friends[friend_index]
-    friend.is_loading = False
-
-    if (
-      # There wasn't a scrobble but now there is one
-      not friend.last_scrobble and new_friend_scrobble
+    row = self.__friend_rows.get(self.__loading_usernames[friend_index])
 
-      # Latest scrobble changed
-      or friend.last_scrobble != new_friend_scrobble
-    ):
-      friend.last_scrobble = new_friend_scrobble
-      self.__did_any_friend_scrobble_change = True
-      
-    # Increment regardless of whether a track was actually found, we're keeping track of loading
-    self.__new_friends_with_track_loaded_count += 1
-
-    # Update UI when the last friend is loaded
-    if self.__new_friends_with_track_loaded_count == len(self.__new_friends):
-      # Move friends currently playing music to the top
-      self.__new_friends = sorted(
-        self.__new_friends,
-        key=lambda friend: bool(friend.last_scrobble.is_playing) if friend.last_scrobble else False, # bool because it might be None
-        reverse=True
-      )
+    if row is not None:
+      friend = self.friends[row]
+      did_row_change = friend.is_loading
+      friend.is_loading = False
 
-      # Move friends with no track to the bottom
-      self.__new_friends = sorted(
-        self.__new_friends, 
-        key=lambda friend: bool(friend.last_scrobble),
-        reverse=True
-      )
+      # Keep the current scrobble object (and the album art already loaded for it) if the track didn't change
+      # If the request failed, keep showing the last track that loaded
+      if not has_error and friend.last_scrobble != new_friend_scrobble:
+        friend.last_scrobble = new_friend_scrobble
+        self.__changed_scrobble_usernames.add(friend.username)
+        did_row_change = True
 
-      if not self.friends or self.__did_any_friend_scrobble_change:
-        self.begin_refresh_friends.emit()
-        self.friends = self.__new_friends
-        self.end_refresh_friends.emit()
-
-        # Start loading album art for friend tracks
-        for row, friend in enumerate(self.friends):
-          if not friend.last_scrobble or not friend.last_scrobble.is_playing:
-            continue
-
-          fetch_album_art_task = FetchFriendScrobbleArt(
-            art_provider=self.applicationReference.art_provider,
-            friend_scrobble=friend.last_scrobble,
-            row_in_friends_list=row
-          )
-          fetch_album_art_task.finished.connect(
-            lambda row_in_list: self.album_image_url_changed.emit(row_in_list)
-          )
-          QtCore.QThreadPool.globalInstance().start(fetch_album_art_task)
+      if did_row_change:
+        self.friends_data_changed.emit(row, row)
 
+    # Increment regardless of whether a track was actually found, we're keeping track of loading
+    self.__friends_with_track_loaded_count += 1
+
+    # Reorder the list once the last friend is loaded
+    if self.__friends_with_track_loaded_count == len(self.__loading_usernames):
+      self.__move_friends_into_order()
+
+      # Start loading album art for friend tracks that changed
+      for friend in self.friends:
+        if (
+          friend.username not in self.__changed_scrobble_usernames
+          or not friend.last_scrobble
+          or not friend.last_scrobble.is_playing
+        ):
+          continue
+
+        fetch_album_art_task = FetchFriendScrobbleArt(
+          art_provider=self.__application_reference.art_provider,
+          username=friend.username,
+          friend_scrobble=friend.last_scrobble
+        )
+        fetch_album_art_task.finished.connect(self.__handle_friend_scrobble_art_fetched)
+        QtCore.QThreadPool.globalInstance().start(fetch_album_art_task)
+
+      self.__loading_usernames = []
       self.__is_loading = False
       self.is_loading_changed.emit()
 
+  def __handle_friend_scrobble_art_fetched(self, username: str, friend_scrobble: FriendScrobble) -> None:
+    '''Update the art of the row showing the scrobble (it might have moved since the art was requested)'''
+
+    if not self.__is_enabled:
+      return
+
+    row = self.__friend_rows.get(username)
+
+    if row is not None and self.friends[row].last_scrobble is friend_scrobble:
+      self.album_image_url_changed.emit(row)
+
+  def __index_friend_rows(self, first_row: int, last_row: int) -> None:
+    '''Update the rows of the friends between first_row and last_row (inclusive) after they moved'''
+
+    for row in range(first_row, last_row + 1):
+      self.__friend_rows[self.friends[row].username] = row
+
+  def __move_friends_into_order(self) -> None:
+    '''
+    Sort the friends with one composite key and move only the rows that are out of place
+
+    Friends in the longest run that's already in sorted order stay put, and every other friend is moved to just
+    after the friend that comes before it in the sorted list, so unchanged rows keep their delegates
+    '''
+
+    sorted_friends = sorted(self.friends, key=FriendsViewModel.__get_sort_key)
+    sorted_rows = {id(friend): sorted_row for sorted_row, friend in enumerate(sorted_friends)}
+    staying_friend_ids = set(
+      id(self.friends[row])
+      for row in FriendsViewModel.__get_longest_increasing_run([sorted_rows[id(friend)] for friend in self.friends])
+    )
+
+    for sorted_row, friend in enumerate(sorted_friends):
+      if id(friend) in staying_friend_ids:
+        continue
+
+      current_row = self.__friend_rows[friend.username]
+      destination_row = self.__friend_rows[sorted_friends[sorted_row - 1].username] + 1 if sorted_row else 0
+
+      # The destination is the row the friend is moved in front of, counted before the move like Qt does
+      if destination_row in (current_row, current_row + 1):
+        continue
+
+      self.pre_move_friend.emit(current_row, destination_row)
+      new_row = destination_row - 1 if destination_row > current_row else destination_row
+      del self.friends[current_row]
+      self.friends.insert(new_row, friend)
+      self.post_move_friend.emit()
+
+      # Only the rows between the old and new row shifted
+      self.__index_friend_rows(min(current_row, new_row), max(current_row, new_row))
+
+  @staticmethod
+  def __get_sort_key(friend: Friend) -> Tuple[bool, bool, str]:
+    '''Sort friends that are playing music first, then ones with a track, then alphabetically by username'''
+
+    return (
+      not friend.last_scrobble,
+      not (friend.last_scrobble and friend.last_scrobble.is_playing),
+      friend.username.lower()
+    )
+
+  @staticmethod
+  def __get_longest_increasing_run(values: List[int]) -> List[int]:
+    '''Get the indexes of the longest increasing subsequence of values'''
+
+    # Index of the smallest last value of an increasing subsequence of each length found so far
+    tail_indexes: List[int] = []
+
+    # The values at tail_indexes, kept alongside them so each step can bisect without building a list
+    tail_values: List[int] = []
+    previous_indexes: List[int] = [None] * len(values)
+
+    for i, value in enumerate(values):
+      length = bisect_left(tail_values, value)
+
+      if length > 0:
+        previous_indexes[i] = tail_indexes[length - 1]
+
+      if length == len(tail_indexes):
+        tail_indexes.append(i)
+        tail_values.append(value)
+      else:
+        tail_indexes[length] = i
+        tail_values[length] = value
+
+    indexes = []
+    i = tail_indexes[-1] if tail_indexes else None
+
+    while i is not None:
+      indexes.append(i)
+      i = previous_indexes[i]
+
+    return indexes[::-1]
+
   # --- Qt Property Getters and Setters ---
 
   def set_application_reference(self, new_reference: ApplicationViewModel) -> None:
@@ -193,6 +297,9 @@ class FriendsViewModel(QtCore.QObject):
       lambda: self.set_is_enabled(self.__application_reference.is_logged_in)
     )
 
+    # Catch up on friends' tracks once the connection is back (loads are skipped while offline)
+    self.__application_reference.is_offline_changed.connect(self.__handle_is_offline_changed)
+
   def set_is_enabled(self, is_enabled: bool) -> None:
     self.__is_enabled = is_enabled
     self.is_enabled_changed.emit()
@@ -202,7 +309,6 @@ class FriendsViewModel(QtCore.QObject):
     else:
       self.begin_refresh_friends.emit()
       self.reset_state()
-      self.should_show_loading_indicator_changed.emit()
       self.end_refresh_friends.emit()
 
     self.is_loading_changed.emit()
@@ -1,8 +1,8 @@
-from sys import platform
-
 from PySide2 import QtCore
 
 from HistoryViewModel import HistoryViewModel
+from util.scrobble_history import HistoryRowCache
+from util.data_change_batcher import DataChangeBatcher
 
 class HistoryListModel(QtCore.QAbstractListModel):
   # Store role constants that are used as object keys in JS
@@ -13,26 +13,63 @@ class HistoryListModel(QtCore.QAbstractListModel):
   __ALBUM_IMAGE_URL_ROLE = QtCore.Qt.UserRole + 4
   __HAS_LASTFM_DATA = QtCore.Qt.UserRole + 5
 
+  # Map roles to the position of their value in a row record
+  __RECORD_INDEXES_BY_ROLE = {
+    __TRACK_TITLE_ROLE: HistoryRowCache.TRACK_TITLE,
+    __ARTIST_NAME_ROLE: HistoryRowCache.ARTIST_NAME,
+    __TIMESTAMP_ROLE: HistoryRowCache.TIMESTAMP,
+    __LASTFM_IS_LOVED_ROLE: HistoryRowCache.LASTFM_IS_LOVED,
+    __ALBUM_IMAGE_URL_ROLE: HistoryRowCache.ALBUM_IMAGE_URL,
+    __HAS_LASTFM_DATA: HistoryRowCache.HAS_LASTFM_DATA
+  }
+
   def __init__(self, parent=None): # parent=None because it isn't within another list
     QtCore.QAbstractListModel.__init__(self, parent)
 
     # Store reference to application view model
     self.__history_reference = None
+
+    # Store what the rows around the visible ones show so reading a role doesn't go back to the columns
+    self.__row_cache = HistoryRowCache(self.__get_columns, self.__load_row_data)
+
+    # Send row changes to the view at most once per frame since rows change several times as their data loads
+    self.__data_change_batcher = DataChangeBatcher(self)
+
+  def __get_columns(self):
+    return self.__history_reference.scrobble_history.columns
+
+  def __load_row_data(self, row):
+    # Rows are read as they scroll into view, so load their Last.fm data and art in that order
+    self.__history_reference.load_scrobble_row_data(row)
+
+  def __insert_rows(self, first_row, last_row):
+    # Send queued changes while their rows still point to the same scrobbles
+    self.__data_change_batcher.flush()
+
+    self.beginInsertRows(QtCore.QModelIndex(), first_row, last_row)
+    self.__row_cache.reset()
+
+  def __begin_refresh(self):
+    self.__data_change_batcher.discard()
+    self.beginResetModel()
+
+  def __end_refresh(self):
+    self.__row_cache.reset()
+    self.endResetModel()
   
-  def __scrobble_album_image_changed(self, row):
-    '''Tell Qt that the scrobble album image has changed'''
+  def __scrobble_album_image_changed(self, first_row, last_row):
+    '''Tell Qt that the album images of a range of scrobbles have changed'''
 
-    # Create a QModelIndex from the row index
-    index = self.createIndex(row, 0)
+    self.__row_cache.invalidate_rows(first_row, last_row)
 
-    # Use list model dataChanged signal to indicate that UI needs to be updated at index
-    self.dataChanged.emit(index, index, [self.__ALBUM_IMAGE_URL_ROLE, self.__HAS_LASTFM_DATA]) # index twice because start and end range
+    # Use list model dataChanged signal to indicate that UI needs to be updated in the range
+    self.__data_change_batcher.mark_changed(first_row, last_row, [self.__ALBUM_IMAGE_URL_ROLE, self.__HAS_LASTFM_DATA])
 
-  def __scrobble_lastfm_is_loved_changed(self, row):
-    '''Tell the Qt that the track loved status has changed'''
+  def __scrobble_lastfm_is_loved_changed(self, first_row, last_row):
+    '''Tell the Qt that the track loved status of a range of scrobbles has changed'''
 
-    index = self.createIndex(row, 0)
-    self.dataChanged.emit(index, index, [self.__LASTFM_IS_LOVED_ROLE])
+    self.__row_cache.invalidate_rows(first_row, last_row)
+    self.__data_change_batcher.mark_changed(first_row, last_row, [self.__LASTFM_IS_LOVED_ROLE])
 
   # --- Qt Property Getters and Setters ---
 
@@ -45,17 +82,17 @@ class HistoryListModel(QtCore.QAbstractListModel):
       # Tell the list model that the entirety of the list will be replaced (not just change one item)
       self.beginResetModel()
       self.__history_reference: HistoryViewModel = new_reference
-      self.endResetModel()
+      self.__end_refresh()
       
-      # Tell Qt that a new row at the top of the list will be added
-      self.__history_reference.pre_append_scrobble.connect(lambda: self.beginInsertRows(QtCore.QModelIndex(), 0, 0)) # 0 and 0 are start and end indices
+      # Tell Qt that new rows will be inserted between the first and last indices
+      self.__history_reference.pre_insert_scrobbles.connect(self.__insert_rows)
 
-      # Tell Qt that a row has been added
-      self.__history_reference.post_append_scrobble.connect(lambda: self.endInsertRows())
+      # Tell Qt that the rows have been added
+      self.__history_reference.post_insert_scrobbles.connect(lambda: self.endInsertRows())
 
       # Tell Qt that we are beginning and ending a full refresh of the model
-      self.__history_reference.begin_refresh_history.connect(lambda: self.beginResetModel())
-      self.__history_reference.end_refresh_history.connect(lambda: self.endResetModel())
+      self.__history_reference.begin_refresh_history.connect(self.__begin_refresh)
+      self.__history_reference.end_refresh_history.connect(self.__end_refresh)
 
       # Connect row data changed signals
       self.__history_reference.scrobble_album_image_changed.connect(self.__scrobble_album_image_changed)
@@ -97,26 +134,26 @@ class HistoryListModel(QtCore.QAbstractListModel):
     ):
       return
 
-    scrobble = self.__history_reference.scrobble_history[index.row()]
-
-    if role == self.__TRACK_TITLE_ROLE:
-      return scrobble.track_title
-    elif role == self.__ARTIST_NAME_ROLE:
-      return scrobble.artist_name
-    elif role == self.__ALBUM_IMAGE_URL_ROLE:
-      return scrobble.image_set.small_url if scrobble.image_set else ''
-    elif role == self.__LASTFM_IS_LOVED_ROLE:
-      return scrobble.lastfm_track.is_loved if scrobble.lastfm_track else False
-    elif role == self.__TIMESTAMP_ROLE:
-      if platform == 'win32':
-        return scrobble.timestamp.strftime('%#m/%#d/%y %#I:%M:%S %p')
-      else:
-        return scrobble.timestamp.strftime('%-m/%-d/%y %-I:%M:%S %p')
-    elif role == self.__HAS_LASTFM_DATA:
-      return scrobble.lastfm_track is not None
-
-    # Return no data if we don't have a reference to the scrobble history view model
-    return None
+    record_index = HistoryListModel.__RECORD_INDEXES_BY_ROLE.get(role)
+
+    if record_index is None:
+      return None
+
+    return self.__row_cache.get(index.row())[record_index]
+
+  def canFetchMore(self, parent=QtCore.QModelIndex()):
+    '''Tell the list whether scrolling to the bottom can load older scrobbles'''
+
+    if self.__history_reference and not parent.isValid():
+      return self.__history_reference.can_fetch_older_scrobbles()
+
+    return False
+
+  def fetchMore(self, parent=QtCore.QModelIndex()):
+    '''Fetch the next page of older scrobbles (rows are inserted once it arrives)'''
+
+    if self.__history_reference and not parent.isValid():
+      self.__history_reference.fetch_older_scrobbles()
 
   # --- Qt Properties ---
 
@@ -1,44 +1,53 @@
 import logging
 import os
-from dataclasses import asdict
+import time
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Set, Tuple
 
 from PySide2 import QtCore
 from ScriptingBridge import SBApplication
-from pypresence import Presence
-from pypresence.exceptions import InvalidID
 
 from tasks import (
   FetchPlayerPosition,
-  LoadLastfmTrackInfo,
-  LoadLastfmArtistInfo,
-  LoadLastfmAlbumInfo,
-  LoadTrackImages,
-  UpdateTrackLoveOnLastfm,
+  RunEnrichmentStage,
   FetchRecentScrobbles,
-  SubmitScrobble,
-  UpdateNowPlaying
+  SubmitScrobble
 )
-from util.lastfm import LastfmList, LastfmScrobble
+from util.lastfm import LastfmList, LastfmScrobble, LastfmTrack
 from plugins.MediaPlayerPlugin import MediaPlayerPlugin
 from plugins.MockPlayerPlugin import MockPlayerPlugin
 from plugins.macOS.music_app import MusicAppPlugin
 from plugins.macOS.SpotifyPlugin import SpotifyPlugin
 from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
 from datatypes.TrackCrop import TrackCrop
 from datatypes.MediaPlayerState import MediaPlayerState
+from datatypes.LoadGeneration import LoadGeneration
 from ApplicationViewModel import ApplicationViewModel
-import util.helpers as helpers
+from util.scrobble_history import ScrobbleHistory, HistorySnapshot
+from util.entity_store import EntityStore
+from util.enrichment import EnrichmentPipeline, EnrichmentRun, EnrichmentStage
+from util.now_playing import NowPlayingManager
+from util.variant_converter import CachedVariant
+from util.track_love_queue import TrackLoveQueue
+from util.discord_presence import DiscordPresenceWorker
 from util import db_helper
+from util.helpers import group_consecutive_rows
 
 class HistoryViewModel(QtCore.QObject):
   # Constants
   __INITIAL_SCROBBLE_HISTORY_COUNT = int(os.environ.get('INITIAL_HISTORY_ITEMS', 30)) # 30 is the default but can be configured
+  __RESIDENT_SCROBBLE_HISTORY_COUNT = int(os.environ.get('RESIDENT_HISTORY_ITEMS', 200)) # Older scrobbles are spilled to disk
+  __HISTORY_PAGE_COUNT = int(os.environ.get('HISTORY_PAGE_ITEMS', 50)) # How many older scrobbles are fetched when scrolling down
+  __OLDER_SCROBBLE_ENRICHMENT_PRIORITY = -1 # Rows paged in by scrolling load after the selection and current scrobble
+  __IS_ENRICHMENT_EAGER = bool(os.environ.get('EAGER_ENRICHMENT')) # Load all data for every history row up front
+  __TRACK_SETTLE_INTERVAL = int(os.environ.get('TRACK_SETTLE_INTERVAL', 1000)) # How long (ms) a track plays before it's announced
+  __HISTORY_SNAPSHOT_INTERVAL = int(os.environ.get('HISTORY_SNAPSHOT_INTERVAL', 5 * 60 * 1000)) # How often (ms) the history is saved
+  __MIN_HISTORY_SYNC_INTERVAL = int(os.environ.get('MIN_HISTORY_SYNC_INTERVAL', 30 * 1000)) # Fastest (ms) other devices are checked
+  __MAX_HISTORY_SYNC_INTERVAL = int(os.environ.get('MAX_HISTORY_SYNC_INTERVAL', 5 * 60 * 1000)) # Slowest (ms) other devices are checked
   __MEDIA_PLAYER_POLLING_INTERVAL = 100 if os.environ.get('MOCK') else 1000
   __CURRENT_SCROBBLE_INDEX = -1
   __NO_SELECTION_INDEX = -2
-  __DISCORD_RPC_MAX_RETRIES = 5
 
   # Qt Property changed signals
   is_enabled_changed = QtCore.Signal()
@@ -54,10 +63,10 @@ class HistoryViewModel(QtCore.QObject):
   media_player_name_changed = QtCore.Signal()
   
   # Scrobble history list model signals
-  pre_append_scrobble = QtCore.Signal()
-  post_append_scrobble = QtCore.Signal()
-  scrobble_album_image_changed = QtCore.Signal(int)
-  scrobble_lastfm_is_loved_changed = QtCore.Signal(int)
+  pre_insert_scrobbles = QtCore.Signal(int, int)
+  post_insert_scrobbles = QtCore.Signal()
+  scrobble_album_image_changed = QtCore.Signal(int, int)
+  scrobble_lastfm_is_loved_changed = QtCore.Signal(int, int)
   begin_refresh_history = QtCore.Signal()
   end_refresh_history = QtCore.Signal()
 
@@ -74,16 +83,19 @@ class HistoryViewModel(QtCore.QObject):
     self.__media_player: MediaPlayerPlugin = None
     self.__is_spotify_plugin_available = False # This is set to true if Spotify is installed
     
-    # Set up Discord presence
+    # Set up Discord presence (it talks to Discord on its own thread)
     self.__is_discord_rpc_enabled = False
-    self.__is_discord_rpc_connected = False
-    self.__discord_rpc = Presence('799678908819439646')
+    self.__discord_presence = DiscordPresenceWorker('799678908819439646')
 
     # Settings
     # TODO: Move these properties to an App view model
     self.__is_submission_enabled: bool = None
     self.is_player_paused = False
     self.__was_last_player_event_paused: bool = False
+
+    # Tag background enrichment work so it can be discarded when the data it was loading for is thrown away
+    self.__history_generation: LoadGeneration = None
+    self.__current_scrobble_generation: LoadGeneration = None
     
     if os.environ.get('MOCK'):
       self.__media_player = MockPlayerPlugin()
@@ -106,17 +118,81 @@ class HistoryViewModel(QtCore.QObject):
     self.__timer = QtCore.QTimer(self)
     self.__timer.timeout.connect(self.__fetch_new_media_player_position)
 
+    # Wait for playback to settle on a track before loading its data and announcing it, so skipping through tracks
+    # doesn't send requests for every track that was skipped
+    self.__track_settle_timer = QtCore.QTimer(self)
+    self.__track_settle_timer.setSingleShot(True)
+    self.__track_settle_timer.setInterval(HistoryViewModel.__TRACK_SETTLE_INTERVAL)
+    self.__track_settle_timer.timeout.connect(self.__handle_track_settled)
+
+    # Send now playing updates on a separate thread without repeating ones Last.fm is still showing
+    self.__now_playing_manager = NowPlayingManager(self)
+
+    # Save loved status changes and send them to Last.fm in the background
+    self.__track_love_queue = TrackLoveQueue(self)
+
+    # Save the history periodically and on quit so the next launch can show it right away
+    self.__history_snapshot_timer = QtCore.QTimer(self)
+    self.__history_snapshot_timer.setInterval(HistoryViewModel.__HISTORY_SNAPSHOT_INTERVAL)
+    self.__history_snapshot_timer.timeout.connect(self.__save_history_snapshot)
+
+    # Check for scrobbles made on other devices in the background, less often the longer none show up
+    self.__history_sync_timer = QtCore.QTimer(self)
+    self.__history_sync_timer.setSingleShot(True)
+    self.__history_sync_timer.timeout.connect(self.__sync_history)
+
+    # Convert the current scrobble for QML once per change instead of on every binding read
+    self.__current_scrobble_variant = CachedVariant(
+      lambda: self.__current_scrobble, self.current_scrobble_data_changed
+    )
+
+    if QtCore.QCoreApplication.instance():
+      QtCore.QCoreApplication.instance().aboutToQuit.connect(self.__save_history_snapshot)
+      QtCore.QCoreApplication.instance().aboutToQuit.connect(self.__discord_presence.stop)
+
     self.reset_state()
   
   def reset_state(self) -> None:
     # Store Scrobble objects that have been submitted
-    self.scrobble_history: List[Scrobble] = []
+    self.scrobble_history = ScrobbleHistory(
+      HistoryViewModel.__RESIDENT_SCROBBLE_HISTORY_COUNT,
+      on_rows_loaded=self.__handle_spilled_rows_loaded
+    )
+
+    # Share one object per track, artist, album and album art between every scrobble that refers to it
+    self.__entity_store = EntityStore(
+      on_entity_refreshed=self.__handle_shared_entity_refreshed,
+      get_pending_is_loved=self.__track_love_queue.get_pending_is_loved
+    )
+
+    # Keep track of the newest scrobble timestamp Last.fm has given us so reloads only need to fetch what's new
+    self.__newest_fetched_timestamp: datetime = None
+
+    # Hold data loads requested while offline by scrobble identity so they can be started when the connection is back
+    self.__deferred_enrichment: Dict[int, Tuple[Scrobble, LoadGeneration, Set[str]]] = {}
+
+    # Discard enrichment work that is still queued or running for the previous state
+    self.__history_generation = HistoryViewModel.__replace_load_generation(self.__history_generation)
+    self.__current_scrobble_generation = HistoryViewModel.__replace_load_generation(self.__current_scrobble_generation)
 
     # Keep track of whether the history view is loading data
     self.__is_loading = False
 
+    # Keep track of whether Last.fm has scrobbles older than the last row and whether they are being fetched
+    self.__has_older_scrobbles = False
+    self.__is_fetching_older_scrobbles = False
+
+    # Keep track of whether scrobbles from other devices are being fetched (without showing the loading indicator)
+    self.__is_syncing = False
+    self.__history_sync_interval = HistoryViewModel.__MIN_HISTORY_SYNC_INTERVAL
+
     # Hold a Scrobble object for currently playing track (will later be submitted)
     self.__current_scrobble: Scrobble = None
+
+    # Hold the latest media player state until playback settles on it
+    self.__track_settle_timer.stop()
+    self.__settling_media_player_state: MediaPlayerState = None
+    self.__now_playing_manager.reset()
     
     # Hold the index of the selected scrobble in the sidebar
     self.__selected_scrobble_index: int = None
@@ -171,27 +247,23 @@ class HistoryViewModel(QtCore.QObject):
       # Try connecting to Discord rich presence if enabled
       self.__is_discord_rpc_enabled = db_helper.get_preference('rich_presence_enabled')
       self.is_discord_rich_presence_enabled_changed.emit()
-
-      if self.__is_discord_rpc_enabled and helpers.is_discord_open():
-        self.__connect_discord_rpc_if_open()
+      self.__discord_presence.set_is_enabled(self.__is_discord_rpc_enabled)
 
   # --- Qt Property Getters and Setters ---
 
   def set_is_discord_rich_presence_enabled(self, is_enabled):
     self.__is_discord_rpc_enabled = is_enabled
 
-    if is_enabled:
-      if self.__connect_discord_rpc_if_open():
-        # If there is a track playing when rich presence is enabled, update the rich presence immediately
-        # This is nested because we want to the __connect_discord_rpc_if_open logic to run regardless
-        if self.__current_scrobble:
-          self.__update_discord_rpc(self.__current_scrobble.track_title, self.__current_scrobble.artist_name, self.__current_scrobble.album_title, self.__cached_playback_position)
-    else:
-      if self.__is_discord_rpc_connected:
-        self.__is_discord_rpc_connected = False
+    # If there is a track playing when rich presence is enabled, show it immediately
+    if is_enabled and self.__current_scrobble:
+      self.__discord_presence.update(
+        self.__current_scrobble.track_title,
+        self.__current_scrobble.artist_name,
+        self.__current_scrobble.album_title,
+        self.__cached_playback_position or 0
+      )
 
-        if helpers.is_discord_open():
-          self.__discord_rpc.close()
+    self.__discord_presence.set_is_enabled(is_enabled)
     
     self.is_discord_rich_presence_enabled_changed.emit()
     db_helper.set_preference('rich_presence_enabled', is_enabled)
@@ -204,6 +276,7 @@ class HistoryViewModel(QtCore.QObject):
     self.__application_reference.is_logged_in_changed.connect(
       lambda: self.set_is_enabled(self.__application_reference.is_logged_in)
     )
+    self.__application_reference.is_offline_changed.connect(self.__handle_is_offline_changed)
     
   def get_selected_scrobble_index(self):
     '''Make the private selected scrobble index variable available to the UI'''
@@ -240,7 +313,12 @@ class HistoryViewModel(QtCore.QObject):
     if new_index == HistoryViewModel.__CURRENT_SCROBBLE_INDEX:
       self.selected_scrobble = self.__current_scrobble
     else:
-      self.selected_scrobble = self.scrobble_history[new_index]
+      # Spilled rows show an empty details view until their page has been read from the database
+      self.selected_scrobble = self.scrobble_history.get_if_loaded(new_index)
+
+      # History rows only load what the list shows, so load everything else the details view needs
+      if self.selected_scrobble:
+        self.__load_external_scrobble_data(self.selected_scrobble, self.__history_generation)
     
     # Update details view
     self.selected_scrobble_changed.emit()
@@ -254,8 +332,17 @@ class HistoryViewModel(QtCore.QObject):
       self.reset_state()
       self.__timer.start(self.__MEDIA_PLAYER_POLLING_INTERVAL)
 
-      # Check for network connection on open
-      self.__application_reference.update_is_offline()
+      # Resume sending loved status changes that were saved before the app closed
+      self.__track_love_queue.start(self.__application_reference.lastfm)
+
+      # Show the history from the last session while the newest scrobbles are fetched
+      self.__restore_history_snapshot()
+      self.__history_snapshot_timer.start()
+      self.__history_sync_timer.start(self.__history_sync_interval)
+
+      # Connectivity is checked in the background, so this never waits on the network
+      # If the app is offline, the history is reloaded once the connection comes back
+      self.__track_love_queue.set_is_paused(self.__application_reference.is_offline)
 
       if not self.__application_reference.is_offline:
         self.reloadHistory()
@@ -271,14 +358,79 @@ class HistoryViewModel(QtCore.QObject):
       self.selected_scrobble_changed.emit() # This causes details pane to stop showing a scrobble
       self.current_scrobble_data_changed.emit()
       self.__timer.stop()
+      self.__track_love_queue.stop()
+      self.__history_snapshot_timer.stop()
+      self.__history_sync_timer.stop()
 
     self.is_loading_changed.emit()
 
+  def load_scrobble_row_data(self, row: int) -> None:
+    '''Load the data a history row shows the first time the list displays it'''
+
+    if HistoryViewModel.__IS_ENRICHMENT_EAGER or not self.__is_enabled:
+      return
+
+    # Spilled rows that were spilled with the data the list shows are only read from disk when selected
+    if not self.scrobble_history.is_resident(row):
+      row_view = self.scrobble_history.columns.row(row)
+
+      if row_view.has_lastfm_data or row_view.small_image_url:
+        return
+
+    # This is called again once the row's page has been read if it's spilled
+    scrobble = self.scrobble_history.get_if_loaded(row)
+
+    if not scrobble:
+      return
+
+    # Return quickly if the row's data was already requested
+    if all(stage_name in scrobble.requested_stages for stage_name in EnrichmentPipeline.ROW_STAGE_NAMES):
+      return
+
+    self.__load_external_scrobble_data(
+      scrobble,
+      self.__history_generation,
+      EnrichmentPipeline.ROW_STAGE_NAMES,
+      priority=HistoryViewModel.__get_row_enrichment_priority(row)
+    )
+
+  def can_fetch_older_scrobbles(self) -> bool:
+    '''Check whether the list can show more rows by fetching older scrobbles from Last.fm'''
+
+    return (
+      self.__is_enabled
+      and self.__has_older_scrobbles
+      and not self.__is_fetching_older_scrobbles
+      and not self.__is_loading
+      and not self.__application_reference.is_offline
+      and bool(self.scrobble_history)
+    )
+
+  def fetch_older_scrobbles(self) -> None:
+    '''Fetch the page of scrobbles before the last row and add them to the bottom of the history'''
+
+    if not self.can_fetch_older_scrobbles():
+      return
+
+    self.__is_fetching_older_scrobbles = True
+    generation = self.__history_generation
+
+    # Last.fm pages back from the oldest scrobble so rows inserted at the top meanwhile don't shift the page
+    fetch_recent_scrobbles_task = FetchRecentScrobbles(
+      lastfm=self.__application_reference.lastfm,
+      count=HistoryViewModel.__HISTORY_PAGE_COUNT,
+      to_date=self.__get_oldest_timestamp()
+    )
+    fetch_recent_scrobbles_task.finished.connect(
+      lambda recent_scrobbles: self.__handle_older_scrobbles_fetched(recent_scrobbles, generation)
+    )
+    QtCore.QThreadPool.globalInstance().start(fetch_recent_scrobbles_task)
+
   # --- Slots ---
 
   @QtCore.Slot()
   def reloadHistory(self):
-    '''Reload recent scrobbles from Last.fm'''
+    '''Merge scrobbles made since the last load into the history, or load recent scrobbles from scratch'''
 
     if (
       self.__INITIAL_SCROBBLE_HISTORY_COUNT == 0
@@ -295,17 +447,33 @@ class HistoryViewModel(QtCore.QObject):
     self.__is_loading = True
     self.is_loading_changed.emit()
 
-    # Reset scrobble history list
-    self.begin_refresh_history.emit()
-    self.scrobble_history = []
-    self.end_refresh_history.emit()
+    # Keep the existing history (and its loaded data) if there is one to merge new scrobbles into
+    is_incremental = bool(self.scrobble_history) and self.__newest_fetched_timestamp is not None
+    from_date = None
+
+    if is_incremental:
+      # Start one second after the newest scrobble since Last.fm includes scrobbles at the from timestamp
+      from_date = self.__newest_fetched_timestamp + timedelta(seconds=1)
+    else:
+      # Reset scrobble history list
+      self.begin_refresh_history.emit()
+      self.scrobble_history.reset([])
+      self.end_refresh_history.emit()
+
+      # Cancel enrichment for the scrobbles that were just thrown away
+      self.__history_generation = HistoryViewModel.__replace_load_generation(self.__history_generation)
+
+    generation = self.__history_generation
 
     # Fetch and load recent scrobbles
     fetch_recent_scrobbles_task = FetchRecentScrobbles(
       lastfm=self.__application_reference.lastfm, 
-      count=self.__INITIAL_SCROBBLE_HISTORY_COUNT
+      count=self.__INITIAL_SCROBBLE_HISTORY_COUNT,
+      from_date=from_date
+    )
+    fetch_recent_scrobbles_task.finished.connect(
+      lambda recent_scrobbles: self.__handle_recent_scrobbles_fetched(recent_scrobbles, generation, is_incremental)
     )
-    fetch_recent_scrobbles_task.finished.connect(self.__handle_recent_scrobbles_fetched)
     QtCore.QThreadPool.globalInstance().start(fetch_recent_scrobbles_task)
     
   @QtCore.Slot(int)
@@ -318,27 +486,50 @@ class HistoryViewModel(QtCore.QObject):
 
     if scrobble_index == HistoryViewModel.__CURRENT_SCROBBLE_INDEX:
       scrobble = self.__current_scrobble
-    else:
+    elif self.scrobble_history.is_resident(scrobble_index):
       scrobble = self.scrobble_history[scrobble_index]
 
-    new_value = not scrobble.lastfm_track.is_loved
-    scrobble.lastfm_track.is_loved = new_value
+    if scrobble:
+      new_value = not scrobble.lastfm_track.is_loved
+      track_url = scrobble.lastfm_track.url
+      artist_name = scrobble.lastfm_track.artist_link.name
+      track_title = scrobble.lastfm_track.title
+      scrobble.lastfm_track.is_loved = new_value
+      self.scrobble_history.reindex(scrobble)
+    else:
+      # Spilled rows are toggled from what the list shows so their page doesn't have to be read first
+      row_view = self.scrobble_history.columns.row(scrobble_index)
+
+      if not row_view.has_lastfm_data:
+        return
+
+      new_value = not row_view.is_loved
+      track_url = row_view.track_url
+      artist_name = row_view.artist_name
+      track_title = row_view.track_title
+
+    # Show the new value in every row of the track and save it to the ones on disk
+    self.scrobble_history.set_track_is_loved(track_url, new_value)
     
-    # Update any matching scrobbles in history
-    for history_scrobble in self.scrobble_history:
-      if history_scrobble == scrobble:
-        history_scrobble.lastfm_track.is_loved = new_value
+    # Every scrobble of the same track shares its Last.fm track, so only the UI needs to be told about them
+    matching_rows = self.scrobble_history.rows_for_track_url(track_url)
     
     # Update UI to reflect changes
-    self.__emit_scrobble_ui_update_signals(scrobble)
+    for first_row, last_row in group_consecutive_rows(matching_rows):
+      self.scrobble_lastfm_is_loved_changed.emit(first_row, last_row)
+
+    if HistoryViewModel.__is_scrobble_of_track(self.__current_scrobble, track_url):
+      self.current_scrobble_data_changed.emit()
+
+    if HistoryViewModel.__is_scrobble_of_track(self.selected_scrobble, track_url):
+      self.selected_scrobble_changed.emit()
     
-    # Submit new value to Last.fm
-    QtCore.QThreadPool.globalInstance().start(
-      UpdateTrackLoveOnLastfm(
-        lastfm=self.__application_reference.lastfm,
-        scrobble=scrobble,
-        value=new_value
-      )
+    # Submit new value to Last.fm in the background (combined with any other toggles of the track made meanwhile)
+    self.__track_love_queue.set_is_loved(
+      artist_name=artist_name,
+      track_title=track_title,
+      is_loved=new_value,
+      was_loved=not new_value
     )
 
   @QtCore.Slot(str)
@@ -392,152 +583,319 @@ class HistoryViewModel(QtCore.QObject):
 
   # --- Private Methods ---
 
-  def __connect_discord_rpc_if_open(self) -> None:
-    '''Check if Discord is open; if open, connect with a new client ID if not already connected. If closed, disconnect'''
+  def __restore_history_snapshot(self) -> None:
+    '''Fill the history with the scrobbles saved from the last session (the next reload only fetches newer ones)'''
 
-    if helpers.is_discord_open():
-      if not self.__is_discord_rpc_connected:
-        self.__discord_rpc.connect()
-        self.__is_discord_rpc_connected = True
-        logging.info(f'Discord RPC connected')
-    else:
-      if self.__is_discord_rpc_connected:
-        self.__is_discord_rpc_connected = False
-        self.__discord_rpc.close()
-        logging.info(f'Discord RPC disconnected')
-    
-    return self.__is_discord_rpc_connected
+    start_time = time.perf_counter()
+    data = db_helper.get_history_snapshot()
+    snapshot = HistorySnapshot.from_bytes(data) if data else None
 
-  def __run_discord_rpc_request(self, request):
-    '''Runs "request" lambda if Discord is open. If InvalidID occurs due to Discord generating a new client ID on relaunch, retry the request'''
+    # Don't show another account's history
+    if not snapshot or snapshot.username != self.__application_reference.lastfm.username:
+      return
 
-    # Don't run any request if Discord isn't open
-    if self.__connect_discord_rpc_if_open():
-      did_request_succeed = False
-      number_of_retries = 0
+    for scrobble in snapshot.scrobbles:
+      # Work that was still loading when the snapshot was saved needs to be requested again
+      scrobble.requested_stages = [
+        stage.name for stage in EnrichmentPipeline.STAGES if stage.field in scrobble.loaded_fields
+      ]
+      scrobble.loading_stages = set()
+      scrobble.is_loading = False
+      self.__share_scrobble_entities(scrobble)
 
-      while not did_request_succeed and number_of_retries < self.__DISCORD_RPC_MAX_RETRIES:
-        try:
-          request(self)
-          did_request_succeed = True
-        except InvalidID:
-          self.__is_discord_rpc_connected = False
+    self.begin_refresh_history.emit()
+    self.scrobble_history.reset(snapshot.scrobbles)
+    self.end_refresh_history.emit()
+    self.__newest_fetched_timestamp = snapshot.newest_fetched_timestamp
 
-          if self.__connect_discord_rpc_if_open():
-            logging.info(f'Discord RPC reconnected to new client (at retry #{number_of_retries})')
+    # Let the list try fetching older scrobbles (it stops once a page comes back empty)
+    self.__has_older_scrobbles = True
 
-          number_of_retries += 1
-      
-      if number_of_retries == self.__DISCORD_RPC_MAX_RETRIES:
-        logging.warning('Max retries exceeded on Discord RPC request')
-  
-  def __update_discord_rpc(self, track_title: str, artist_name: str, album_title: str, player_position: float):
-    '''Update Discord RPC with new track details'''
-
-    self.__discord_rpc.update(
-      details=track_title,
-      state=artist_name,
-      large_image='music-logo',
-      large_text='Playing on Music',
-      small_image='lastredux-logo',
-      small_text='Scrobbling on LastRedux',
-      start=(datetime.now() - timedelta(seconds=player_position)).timestamp() # Don't include track start to accurately reflect timestamp in uncropped track
+    logging.info(
+      f'Showed {len(snapshot.scrobbles)} scrobbles from the last session in '
+      f'{(time.perf_counter() - start_time) * 1000:.1f} ms'
     )
 
-  def __handle_recent_scrobbles_fetched(self, recent_scrobbles: LastfmList[LastfmScrobble]):
-    # Tell the history list model that we are going to change the data it relies on
-    self.begin_refresh_history.emit()
+  def __save_history_snapshot(self) -> None:
+    '''Save the scrobbles held in memory along with their loaded data'''
 
-    # User might not have any scrobbles (new account)
-    if recent_scrobbles:
-      # Convert scrobbles from history into scrobble objects
-      for i, recent_scrobble in enumerate(recent_scrobbles.items):
-        self.scrobble_history.append(Scrobble.from_lastfm_scrobble(recent_scrobble))
+    if not self.__is_enabled or not self.scrobble_history or not self.__newest_fetched_timestamp:
+      return
 
-        self.__load_external_scrobble_data(self.scrobble_history[i])
+    snapshot = HistorySnapshot(
+      username=self.__application_reference.lastfm.username,
+      scrobbles=list(self.scrobble_history.resident_scrobbles()),
+      newest_fetched_timestamp=self.__newest_fetched_timestamp
+    )
+    db_helper.save_history_snapshot(snapshot.to_bytes())
 
-    self.end_refresh_history.emit()
+  @staticmethod
+  def __replace_load_generation(generation: LoadGeneration) -> LoadGeneration:
+    '''Cancel all outstanding work in a load generation and start a new one'''
 
-    self.__is_loading = False
-    self.is_loading_changed.emit()
+    if generation:
+      generation.cancel()
 
-  def __load_external_scrobble_data(self, scrobble: Scrobble) -> None:
-    if self.__application_reference.is_offline:
+    return LoadGeneration()
+
+  def __sync_history(self) -> None:
+    '''Merge scrobbles made on other devices since the last load into the history'''
+
+    if not self.__is_enabled:
       return
 
-    load_lastfm_track_info = LoadLastfmTrackInfo(self.__application_reference.lastfm, scrobble)
-    load_lastfm_track_info.finished.connect(self.__handle_piece_of_external_scrobble_data_loaded)
-    QtCore.QThreadPool.globalInstance().start(load_lastfm_track_info)
+    # Only sync a history that a load has finished for, and leave the timing to the next sync if it can't run now
+    if (
+      self.__is_loading
+      or self.__is_syncing
+      or self.__application_reference.is_offline
+      or not self.scrobble_history
+      or self.__newest_fetched_timestamp is None
+    ):
+      self.__history_sync_timer.start(self.__history_sync_interval)
+      return
 
-    load_lastfm_artist_info = LoadLastfmArtistInfo(self.__application_reference.lastfm, scrobble)
-    load_lastfm_artist_info.finished.connect(self.__handle_piece_of_external_scrobble_data_loaded)
-    QtCore.QThreadPool.globalInstance().start(load_lastfm_artist_info)
+    self.__is_syncing = True
+    generation = self.__history_generation
 
-    load_lastfm_album_info = LoadLastfmAlbumInfo(self.__application_reference.lastfm, scrobble)
-    load_lastfm_album_info.finished.connect(self.__handle_piece_of_external_scrobble_data_loaded)
-    QtCore.QThreadPool.globalInstance().start(load_lastfm_album_info)
-    
-    load_track_images = LoadTrackImages(
-      self.__application_reference.lastfm,
-      self.__application_reference.art_provider,
-      scrobble
+    # This usually returns nothing or a few scrobbles since the newest one we know about
+    fetch_recent_scrobbles_task = FetchRecentScrobbles(
+      lastfm=self.__application_reference.lastfm,
+      count=self.__INITIAL_SCROBBLE_HISTORY_COUNT,
+      from_date=self.__newest_fetched_timestamp + timedelta(seconds=1)
+    )
+    fetch_recent_scrobbles_task.finished.connect(
+      lambda recent_scrobbles: self.__handle_synced_scrobbles_fetched(recent_scrobbles, generation)
     )
-    load_track_images.finished.connect(self.__handle_piece_of_external_scrobble_data_loaded)
-    QtCore.QThreadPool.globalInstance().start(load_track_images)
+    QtCore.QThreadPool.globalInstance().start(fetch_recent_scrobbles_task)
+
+  def __handle_synced_scrobbles_fetched(
+    self,
+    recent_scrobbles: LastfmList[LastfmScrobble],
+    generation: LoadGeneration
+  ) -> None:
+    self.__is_syncing = False
 
-  def __handle_piece_of_external_scrobble_data_loaded(self, scrobble: Scrobble):
     if not self.__is_enabled:
       return
 
-    # TODO: Find a better way to do this that's less hacky
-    if not getattr(scrobble, 'TEMP_things_loaded', False):
-      scrobble.TEMP_things_loaded = 0
-    
-    scrobble.TEMP_things_loaded += 1
+    # The history was reloaded while fetching, which already brought it up to date
+    if generation.is_cancelled:
+      self.__history_sync_timer.start(self.__history_sync_interval)
+      return
 
-    if scrobble.TEMP_things_loaded == 4:
-      scrobble.is_loading = False
+    previous_history_count = len(self.scrobble_history)
+    self.__handle_recent_scrobbles_fetched(recent_scrobbles, generation, is_incremental=True, is_background=True)
 
-    self.__emit_scrobble_ui_update_signals(scrobble)
+    # The history is replaced instead of merged into if too many scrobbles were made elsewhere to fetch at once
+    has_new_scrobbles = (
+      len(self.scrobble_history) != previous_history_count or self.__history_generation is not generation
+    )
 
-  def __emit_scrobble_ui_update_signals(self, scrobble: Scrobble) -> None:
-    if not self.__is_enabled:
+    # Check often while another device is scrobbling and back off while nothing is
+    if has_new_scrobbles:
+      self.__history_sync_interval = HistoryViewModel.__MIN_HISTORY_SYNC_INTERVAL
+    else:
+      self.__history_sync_interval = min(
+        self.__history_sync_interval * 2,
+        HistoryViewModel.__MAX_HISTORY_SYNC_INTERVAL
+      )
+
+    self.__history_sync_timer.start(self.__history_sync_interval)
+
+  def __handle_recent_scrobbles_fetched(
+    self,
+    recent_scrobbles: LastfmList[LastfmScrobble],
+    generation: LoadGeneration,
+    is_incremental: bool,
+    is_background: bool=False
+  ):
+    # Ignore scrobbles fetched for a history that has since been reloaded or logged out of
+    if generation.is_cancelled:
       return
-    
-    # Update details view if needed (all external scrobble data)
-    if scrobble == self.selected_scrobble:
-      self.selected_scrobble_changed.emit()
-    
-    # Update current scrobble view if needed (album art, is_loved)
-    if scrobble == self.__current_scrobble:
-      self.current_scrobble_data_changed.emit()
-    
-    # Update loved status and album art for all applicable history items if they match
-    for i, history_scrobble in enumerate(self.scrobble_history):
-      if scrobble == history_scrobble:
-        self.scrobble_album_image_changed.emit(i)
-        self.scrobble_lastfm_is_loved_changed.emit(i)
 
-  def __submit_scrobble(self, scrobble: Scrobble) -> None:
-    '''Add a scrobble object to the history array and submit it to Last.fm'''
-    
-    if not self.__is_enabled:
+    # User might not have any scrobbles (new account) or any new scrobbles since the last load
+    new_scrobbles = []
+
+    if recent_scrobbles:
+      # Convert scrobbles from history into scrobble objects
+      new_scrobbles = [Scrobble.from_lastfm_scrobble(recent_scrobble) for recent_scrobble in recent_scrobbles.items]
+
+      if new_scrobbles:
+        newest_timestamp = max(scrobble.timestamp for scrobble in new_scrobbles)
+
+        if not self.__newest_fetched_timestamp or newest_timestamp > self.__newest_fetched_timestamp:
+          self.__newest_fetched_timestamp = newest_timestamp
+
+      # Merging would leave a gap in the history if there are more new scrobbles than were fetched
+      if is_incremental and recent_scrobbles.attr_total > len(recent_scrobbles.items):
+        logging.info(f'{recent_scrobbles.attr_total} new scrobbles since last load, replacing history')
+
+        self.__history_generation = HistoryViewModel.__replace_load_generation(self.__history_generation)
+        generation = self.__history_generation
+        is_incremental = False
+
+    should_reload = False
+
+    if is_incremental:
+      if not self.__merge_new_scrobbles(new_scrobbles, generation):
+        logging.info('New scrobbles are older than ones made in this app since the last load, reloading history')
+
+        # Load the history from scratch once this load has finished
+        self.__newest_fetched_timestamp = None
+        should_reload = True
+    else:
+      # Tell the history list model that we are going to change the data it relies on
+      self.begin_refresh_history.emit()
+      self.scrobble_history.reset(new_scrobbles)
+      self.end_refresh_history.emit()
+
+      # Older scrobbles are fetched as the list is scrolled to the bottom
+      self.__has_older_scrobbles = bool(recent_scrobbles) and recent_scrobbles.attr_total > len(new_scrobbles)
+
+      # Otherwise rows load their data as they are shown (scrobbles that were spilled to disk load when selected)
+      if HistoryViewModel.__IS_ENRICHMENT_EAGER:
+        for scrobble in self.scrobble_history.resident_scrobbles():
+          self.__load_external_scrobble_data(scrobble, generation)
+
+    # Background syncs don't show the loading indicator
+    if not is_background:
+      self.__is_loading = False
+      self.is_loading_changed.emit()
+
+    if should_reload:
+      self.reloadHistory()
+
+  def __handle_older_scrobbles_fetched(
+    self,
+    recent_scrobbles: LastfmList[LastfmScrobble],
+    generation: LoadGeneration
+  ) -> None:
+    self.__is_fetching_older_scrobbles = False
+
+    # Ignore pages fetched for a history that has since been reloaded or logged out of
+    if generation.is_cancelled or not self.__is_enabled:
       return
-    
+
+    # A request that failed leaves paging on so scrolling down again retries it
+    if recent_scrobbles is None:
+      return
+
+    older_scrobbles = [Scrobble.from_lastfm_scrobble(recent_scrobble) for recent_scrobble in recent_scrobbles.items]
+
+    # Last.fm counts every scrobble before the page's end date, including the ones on this page
+    self.__has_older_scrobbles = recent_scrobbles.attr_total > len(older_scrobbles)
+
+    # The page can repeat scrobbles from the same second as the last row
+    # Read the bottom rows from the columns since they are usually spilled
+    oldest_timestamp = self.__get_oldest_timestamp()
+    oldest_unix_timestamp = int(oldest_timestamp.timestamp())
+    known_scrobble_keys = set()
+
+    for row in range(len(self.scrobble_history) - 1, -1, -1):
+      row_view = self.scrobble_history.columns.row(row)
+
+      if row_view.timestamp and row_view.timestamp > oldest_unix_timestamp:
+        break
+
+      known_scrobble_keys.add((row_view.timestamp or None, row_view.track_title.lower()))
+
+    older_scrobbles = [
+      scrobble for scrobble in sorted(older_scrobbles, key=lambda scrobble: scrobble.timestamp, reverse=True)
+      if scrobble.timestamp <= oldest_timestamp
+      and HistoryViewModel.__scrobble_key(scrobble) not in known_scrobble_keys
+    ]
+
+    if not older_scrobbles:
+      return
+
+    first_row = len(self.scrobble_history)
+
+    # Add the whole page to the bottom of the list at once
+    self.pre_insert_scrobbles.emit(first_row, first_row + len(older_scrobbles) - 1)
+    self.scrobble_history.extend(older_scrobbles)
+    self.post_insert_scrobbles.emit()
+
+    if HistoryViewModel.__IS_ENRICHMENT_EAGER:
+      for scrobble in older_scrobbles:
+        self.__load_external_scrobble_data(
+          scrobble,
+          generation,
+          priority=HistoryViewModel.__OLDER_SCROBBLE_ENRICHMENT_PRIORITY
+        )
+
+  def __get_oldest_timestamp(self) -> datetime:
+    '''Get the timestamp of the last row (to the second) without reading it from disk'''
+
+    return datetime.fromtimestamp(self.scrobble_history.columns.row(len(self.scrobble_history) - 1).timestamp)
+
+  @staticmethod
+  def __get_row_enrichment_priority(row: int) -> int:
+    '''Load rows that were paged in by scrolling after everything else'''
+
+    if row < HistoryViewModel.__INITIAL_SCROBBLE_HISTORY_COUNT:
+      return 0
+
+    return HistoryViewModel.__OLDER_SCROBBLE_ENRICHMENT_PRIORITY
+
+  def __merge_new_scrobbles(self, new_scrobbles: List[Scrobble], generation: LoadGeneration) -> bool:
+    '''
+    Add scrobbles to the top of the history in timestamp order, skipping any that are already in it
+
+    Returns False without changing the history if one of them is older than the top row, since rows can only be
+    inserted at the top or bottom
+    '''
+
+    if not new_scrobbles:
+      return True
+
+    # Insert oldest first so each new scrobble lands above the ones before it
+    new_scrobbles = sorted(new_scrobbles, key=lambda scrobble: scrobble.timestamp)
+
+    # Scrobbles submitted from this app are already in the history, in the top rows that are at least as new as the
+    # oldest new scrobble (keys only have whole seconds, so rows from that same second are checked too)
+    oldest_second = new_scrobbles[0].timestamp.replace(microsecond=0)
+    known_scrobble_keys = {
+      HistoryViewModel.__scrobble_key(self.scrobble_history[row])
+      for row in range(self.scrobble_history.first_resident_row_older_than(oldest_second))
+    }
+
+    new_scrobbles = [
+      new_scrobble for new_scrobble in new_scrobbles
+      if HistoryViewModel.__scrobble_key(new_scrobble) not in known_scrobble_keys
+    ]
+
+    if not new_scrobbles:
+      return True
+
+    # New scrobbles are almost always newer than every row, but one can be older than scrobbles made in this app meanwhile
+    if self.scrobble_history.first_resident_row_older_than(new_scrobbles[0].timestamp) != 0:
+      return False
+
+    for new_scrobble in new_scrobbles:
+      self.__prepend_scrobble(new_scrobble)
+
+      if HistoryViewModel.__IS_ENRICHMENT_EAGER:
+        self.__load_external_scrobble_data(new_scrobble, generation)
+
+    return True
+
+  def __prepend_scrobble(self, scrobble: Scrobble) -> None:
+    '''Insert a scrobble at the top of the history and keep the selection on the same scrobble'''
+
     # Tell scrobble history list model that a change will be made
-    self.pre_append_scrobble.emit()
+    self.pre_insert_scrobbles.emit(0, 0)
 
-    # Prepend the new scrobble to the scrobble_history array in the view model
     self.scrobble_history.insert(0, scrobble)
 
     # Tell scrobble history list model that a change was made in the view model
     # The list model will call the data function in the background to get the new data
-    self.post_append_scrobble.emit()
+    self.post_insert_scrobbles.emit()
 
     if not self.__selected_scrobble_index is None:
-      # Shift down the selected scrobble index if new scrobble has been added to the top
+      # Shift down the selected scrobble index if a new scrobble has been added above it
       # This is because if the user has a scrobble in the history selected and a new scrobble is 
-      # submitted, it will display the wrong data if the index isn't updated
+      # inserted, it will display the wrong data if the index isn't updated
       
       # Change __selected_scrobble_index instead of calling set___selected_scrobble_index because the  
       # selected scrobble shouldn't be redundantly set to itself and still emit selected_scrobble_changed
@@ -548,27 +906,234 @@ class HistoryViewModel(QtCore.QObject):
         # Tell the UI that the selected index changed, so it can update the selection highlight
         self.selected_scrobble_index_changed.emit()
 
-    # Submit scrobble to Last.fm
+  @staticmethod
+  def __scrobble_key(scrobble: Scrobble) -> tuple:
+    '''Identify a scrobble by its whole-second timestamp and title since Last.fm drops fractional seconds'''
+
+    return (int(scrobble.timestamp.timestamp()) if scrobble.timestamp else None, scrobble.track_title.lower())
+
+  def __load_external_scrobble_data(
+    self,
+    scrobble: Scrobble,
+    generation: LoadGeneration,
+    stage_names: List[str]=None,
+    priority: int=0
+  ) -> None:
+    '''Load the given enrichment stages (or all of them) that haven't already been requested for a scrobble'''
+
+    if self.__application_reference.is_offline:
+      self.__defer_external_scrobble_data(scrobble, generation, stage_names)
+      return
+
+    # The run carries the generation so stale results can be dropped without searching the history
+    run = EnrichmentPipeline.create_run(scrobble, generation, stage_names, priority)
+
+    if not run.stages:
+      return
+
+    scrobble.is_loading = True
+    self.__start_ready_enrichment_stages(run)
+
+  def __defer_external_scrobble_data(
+    self,
+    scrobble: Scrobble,
+    generation: LoadGeneration,
+    stage_names: List[str]=None
+  ) -> None:
+    '''Remember a data load requested while offline, combining it with others for the same scrobble'''
+
+    # None means every stage
+    requested_stage_names = set(stage_names) if stage_names else None
+    deferred_enrichment = self.__deferred_enrichment.get(id(scrobble))
+
+    if deferred_enrichment:
+      _, _, deferred_stage_names = deferred_enrichment
+
+      if deferred_stage_names is None or requested_stage_names is None:
+        requested_stage_names = None
+      else:
+        requested_stage_names |= deferred_stage_names
+
+    self.__deferred_enrichment[id(scrobble)] = (scrobble, generation, requested_stage_names)
+
+  def __handle_is_offline_changed(self) -> None:
+    '''Pause background work while offline and catch up once the connection is back'''
+
+    if not self.__is_enabled:
+      return
+
+    is_offline = self.__application_reference.is_offline
+    self.__track_love_queue.set_is_paused(is_offline)
+
+    if is_offline:
+      return
+
+    # Start data loads that were requested while offline (unless their scrobbles were discarded since)
+    deferred_enrichment = self.__deferred_enrichment
+    self.__deferred_enrichment = {}
+
+    for scrobble, generation, stage_names in deferred_enrichment.values():
+      if not generation.is_cancelled:
+        self.__load_external_scrobble_data(scrobble, generation, list(stage_names) if stage_names else None)
+
+    # Fetch scrobbles made while offline
+    self.reloadHistory()
+
+  def __start_ready_enrichment_stages(self, run: EnrichmentRun) -> None:
+    '''Start every stage of an enrichment run whose inputs have finished loading'''
+
+    for stage in run.start_ready_stages():
+      run_enrichment_stage = RunEnrichmentStage(
+        self.__application_reference.lastfm,
+        self.__application_reference.art_provider,
+        run,
+        stage
+      )
+      run_enrichment_stage.finished.connect(self.__handle_enrichment_stage_finished)
+      run_enrichment_stage.deferred.connect(self.__handle_enrichment_stage_deferred)
+      QtCore.QThreadPool.globalInstance().start(run_enrichment_stage, run.priority)
+
+  def __handle_enrichment_stage_finished(self, run: EnrichmentRun, stage: EnrichmentStage, result) -> None:
+    if not self.__is_enabled or run.generation.is_cancelled:
+      return
+
+    scrobble = run.scrobble
+    run.complete_stage(stage, result)
+
+    if run.is_complete:
+      # Another run for the same scrobble could still be loading
+      scrobble.is_loading = bool(scrobble.loading_stages)
+    else:
+      # Start stages that were waiting on this one
+      self.__start_ready_enrichment_stages(run)
+
+    # The store keeps local play counts and loved status changes that Last.fm doesn't know about yet
+    self.__share_scrobble_entities(scrobble)
+
+    # The scrobble might have just received its Last.fm track and artist URLs
+    self.scrobble_history.reindex(scrobble)
+
+    # Show each piece of data as soon as it arrives instead of waiting for the whole scrobble
+    self.__emit_scrobble_ui_update_signals(scrobble)
+
+  def __handle_enrichment_stage_deferred(self, run: EnrichmentRun, stage: EnrichmentStage) -> None:
+    '''Hold a stage that failed because the internet couldn't be reached until the connection is back'''
+
+    if not self.__is_enabled or run.generation.is_cancelled:
+      return
+
+    scrobble = run.scrobble
+    self.__defer_external_scrobble_data(scrobble, run.generation, run.defer_stage(stage))
+
+    # Stop showing the scrobble as loading if nothing else is still running for it
+    scrobble.is_loading = bool(scrobble.loading_stages)
+    self.__emit_scrobble_ui_update_signals(scrobble)
+
+  def __handle_spilled_rows_loaded(self, rows: List[int]) -> None:
+    '''Finish showing rows that were waiting on their page to be read from the database'''
+
+    if not self.__is_enabled:
+      return
+
+    for row in rows:
+      if row == self.__selected_scrobble_index and not self.selected_scrobble:
+        self.selected_scrobble = self.scrobble_history.get_if_loaded(row)
+        self.__load_external_scrobble_data(self.selected_scrobble, self.__history_generation)
+        self.selected_scrobble_changed.emit()
+
+      self.load_scrobble_row_data(row)
+
+  def __share_scrobble_entities(self, scrobble: Scrobble) -> None:
+    '''Point the scrobble to the shared copies of its loaded Last.fm data and images'''
+
+    scrobble.lastfm_track = self.__entity_store.track(scrobble.lastfm_track)
+    scrobble.lastfm_artist = self.__entity_store.artist(scrobble.lastfm_artist)
+    scrobble.lastfm_album = self.__entity_store.album(scrobble.lastfm_album)
+    scrobble.image_set = self.__entity_store.image_set(
+      scrobble.artist_name,
+      scrobble.album_title or scrobble.track_title,
+      scrobble.image_set
+    )
+    scrobble.spotify_artists = self.__entity_store.spotify_artists(scrobble.artist_name, scrobble.spotify_artists)
+
+  def __handle_shared_entity_refreshed(self, entity: object) -> None:
+    '''Update the rows of every scrobble that shares an entity that was refreshed in place'''
+
+    if not self.__is_enabled:
+      return
+
+    # Spilled scrobbles have their own copies, so only rows held in memory can share the entity
+    if isinstance(entity, LastfmTrack):
+      rows = self.scrobble_history.rows_for_track_url(entity.url, should_include_spilled=False)
+      changed_signal = self.scrobble_lastfm_is_loved_changed
+    elif isinstance(entity, ImageSet):
+      rows = self.scrobble_history.rows_for_image_set(entity)
+      changed_signal = self.scrobble_album_image_changed
+    else:
+      # The list doesn't show anything from artists, albums or Spotify artists
+      return
+
+    self.scrobble_history.refresh_rows(rows)
+
+    for first_row, last_row in group_consecutive_rows(rows):
+      changed_signal.emit(first_row, last_row)
+
+  def __emit_scrobble_ui_update_signals(self, scrobble: Scrobble) -> None:
+    if not self.__is_enabled:
+      return
+    
+    # Update details view if needed (all external scrobble data)
+    if scrobble is self.selected_scrobble:
+      self.selected_scrobble_changed.emit()
+    
+    # Update current scrobble view if needed (album art, is_loved)
+    if scrobble is self.__current_scrobble:
+      self.current_scrobble_data_changed.emit()
+    
+    # Update loved status and album art for the scrobble's history item if it's in the history
+    row = self.scrobble_history.row_of(scrobble)
+
+    if row is not None:
+      self.scrobble_album_image_changed.emit(row, row)
+      self.scrobble_lastfm_is_loved_changed.emit(row, row)
+
+  @staticmethod
+  def __is_scrobble_of_track(scrobble: Scrobble, track_url: str) -> bool:
+    return bool(scrobble and scrobble.lastfm_track and scrobble.lastfm_track.url == track_url)
+
+  def __submit_scrobble(self, scrobble: Scrobble) -> None:
+    '''Add a scrobble object to the history array and submit it to Last.fm'''
+    
+    if not self.__is_enabled:
+      return
+    
     if self.__is_submission_enabled:
       # Use end time to submit to play more nicely with apps like Marvis
       # TODO: Make this a setting
-      self.__current_scrobble.timestamp = datetime.now()
+      # This is set before the row is inserted so the row doesn't keep showing the start time
+      scrobble.timestamp = datetime.now()
+
+    # Prepend the new scrobble to the scrobble history
+    self.__prepend_scrobble(scrobble)
 
+    # Submit scrobble to Last.fm
+    if self.__is_submission_enabled:
       submit_scrobble_task = SubmitScrobble(
         lastfm=self.__application_reference.lastfm,
-        scrobble=self.__current_scrobble
+        scrobble=scrobble
       )
       QtCore.QThreadPool.globalInstance().start(submit_scrobble_task)
 
+      # Last.fm stops showing a track as now playing once it's scrobbled, so announce it again if it's repeated
+      self.__now_playing_manager.reset()
+
     # Update playcounts for scrobbles (including the one just added to history)
-    for history_scrobble in self.scrobble_history:
-      if history_scrobble.lastfm_track and scrobble.lastfm_track:
-        if history_scrobble.lastfm_track == scrobble.lastfm_track:
-          history_scrobble.lastfm_track.plays += 1
-      
-      if history_scrobble.lastfm_artist and scrobble.lastfm_artist:
-        if history_scrobble.lastfm_artist == scrobble.lastfm_artist:
-          history_scrobble.lastfm_artist.plays += 1
+    # Scrobbles of the same track and artist share these objects, so each is only incremented once
+    if scrobble.lastfm_track and scrobble.lastfm_track.plays is not None:
+      scrobble.lastfm_track.plays += 1
+
+    if scrobble.lastfm_artist and scrobble.lastfm_artist.plays is not None:
+      scrobble.lastfm_artist.plays += 1
 
     # Reset flag so new scrobble can later be submitted
     self.__should_submit_current_scrobble = False
@@ -579,7 +1144,14 @@ class HistoryViewModel(QtCore.QObject):
     if not self.__is_enabled:
       return
     
+    # Discard data still loading for the previous track unless it was added to the history, which still needs it
+    if self.__current_scrobble and self.scrobble_history.row_of(self.__current_scrobble) is None:
+      self.__current_scrobble_generation.cancel()
+
+    self.__current_scrobble_generation = LoadGeneration()
+
     # Initialize a new Scrobble object with the updated media player state
+    # Its Last.fm data and album art are loaded once playback settles on it
     self.__current_scrobble = Scrobble(
       artist_name=media_player_state.artist_name,
       track_title=media_player_state.track_title,
@@ -613,9 +1185,6 @@ class HistoryViewModel(QtCore.QObject):
     # Update cached media player track playback data
     self.__current_track_crop = media_player_state.track_crop
 
-    # Load Last.fm data and album art
-    self.__load_external_scrobble_data(self.__current_scrobble)
-
     # Reset scrobble meter
     self.__current_scrobble_percentage = 0
     self.scrobble_percentage_changed.emit()
@@ -654,7 +1223,7 @@ class HistoryViewModel(QtCore.QObject):
 
       # Clear discord status if paused for more than 60 seconds
       if self.__ticks_since_position_change == 60 and self.__is_discord_rpc_enabled:
-        self.__run_discord_rpc_request(lambda self: self.__discord_rpc.clear())
+        self.__discord_presence.clear()
     else:
       self.__ticks_since_position_change = 0
     
@@ -712,8 +1281,12 @@ class HistoryViewModel(QtCore.QObject):
     ):
       return
 
+    # Don't announce a track that was only playing for a moment
+    self.__track_settle_timer.stop()
+    self.__settling_media_player_state = None
+
     if self.__is_discord_rpc_enabled:
-      self.__run_discord_rpc_request(lambda self: self.__discord_rpc.clear())
+      self.__discord_presence.clear()
     
     # Submit if the music player stops as well, not just when a new track starts
     if self.__should_submit_current_scrobble:
@@ -740,27 +1313,9 @@ class HistoryViewModel(QtCore.QObject):
     if not self.__is_enabled:
       return
 
-    # Update now playing on Last.fm regardless of whether it's a new play
-    if self.__is_submission_enabled:
-      QtCore.QThreadPool.globalInstance().start(
-        UpdateNowPlaying(
-          lastfm=self.__application_reference.lastfm, 
-          artist_name=new_media_player_state.artist_name,
-          track_title=new_media_player_state.track_title,
-          album_title=new_media_player_state.album_title,
-          album_artist_name=new_media_player_state.album_artist_name,
-          duration=new_media_player_state.track_crop.finish - new_media_player_state.track_crop.start
-        )
-      )
-
-    # Update Discord rich presence regardless of whether it's a new play
-    if self.__is_discord_rpc_enabled:
-      self.__run_discord_rpc_request(lambda self: self.__update_discord_rpc(
-        new_media_player_state.track_title,
-        new_media_player_state.artist_name,
-        new_media_player_state.album_title,
-        new_media_player_state.position
-      ))
+    # Announce the track once it has been playing for the settle interval (restarting the wait if it's superseded)
+    self.__settling_media_player_state = new_media_player_state
+    self.__track_settle_timer.start()
     
     # Update playback indicator
     self.is_player_paused = False
@@ -804,6 +1359,36 @@ class HistoryViewModel(QtCore.QObject):
     # Load new track data into current scrobble
       self.__update_current_scrobble(new_media_player_state)
 
+  def __handle_track_settled(self) -> None:
+    '''Load data for and announce the track playback has stayed on for the settle interval'''
+
+    media_player_state = self.__settling_media_player_state
+    self.__settling_media_player_state = None
+
+    if not self.__is_enabled or not media_player_state:
+      return
+
+    # Load Last.fm data and album art if they weren't loaded for this track yet
+    if self.__current_scrobble and not self.__current_scrobble.requested_stages:
+      self.__load_external_scrobble_data(self.__current_scrobble, self.__current_scrobble_generation)
+
+    # Don't announce a track that was paused before it settled
+    if self.is_player_paused:
+      return
+
+    # Update now playing on Last.fm (skipped if it's still showing this track, like after resuming)
+    if self.__is_submission_enabled:
+      self.__now_playing_manager.announce(self.__application_reference.lastfm, media_player_state)
+
+    # Update Discord rich presence regardless of whether it's a new play
+    if self.__is_discord_rpc_enabled:
+      self.__discord_presence.update(
+        media_player_state.track_title,
+        media_player_state.artist_name,
+        media_player_state.album_title,
+        media_player_state.position + HistoryViewModel.__TRACK_SETTLE_INTERVAL / 1000 # The track kept playing while settling
+      )
+
   def __handle_media_player_paused(self) -> None:
     '''Handle media player pause event'''
 
@@ -829,7 +1414,7 @@ class HistoryViewModel(QtCore.QObject):
 
   currentScrobble = QtCore.Property(
     type='QVariant',
-    fget=lambda self: asdict(self.__current_scrobble) if self.__current_scrobble else None,
+    fget=lambda self: self.__current_scrobble_variant.get(),
     notify=current_scrobble_data_changed
   )
 
@@ -1,11 +1,11 @@
 import logging
-from dataclasses import asdict
 
 from PySide2 import QtCore
 
 from ApplicationViewModel import ApplicationViewModel
 from datatypes.ProfileStatistics import ProfileStatistics
 from tasks import FetchProfileStatistics, LoadProfileSpotifyArtists
+from util.variant_converter import CachedVariant
 
 class ProfileViewModel(QtCore.QObject):
   # Qt Property signals
@@ -20,6 +20,9 @@ class ProfileViewModel(QtCore.QObject):
     self.__is_enabled: bool = False
     self.reset_state()
 
+    # Convert the statistics for QML once per change instead of on every binding read
+    self.__profile_statistics_variant = CachedVariant(lambda: self.__profile_statistics, self.profile_statistics_changed)
+
   def reset_state(self):
     self.__profile_statistics: ProfileStatistics = None
     self.__is_loading: bool = False
@@ -49,6 +52,10 @@ class ProfileViewModel(QtCore.QObject):
 
   # --- Private Methods ---
 
+  def __handle_is_offline_changed(self) -> None:
+    if self.__is_enabled and not self.__application_reference.is_offline:
+      self.loadProfile()
+
   def __handle_profile_statistics_fetched(
     self, 
     new_profile_statistics: ProfileStatistics
@@ -93,6 +100,9 @@ class ProfileViewModel(QtCore.QObject):
       lambda: self.set_is_enabled(self.__application_reference.is_logged_in)
     )
 
+    # Loads are skipped while offline, so fetch the profile again when the connection returns
+    self.__application_reference.is_offline_changed.connect(self.__handle_is_offline_changed)
+
   def set_is_enabled(self, is_enabled: bool) -> None:
     self.__is_enabled = is_enabled
     self.is_enabled_changed.emit()
@@ -121,7 +131,7 @@ class ProfileViewModel(QtCore.QObject):
 
   profileStatistics = QtCore.Property(
     type='QVariant',
-    fget=lambda self: asdict(self.__profile_statistics) if self.__profile_statistics else None,
+    fget=lambda self: self.__profile_statistics_variant.get(),
     notify=profile_statistics_changed
   )
 
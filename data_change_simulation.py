@@ -0,0 +1,83 @@
+import os
+import random
+
+from util.data_change_batcher import DataChangeBatcher
+from util.enrichment import EnrichmentPipeline
+
+# Replay made-up stage completion times through the batching logic to compare dataChanged counts
+# Nothing runs in Qt, so the numbers show how ranges merge, not how long the list takes to update
+HISTORY_ITEMS = int(os.environ.get('INITIAL_HISTORY_ITEMS', 30))
+FLUSH_INTERVAL = int(os.environ.get('DATA_CHANGE_BATCH_INTERVAL', 16)) # ms
+LOAD_DURATION = 1500 # ms from the reload until the last stage finishes
+
+IMAGE_ROLES = [4, 5] # Album image URL and whether the row has Last.fm data
+LOVED_ROLES = [3]
+
+def simulate_stage_completions(stage_count: int):
+  '''Get (time, row) pairs for every enrichment stage finishing after a reload, in time order'''
+
+  randomizer = random.Random(0)
+
+  return sorted(
+    (randomizer.uniform(0, LOAD_DURATION), row) for row in range(HISTORY_ITEMS) for _ in range(stage_count)
+  )
+
+def count_unbatched(completions):
+  '''Every finished stage sends an image and a loved status dataChanged for its row'''
+
+  signal_count = 0
+  changed_role_count = 0
+
+  for _, row in completions:
+    for roles in [IMAGE_ROLES, LOVED_ROLES]:
+      signal_count += 1
+      changed_role_count += len(roles)
+
+  return signal_count, changed_role_count
+
+def count_batched(completions):
+  '''Changes are collected until the next frame and sent as merged ranges'''
+
+  signal_count = 0
+  changed_role_count = 0
+  changed_roles_by_row = {}
+  flush_time = None
+
+  def flush():
+    nonlocal signal_count, changed_role_count
+
+    for first_row, last_row, roles in DataChangeBatcher.merge_changes(changed_roles_by_row):
+      signal_count += 1
+      changed_role_count += (last_row - first_row + 1) * len(roles)
+
+    changed_roles_by_row.clear()
+
+  for completion_time, row in completions:
+    if flush_time is not None and completion_time >= flush_time:
+      flush()
+      flush_time = None
+
+    for roles in [IMAGE_ROLES, LOVED_ROLES]:
+      changed_roles_by_row.setdefault(row, set()).update(roles)
+
+    # The flush timer starts with the first change after a flush
+    if flush_time is None:
+      flush_time = completion_time + FLUSH_INTERVAL
+
+  flush()
+
+  return signal_count, changed_role_count
+
+print(f'\n***** SIMULATED LIST DATA CHANGES ({HISTORY_ITEMS} rows, {FLUSH_INTERVAL} ms frames) *****')
+
+for mode_name, stage_count in [
+  ('Demand-driven rows', len(EnrichmentPipeline.ROW_STAGE_NAMES)),
+  ('Eager enrichment', len(EnrichmentPipeline.STAGES))
+]:
+  completions = simulate_stage_completions(stage_count)
+  unbatched_signals, unbatched_roles = count_unbatched(completions)
+  batched_signals, batched_roles = count_batched(completions)
+
+  print(f'\n{mode_name} ({stage_count} stages per row):')
+  print(f'Unbatched: {unbatched_signals} dataChanged signals for {unbatched_roles} changed row roles')
+  print(f'Batched: {batched_signals} dataChanged signals for {batched_roles} changed row roles')
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+@dataclass(eq=False) # Compare by identity since every load gets its own generation
+class LoadGeneration:
+  '''Shared token for a batch of background work that can be discarded as a whole'''
+
+  is_cancelled: bool = False
+
+  def cancel(self) -> None:
+    self.is_cancelled = True
@@ -1,6 +1,6 @@
 from __future__ import annotations
-from dataclasses import asdict, dataclass
-from typing import List
+from dataclasses import asdict, dataclass, field
+from typing import List, Set
 
 from util.lastfm.LastfmScrobble import LastfmScrobble
 from util.lastfm.LastfmTrack import LastfmTrack
@@ -19,6 +19,9 @@ class Scrobble(LastfmScrobble):
   is_loading: bool = True
   has_error: bool = False
   lastfm_album_url: str = None # This is needed because track info doesn't have it
+  requested_stages: List[str] = field(default_factory=list) # Enrichment stages that were started for this scrobble
+  loaded_fields: List[str] = field(default_factory=list) # Fields whose external data has finished loading
+  loading_stages: Set[str] = field(default_factory=set) # Enrichment stages that were started and haven't finished
 
   @staticmethod
   def from_lastfm_scrobble(lastfm_scrobble: LastfmScrobble) -> Scrobble:
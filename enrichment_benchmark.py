@@ -0,0 +1,94 @@
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+from util.lastfm import LastfmAlbum, LastfmArtistLink
+from util.spotify_api.SpotifySongData import SpotifySongData
+from util.art_provider import ArtProvider
+from util.enrichment import EnrichmentPipeline
+import util.itunes_store_api_helper as itunes_store
+from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
+from datatypes.LoadGeneration import LoadGeneration
+
+# Count the requests each enrichment mode makes for one history reload without touching the network
+HISTORY_ITEMS = int(os.environ.get('INITIAL_HISTORY_ITEMS', 30))
+VISIBLE_ROWS = int(os.environ.get('VISIBLE_ROWS', 12))
+SELECTED_ROWS = int(os.environ.get('SELECTED_ROWS', 1))
+
+request_counts = Counter()
+
+class CountingLastfm:
+  def get_track_info(self, artist_name: str, track_title: str):
+    request_counts['track.getInfo'] += 1
+
+  def get_artist_info(self, artist_name: str):
+    request_counts['artist.getInfo'] += 1
+
+  def get_album_info(self, artist_name: str, album_title: str):
+    request_counts['album.getInfo'] += 1
+
+    # Pretend every other album has Last.fm art
+    if request_counts['album.getInfo'] % 2:
+      return LastfmAlbum(None, album_title, LastfmArtistLink(None, artist_name), ImageSet('small', 'medium'), 0)
+
+class CountingSpotify:
+  def get_track_images(self, artist_name: str, track_title: str=None, album_title: str=None, only_album_art: bool=False):
+    request_counts['Spotify search'] += 1
+    return SpotifySongData([], None)
+
+def count_itunes_request(artist_name: str, track_title: str, album_title: str=None):
+  request_counts['iTunes search'] += 1
+
+itunes_store.get_album_art = count_itunes_request
+
+lastfm = CountingLastfm()
+art_provider = ArtProvider(lastfm, CountingSpotify())
+
+def enrich(scrobble: Scrobble, stage_names=None):
+  '''Run the stages the app would start for a scrobble in dependency order on this thread'''
+
+  run = EnrichmentPipeline.create_run(scrobble, LoadGeneration(), stage_names)
+
+  while not run.is_complete:
+    for stage in run.start_ready_stages():
+      run.complete_stage(stage, stage.load(lastfm, art_provider, scrobble, run.get_input_results(stage)))
+
+def create_history():
+  return [
+    Scrobble(
+      artist_name=f'Artist {i % 7}',
+      track_title=f'Track {i}',
+      album_title=f'Album {i % 11}',
+      album_artist_name=None,
+      timestamp=datetime.now() - timedelta(minutes=3 * i)
+    ) for i in range(HISTORY_ITEMS)
+  ]
+
+def benchmark(is_eager: bool) -> Counter:
+  request_counts.clear()
+  history = create_history()
+
+  if is_eager:
+    for scrobble in history:
+      enrich(scrobble)
+  else:
+    for scrobble in history[:VISIBLE_ROWS]:
+      enrich(scrobble, EnrichmentPipeline.ROW_STAGE_NAMES)
+
+  # Selecting a scrobble loads whatever the details view still needs
+  for scrobble in history[:SELECTED_ROWS]:
+    enrich(scrobble)
+
+  return Counter(request_counts)
+
+eager_counts = benchmark(is_eager=True)
+demand_counts = benchmark(is_eager=False)
+
+print(f'\n***** REQUESTS PER RELOAD ({HISTORY_ITEMS} rows, {VISIBLE_ROWS} visible, {SELECTED_ROWS} selected) *****\n')
+print(f'{"":<16}{"Eager":>8}{"Demand":>8}')
+
+for request_name in sorted(eager_counts.keys() | demand_counts.keys()):
+  print(f'{request_name:<16}{eager_counts[request_name]:>8}{demand_counts[request_name]:>8}')
+
+print(f'{"Total":<16}{sum(eager_counts.values()):>8}{sum(demand_counts.values()):>8}')
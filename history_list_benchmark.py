@@ -0,0 +1,157 @@
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from sys import platform
+
+from util.lastfm import LastfmTrack, LastfmArtistLink
+from util.scrobble_history import HistoryRowCache, ScrobbleColumns
+from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
+
+# Measure how long the history list spends answering role reads while it's scrolled through a long history,
+# and how much memory its rows take in a very long one
+HISTORY_ITEMS = int(os.environ.get('HISTORY_ITEMS', 10000))
+LARGE_HISTORY_ITEMS = int(os.environ.get('LARGE_HISTORY_ITEMS', 100000))
+LIBRARY_TRACKS = int(os.environ.get('LIBRARY_TRACKS', 2000))
+SCROLL_PASSES = int(os.environ.get('SCROLL_PASSES', 3)) # Delegates are recreated every time a row scrolls back into view
+ROLE_COUNT = 6
+
+def create_history(item_count: int):
+  '''Build a history of plays from a library of tracks (LIBRARY_TRACKS) by 15 artists on 40 albums'''
+
+  history = []
+
+  for play in range(item_count):
+    i = play % LIBRARY_TRACKS
+    artist_link = LastfmArtistLink(f'https://www.last.fm/music/{i % 15}', f'Artist {i % 15}')
+
+    history.append(Scrobble(
+      artist_name=f'Artist {i % 15}',
+      track_title=f'Track {i}',
+      album_title=f'Album {i % 40}',
+      album_artist_name=None,
+      timestamp=datetime.now() - timedelta(minutes=3 * play),
+      image_set=ImageSet(f'https://lastfm.freetls.fastly.net/i/u/64s/{i % 40}.png', None),
+      lastfm_track=LastfmTrack(f'https://www.last.fm/music/{i % 15}/_/{i}', f'Track {i}', artist_link, is_loved=i % 7 == 0)
+    ))
+
+  return history
+
+def read_role_from_scrobble(scrobble: Scrobble, role: int):
+  '''How HistoryListModel.data answered a role before rows were cached'''
+
+  if role == 0:
+    return scrobble.track_title
+  elif role == 1:
+    return scrobble.artist_name
+  elif role == 2:
+    if platform == 'win32':
+      return scrobble.timestamp.strftime('%#m/%#d/%y %#I:%M:%S %p')
+    else:
+      return scrobble.timestamp.strftime('%-m/%-d/%y %-I:%M:%S %p')
+  elif role == 3:
+    return scrobble.lastfm_track.is_loved if scrobble.lastfm_track else False
+  elif role == 4:
+    return scrobble.image_set.small_url if scrobble.image_set else ''
+  elif role == 5:
+    return scrobble.lastfm_track is not None
+
+def create_record(scrobble: Scrobble):
+  '''The tuple every row used to keep before rows were stored in columns'''
+
+  return (
+    scrobble.track_title,
+    scrobble.artist_name,
+    scrobble.timestamp.strftime('%-m/%-d/%y %-I:%M:%S %p'),
+    scrobble.lastfm_track.is_loved if scrobble.lastfm_track else False,
+    scrobble.image_set.small_url if scrobble.image_set else '',
+    scrobble.lastfm_track is not None
+  )
+
+def measure_memory(create_rows):
+  tracemalloc.start()
+  rows = create_rows()
+  memory_size = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+
+  return rows, memory_size
+
+history = create_history(HISTORY_ITEMS)
+history_columns = ScrobbleColumns()
+history_columns.extend(history)
+row_cache = HistoryRowCache(lambda: history_columns, lambda row: None)
+
+start_time = time.perf_counter()
+for _ in range(SCROLL_PASSES):
+  for row in range(len(history)):
+    for role in range(ROLE_COUNT):
+      read_role_from_scrobble(history[row], role)
+scrobble_time = time.perf_counter() - start_time
+
+# The first pass builds every record, later passes only read them
+start_time = time.perf_counter()
+for row in range(len(history)):
+  for role in range(ROLE_COUNT):
+    row_cache.get(row)[role]
+first_pass_time = time.perf_counter() - start_time
+
+start_time = time.perf_counter()
+for _ in range(SCROLL_PASSES - 1):
+  for row in range(len(history)):
+    for role in range(ROLE_COUNT):
+      row_cache.get(row)[role]
+cached_time = first_pass_time + time.perf_counter() - start_time
+
+# Scrolling back and forth near the same rows recreates delegates for rows whose records were just built
+start_time = time.perf_counter()
+for _ in range(SCROLL_PASSES * 50):
+  for row in range(200):
+    for role in range(ROLE_COUNT):
+      row_cache.get(row)[role]
+nearby_time = time.perf_counter() - start_time
+
+role_reads = SCROLL_PASSES * len(history) * ROLE_COUNT
+nearby_role_reads = SCROLL_PASSES * 50 * 200 * ROLE_COUNT
+
+print(f'\n***** HISTORY LIST SCROLL ({HISTORY_ITEMS} rows, {SCROLL_PASSES} passes, {role_reads} role reads) *****\n')
+print(f'Read from scrobbles: {scrobble_time * 1000:.1f} ms ({scrobble_time / role_reads * 1e9:.0f} ns per read)')
+print(f'Read from row records: {cached_time * 1000:.1f} ms ({cached_time / role_reads * 1e9:.0f} ns per read)')
+print(f'  First pass (builds records): {first_pass_time * 1000:.1f} ms')
+print(f'  Later passes: {(cached_time - first_pass_time) * 1000:.1f} ms')
+print(f'Read from row records near the visible rows: {nearby_time / nearby_role_reads * 1e9:.0f} ns per read')
+
+large_history = create_history(LARGE_HISTORY_ITEMS)
+
+def create_columns():
+  columns = ScrobbleColumns()
+  columns.extend(large_history)
+
+  return columns
+
+records, record_memory_size = measure_memory(lambda: [create_record(scrobble) for scrobble in large_history])
+columns, column_memory_size = measure_memory(create_columns)
+
+track_url = large_history[3].lastfm_track.url
+
+start_time = time.perf_counter()
+scanned_rows = [
+  row for row, scrobble in enumerate(large_history) if scrobble.lastfm_track and scrobble.lastfm_track.url == track_url
+]
+scan_time = time.perf_counter() - start_time
+
+start_time = time.perf_counter()
+filtered_rows = columns.rows_matching(track_url=track_url)
+filter_time = time.perf_counter() - start_time
+
+assert scanned_rows == filtered_rows
+
+start_time = time.perf_counter()
+columns.rows_by_timestamp()
+sort_time = time.perf_counter() - start_time
+
+print(f'\n***** HISTORY ROW MEMORY ({LARGE_HISTORY_ITEMS} rows) *****\n')
+print(f'Tuple per row: {record_memory_size / 1024 / 1024:.1f} MiB ({record_memory_size / LARGE_HISTORY_ITEMS:.0f} bytes per row)')
+print(f'Columns: {column_memory_size / 1024 / 1024:.1f} MiB ({column_memory_size / LARGE_HISTORY_ITEMS:.0f} bytes per row, {columns.get_memory_size() / LARGE_HISTORY_ITEMS:.0f} without strings)')
+print(f'Filter by track URL: {scan_time * 1000:.1f} ms comparing scrobbles, {filter_time * 1000:.1f} ms comparing interned ids')
+print(f'Sort by timestamp: {sort_time * 1000:.1f} ms')
@@ -0,0 +1,82 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from util.image_cache import ImageDiskCache, ImageMemoryCache
+
+# Simulate the images a long session displays and compare keeping every decoded image with a byte budget
+IMAGE_VIEWS = int(os.environ.get('IMAGE_VIEWS', 50000))
+DISTINCT_IMAGES = int(os.environ.get('DISTINCT_IMAGES', 4000))
+MAX_SIZE = int(os.environ.get('IMAGE_MEMORY_CACHE_BYTES', 64 * 1024 * 1024))
+DISK_IMAGES = int(os.environ.get('DISK_IMAGES', 2000)) # Downloaded files in the disk cache at launch
+DISK_IMAGE_SIZE = 30 * 1024 # About the size of a 300x300 JPEG
+
+# Decoded sizes (32-bit pixels) of the images the app shows
+IMAGE_SIZES = [
+  300 * 300 * 4, # Album art in the details pane
+  64 * 64 * 4, # Album art in the history and friends lists
+  640 * 640 * 4 # Spotify artist photos
+]
+
+def simulate_views():
+  '''Get the image URLs in the order they're displayed, where recent and popular art is shown much more often'''
+
+  randomizer = random.Random(0)
+  weights = [1 / (rank + 1) for rank in range(DISTINCT_IMAGES)] # Zipf-like popularity
+
+  return [f'https://lastfm.freetls.fastly.net/i/u/{i}.png' for i in randomizer.choices(range(DISTINCT_IMAGES), weights, k=IMAGE_VIEWS)]
+
+def get_size(url: str) -> int:
+  image_number = int(url.rsplit('/', 1)[1].split('.')[0])
+
+  return IMAGE_SIZES[image_number % len(IMAGE_SIZES)]
+
+views = simulate_views()
+
+unbounded_cache = {}
+for url in views:
+  if url not in unbounded_cache:
+    unbounded_cache[url] = get_size(url)
+
+cache = ImageMemoryCache(get_size=get_size, max_size=MAX_SIZE)
+peak_size = 0
+for url in views:
+  if cache.get(url) is None:
+    cache.put(url, url)
+
+  peak_size = max(peak_size, cache.size)
+
+print(f'\n***** IMAGE MEMORY CACHE ({IMAGE_VIEWS} views of {DISTINCT_IMAGES} images) *****\n')
+print(f'Unbounded dict: {sum(unbounded_cache.values()) / 1024 / 1024:.0f} MiB, {1 - len(unbounded_cache) / IMAGE_VIEWS:.1%} hit rate')
+print(
+  f'{MAX_SIZE / 1024 / 1024:.0f} MiB LRU: {peak_size / 1024 / 1024:.0f} MiB peak, '
+  f'{cache.hit_count / (cache.hit_count + cache.miss_count):.1%} hit rate, {cache.eviction_count} evictions'
+)
+
+# Launch with a disk cache full of images downloaded in earlier sessions and load all of them
+cache_directory = tempfile.mkdtemp()
+disk_cache = ImageDiskCache(cache_directory)
+image_data = os.urandom(DISK_IMAGE_SIZE)
+
+for i in range(DISK_IMAGES):
+  disk_cache.put(f'https://lastfm.freetls.fastly.net/i/u/{i}.png', image_data)
+
+disk_cache.close()
+
+start_time = time.perf_counter()
+disk_cache = ImageDiskCache(cache_directory)
+open_time = time.perf_counter() - start_time
+
+start_time = time.perf_counter()
+for i in range(DISK_IMAGES):
+  assert disk_cache.get(f'https://lastfm.freetls.fastly.net/i/u/{i}.png') is not None
+read_time = time.perf_counter() - start_time
+
+disk_cache.close()
+shutil.rmtree(cache_directory)
+
+print(f'\n***** IMAGE DISK CACHE COLD START ({DISK_IMAGES} images, {DISK_IMAGES * DISK_IMAGE_SIZE / 1024 / 1024:.0f} MiB) *****\n')
+print(f'Open (read index): {open_time * 1000:.1f} ms')
+print(f'Read every image: {read_time * 1000:.1f} ms ({read_time / DISK_IMAGES * 1e6:.1f} µs per image, no network requests)')
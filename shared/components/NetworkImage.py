@@ -1,12 +1,20 @@
 from PySide2 import QtCore, QtGui, QtQuick, QtQml, QtNetwork
 
+from util.image_cache import ImageDiskCache, ImageMemoryCache
+
 class NetworkImage(QtQuick.QQuickItem):
   has_image_changed = QtCore.Signal()
   should_blank_on_new_source_changed = QtCore.Signal()
   source_changed = QtCore.Signal()
   
   NETWORK_MANAGER = None
-  RAM_IMAGE_CACHE = {}
+
+  # Shared by every instance, and limited to a byte budget (IMAGE_MEMORY_CACHE_BYTES) so least recently displayed images
+  # are dropped instead of every image ever loaded staying decoded in memory
+  RAM_IMAGE_CACHE = ImageMemoryCache(get_size=lambda image: image.sizeInBytes())
+
+  # Downloaded image files kept between launches, set up by the application view model like the network manager
+  DISK_IMAGE_CACHE: ImageDiskCache = None
   
   def __init__(self, parent=None):
     QtQuick.QQuickItem.__init__(self, parent)
@@ -80,11 +88,16 @@ class NetworkImage(QtQuick.QQuickItem):
 
     if self.__reply:
       if self.__reply.error() == QtNetwork.QNetworkReply.NoError:
-        image = QtGui.QImage.fromData(self.__reply.readAll())
+        data = self.__reply.readAll()
+        image = QtGui.QImage.fromData(data)
 
         # Add image to cache if not in cache
         if self.__source not in NetworkImage.RAM_IMAGE_CACHE:
-          NetworkImage.RAM_IMAGE_CACHE[self.__source] = image
+          NetworkImage.RAM_IMAGE_CACHE.put(self.__source, image)
+
+        # Save the downloaded file (not the decoded image, which is much bigger) for the next launch, off the UI thread
+        if NetworkImage.DISK_IMAGE_CACHE and not image.isNull():
+          NetworkImage.DISK_IMAGE_CACHE.put(QtCore.QUrl(self.__source).toString(), data.data())
         
         self.update_image(image)
     
@@ -113,14 +126,39 @@ class NetworkImage(QtQuick.QQuickItem):
     if self.__reply:
       self.__reply.abort()
 
-    if self.__source in NetworkImage.RAM_IMAGE_CACHE:
+    cached_image = NetworkImage.RAM_IMAGE_CACHE.get(self.__source)
+
+    if cached_image is None:
+      cached_image = self.__load_image_from_disk()
+
+    if cached_image is not None:
       # Immediately set image to cached version if exists
-      self.update_image(NetworkImage.RAM_IMAGE_CACHE[self.__source])
+      self.update_image(cached_image)
     else:
       # If cached image doesn't exist, tell network manager to request from source
       self.__reply = NetworkImage.NETWORK_MANAGER.get(QtNetwork.QNetworkRequest(self.__source))
       self.__reply.finished.connect(self.handle_reply)
   
+  def __load_image_from_disk(self):
+    '''Decode the image from the disk cache if it was downloaded before, and keep it in the memory cache'''
+
+    if not NetworkImage.DISK_IMAGE_CACHE:
+      return None
+
+    data = NetworkImage.DISK_IMAGE_CACHE.get(QtCore.QUrl(self.__source).toString())
+
+    if data is None:
+      return None
+
+    image = QtGui.QImage.fromData(data)
+
+    if image.isNull():
+      return None
+
+    NetworkImage.RAM_IMAGE_CACHE.put(self.__source, image)
+
+    return image
+
   # Qt Properties
 
   hasImage = QtCore.Property(bool, lambda self: self.__has_image, notify=has_image_changed)
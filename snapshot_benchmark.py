@@ -0,0 +1,72 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from util.lastfm import LastfmTrack, LastfmArtist, LastfmAlbum, LastfmArtistLink, LastfmTag, LastfmList
+from util.spotify_api import SpotifyArtist
+from util.scrobble_history import HistorySnapshot
+from util.enrichment import EnrichmentPipeline
+from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
+
+# Measure how long it takes to get from a saved history snapshot to scrobbles that are ready to show
+HISTORY_ITEMS = int(os.environ.get('RESIDENT_HISTORY_ITEMS', 200))
+RUNS = 20
+
+def create_enriched_history():
+  '''Build scrobbles with as much data as the details view loads, sharing entities like the app does'''
+
+  artists = {}
+  history = []
+
+  for i in range(HISTORY_ITEMS):
+    artist_name = f'Artist {i % 15}'
+    artist_link = LastfmArtistLink(f'https://www.last.fm/music/{i % 15}', artist_name)
+    tags = [LastfmTag(f'tag {j}', f'https://www.last.fm/tag/{j}') for j in range(5)]
+
+    if artist_name not in artists:
+      artists[artist_name] = LastfmArtist(
+        url=artist_link.url,
+        name=artist_name,
+        plays=100,
+        bio='Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 10,
+        tags=tags,
+        similar_artists=LastfmList([LastfmArtist(f'https://www.last.fm/music/similar{j}', f'Similar {j}') for j in range(5)], 5)
+      )
+
+    history.append(Scrobble(
+      artist_name=artist_name,
+      track_title=f'Track {i}',
+      album_title=f'Album {i % 40}',
+      album_artist_name=None,
+      timestamp=datetime.now() - timedelta(minutes=3 * i),
+      image_set=ImageSet(f'https://lastfm.freetls.fastly.net/i/u/64s/{i % 40}.png', f'https://lastfm.freetls.fastly.net/i/u/300x300/{i % 40}.png'),
+      lastfm_track=LastfmTrack(f'https://www.last.fm/music/{i % 15}/_/{i}', f'Track {i}', artist_link, plays=3, is_loved=False, tags=tags),
+      lastfm_artist=artists[artist_name],
+      lastfm_album=LastfmAlbum(f'https://www.last.fm/music/{i % 15}/{i % 40}', f'Album {i % 40}', artist_link, None, 10),
+      spotify_artists=[SpotifyArtist('https://open.spotify.com/artist/x', artist_name, 'https://i.scdn.co/image/x')],
+      is_loading=False,
+      loaded_fields=[stage.field for stage in EnrichmentPipeline.STAGES]
+    ))
+
+  return history
+
+history = create_enriched_history()
+snapshot = HistorySnapshot('username', history, history[0].timestamp)
+
+start_time = time.perf_counter()
+for _ in range(RUNS):
+  data = snapshot.to_bytes()
+save_time = (time.perf_counter() - start_time) / RUNS
+
+start_time = time.perf_counter()
+for _ in range(RUNS):
+  restored_snapshot = HistorySnapshot.from_bytes(data)
+load_time = (time.perf_counter() - start_time) / RUNS
+
+assert len(restored_snapshot.scrobbles) == HISTORY_ITEMS
+
+print(f'\n***** HISTORY SNAPSHOT ({HISTORY_ITEMS} scrobbles) *****\n')
+print(f'Size: {len(data) / 1024:.1f} KiB')
+print(f'Save: {save_time * 1000:.2f} ms')
+print(f'Time to first row (read snapshot): {load_time * 1000:.2f} ms')
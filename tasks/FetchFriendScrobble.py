@@ -1,10 +1,15 @@
+import logging
+
 from PySide2 import QtCore
 
 from datatypes.FriendScrobble import FriendScrobble
 from util.lastfm import LastfmApiWrapper
 
 class FetchFriendScrobble(QtCore.QObject, QtCore.QRunnable):
-  finished = QtCore.Signal(FriendScrobble, int)
+  '''
+  Signal emitted when the request finishes with the friend's scrobble, the friend index, and whether there was an error
+  '''
+  finished = QtCore.Signal(FriendScrobble, int, bool)
 
   def __init__(self, lastfm: LastfmApiWrapper, username: str, friend_index: int):
     QtCore.QObject.__init__(self)
@@ -17,5 +22,9 @@ class FetchFriendScrobble(QtCore.QObject, QtCore.QRunnable):
   def run(self) -> None:
     '''Load the friend's most recent scrobble from Last.fm'''
 
-    scrobble = self.lastfm.get_friend_scrobble(self.username)
-    self.finished.emit(scrobble, self.friend_index)
\ No newline at end of file
+    try:
+      scrobble = self.lastfm.get_friend_scrobble(self.username)
+      self.finished.emit(scrobble, self.friend_index, False)
+    except Exception as err:
+      logging.warning(f'Could not load scrobble for friend {self.username}: {err}')
+      self.finished.emit(None, self.friend_index, True)
\ No newline at end of file
@@ -4,15 +4,16 @@ from util.art_provider import ArtProvider
 from datatypes.FriendScrobble import FriendScrobble
 
 class FetchFriendScrobbleArt(QtCore.QObject, QtCore.QRunnable):
-  finished = QtCore.Signal(int)
+  # The friend's row can move while the art loads, so pass the username and scrobble back
+  finished = QtCore.Signal(str, FriendScrobble)
 
-  def __init__(self, art_provider: ArtProvider, friend_scrobble: FriendScrobble, row_in_friends_list: int):
+  def __init__(self, art_provider: ArtProvider, username: str, friend_scrobble: FriendScrobble):
     QtCore.QObject.__init__(self)
     QtCore.QRunnable.__init__(self)
     self.art_provider = art_provider
+    self.username = username
     self.friend_scrobble = friend_scrobble
     self.setAutoDelete(True)
-    self.row_in_friends_list = row_in_friends_list
 
   def run(self) -> None:
     '''Fetch album art for the passed FriendScrobble'''
@@ -26,4 +27,4 @@ class FetchFriendScrobbleArt(QtCore.QObject, QtCore.QRunnable):
     if album_art:
       self.friend_scrobble.image_url = album_art.medium_url
 
-    self.finished.emit(self.row_in_friends_list)
\ No newline at end of file
+    self.finished.emit(self.username, self.friend_scrobble)
\ No newline at end of file
@@ -1,4 +1,7 @@
 import os
+import logging
+from datetime import datetime
+
 from util.lastfm.LastfmList import LastfmList
 
 from PySide2 import QtCore
@@ -9,19 +12,29 @@ from util.lastfm import LastfmApiWrapper
 class FetchRecentScrobbles(QtCore.QObject, QtCore.QRunnable):
   finished = QtCore.Signal(LastfmList)
 
-  def __init__(self, lastfm: LastfmApiWrapper, count: int) -> None:
+  def __init__(self, lastfm: LastfmApiWrapper, count: int, from_date: datetime=None, to_date: datetime=None) -> None:
     QtCore.QObject.__init__(self)
     QtCore.QRunnable.__init__(self)
     self.lastfm = lastfm
     self.count = count
+    self.from_date = from_date # Only fetch scrobbles after this date if set
+    self.to_date = to_date # Only fetch scrobbles before this date if set (to page back through the history)
     self.setAutoDelete(True)
 
   def run(self) -> None:
     recent_scrobbles = None
 
     if os.environ.get('MOCK'):
-      recent_scrobbles = get_mock_recent_scrobbles(self.count)
+      # Mock history never changes remotely and has no older pages, so there is never anything else to fetch
+      if not self.from_date and not self.to_date:
+        recent_scrobbles = get_mock_recent_scrobbles(self.count)
+      else:
+        recent_scrobbles = LastfmList(items=[], attr_total=0)
     else:
-      recent_scrobbles = self.lastfm.get_recent_scrobbles(self.count)
+      try:
+        recent_scrobbles = self.lastfm.get_recent_scrobbles(self.count, from_date=self.from_date, to_date=self.to_date)
+      except Exception as err:
+        # Still finish so the history stops loading and can be reloaded once the connection is back
+        logging.warning(f'Could not fetch recent scrobbles: {err}')
     
     self.finished.emit(recent_scrobbles)
\ No newline at end of file
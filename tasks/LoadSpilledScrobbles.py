@@ -0,0 +1,16 @@
+from PySide2 import QtCore
+
+from util import db_helper
+
+class LoadSpilledScrobbles(QtCore.QObject, QtCore.QRunnable):
+  finished = QtCore.Signal(object) # Scrobbles keyed by position
+
+  def __init__(self, first_position: int, last_position: int) -> None:
+    QtCore.QObject.__init__(self)
+    QtCore.QRunnable.__init__(self)
+    self.first_position = first_position
+    self.last_position = last_position # Inclusive
+    self.setAutoDelete(True)
+
+  def run(self) -> None:
+    self.finished.emit(db_helper.get_spilled_scrobbles_in_background(self.first_position, self.last_position))
@@ -0,0 +1,21 @@
+import requests
+from PySide2 import QtCore
+
+class ProbeConnectivity(QtCore.QObject, QtCore.QRunnable):
+  finished = QtCore.Signal(bool) # Whether the internet could be reached
+
+  __PROBE_URL = 'https://1.1.1.1'
+  __TIMEOUT = 5 # Seconds
+
+  def __init__(self):
+    QtCore.QObject.__init__(self)
+    QtCore.QRunnable.__init__(self)
+    self.setAutoDelete(True)
+
+  def run(self):
+    try:
+      # Only the headers are needed to know the request went through
+      requests.head(ProbeConnectivity.__PROBE_URL, timeout=ProbeConnectivity.__TIMEOUT)
+      self.finished.emit(True)
+    except requests.exceptions.RequestException:
+      self.finished.emit(False)
@@ -0,0 +1,47 @@
+import logging
+
+from PySide2 import QtCore
+
+from util.lastfm import LastfmApiWrapper
+from util.art_provider import ArtProvider
+from util.enrichment import EnrichmentRun, EnrichmentStage
+from util.network_health import NetworkUnavailableError
+
+class RunEnrichmentStage(QtCore.QObject, QtCore.QRunnable):
+  finished = QtCore.Signal(EnrichmentRun, EnrichmentStage, object)
+  deferred = QtCore.Signal(EnrichmentRun, EnrichmentStage) # The internet couldn't be reached, try again later
+
+  def __init__(self, lastfm: LastfmApiWrapper, art_provider: ArtProvider, run: EnrichmentRun, stage: EnrichmentStage):
+    QtCore.QObject.__init__(self)
+    QtCore.QRunnable.__init__(self)
+    self.lastfm = lastfm
+    self.art_provider = art_provider
+    self.run_state = run # self.run is the QRunnable entry point
+    self.stage = stage
+    self.setAutoDelete(True)
+
+  def run(self):
+    # Skip the request entirely if the load this stage belongs to was discarded while it was queued
+    if self.run_state.generation and self.run_state.generation.is_cancelled:
+      return
+
+    input_results = self.run_state.get_input_results(self.stage)
+    result = None
+
+    try:
+      result = self.stage.load(self.lastfm, self.art_provider, self.run_state.scrobble, input_results)
+    except NetworkUnavailableError as err:
+      logging.debug(f'Deferring {self.stage.name} stage: {err}')
+      self.deferred.emit(self.run_state, self.stage)
+      return
+    except Exception as err:
+      if self.stage.is_essential:
+        self.run_state.scrobble.has_error = True
+
+      logging.warning(err)
+
+    # Drop the result if the load was discarded while the request was running
+    if self.run_state.generation and self.run_state.generation.is_cancelled:
+      return
+
+    self.finished.emit(self.run_state, self.stage, result) # Result could be None
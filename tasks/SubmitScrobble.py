@@ -15,7 +15,7 @@ class SubmitScrobble(QtCore.QRunnable): # Don't inherit from QObject because no
   
   def run(self):
     if os.environ.get('MOCK'):
-      logging.info(f'MOCK submitted: {self.scrobble.title}')
+      logging.info(f'MOCK submitted: {self.scrobble.track_title}')
       return
 
     self.lastfm.submit_scrobble(
@@ -4,7 +4,9 @@ from PySide2 import QtCore
 
 from util.lastfm import LastfmApiWrapper
 
-class UpdateNowPlaying(QtCore.QRunnable): # Don't inherit from QObject because no signals are used
+class UpdateNowPlaying(QtCore.QObject, QtCore.QRunnable):
+  finished = QtCore.Signal(bool) # Whether Last.fm accepted the update
+
   def __init__(
     self, 
     lastfm: LastfmApiWrapper,
@@ -14,6 +16,7 @@ class UpdateNowPlaying(QtCore.QRunnable): # Don't inherit from QObject because n
     album_title: str,
     album_artist_name: str
   ) -> None:
+    QtCore.QObject.__init__(self)
     QtCore.QRunnable.__init__(self)
     self.lastfm = lastfm
     self.artist_name = artist_name
@@ -24,12 +27,18 @@ class UpdateNowPlaying(QtCore.QRunnable): # Don't inherit from QObject because n
     self.setAutoDelete(True)
   
   def run(self) -> None:
-    self.lastfm.update_now_playing(
-      artist_name=self.artist_name,
-      track_title=self.track_title,
-      duration=self.duration,
-      album_title=self.album_title,
-      album_artist_name=self.album_artist_name
-    )
+    try:
+      self.lastfm.update_now_playing(
+        artist_name=self.artist_name,
+        track_title=self.track_title,
+        duration=self.duration,
+        album_title=self.album_title,
+        album_artist_name=self.album_artist_name
+      )
+    except Exception as err:
+      logging.warning(f'Could not update now playing to "{self.track_title}" on Last.fm: {err}')
+      self.finished.emit(False)
+      return
     
-    logging.info(f'Now playing updated to "{self.track_title}" on Last.fm')
\ No newline at end of file
+    logging.info(f'Now playing updated to "{self.track_title}" on Last.fm')
+    self.finished.emit(True)
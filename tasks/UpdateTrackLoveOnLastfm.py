@@ -2,22 +2,31 @@ import logging
 
 from PySide2 import QtCore
 
-from datatypes.Scrobble import Scrobble
 from util.lastfm.LastfmApiWrapper import LastfmApiWrapper
 
-class UpdateTrackLoveOnLastfm(QtCore.QRunnable):
-  def __init__(self, lastfm: LastfmApiWrapper, scrobble: Scrobble, value: bool):
+class UpdateTrackLoveOnLastfm(QtCore.QObject, QtCore.QRunnable):
+  finished = QtCore.Signal(bool) # Whether Last.fm accepted the change
+
+  def __init__(self, lastfm: LastfmApiWrapper, artist_name: str, track_title: str, value: bool):
+    QtCore.QObject.__init__(self)
     QtCore.QRunnable.__init__(self)
     self.lastfm = lastfm
-    self.scrobble = scrobble
+    self.artist_name = artist_name
+    self.track_title = track_title
     self.value = value
     self.setAutoDelete(True)
   
   def run(self):
-    self.lastfm.set_track_is_loved(
-      artist_name=self.scrobble.lastfm_artist.name,
-      track_title=self.scrobble.lastfm_track.title,
-      is_loved=self.value
-    )
+    try:
+      self.lastfm.set_track_is_loved(
+        artist_name=self.artist_name,
+        track_title=self.track_title,
+        is_loved=self.value
+      )
+    except Exception as err:
+      logging.warning(f'Could not set Last.fm loved for "{self.track_title}" to {self.value}: {err}')
+      self.finished.emit(False)
+      return
 
-    logging.info(f'Set Last.fm loved for "{self.scrobble.track_title}" to {self.value}')
\ No newline at end of file
+    logging.info(f'Set Last.fm loved for "{self.track_title}" to {self.value}')
+    self.finished.emit(True)
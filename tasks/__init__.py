@@ -2,13 +2,12 @@ from .FetchFriends import FetchFriends
 from .FetchFriendScrobble import FetchFriendScrobble
 from .FetchFriendScrobbleArt import FetchFriendScrobbleArt
 from .FetchProfileStatistics import FetchProfileStatistics
-from .LoadLastfmTrackInfo import LoadLastfmTrackInfo
-from .LoadLastfmArtistInfo import LoadLastfmArtistInfo
-from .LoadLastfmAlbumInfo import LoadLastfmAlbumInfo
-from .LoadTrackImages import LoadTrackImages
+from .RunEnrichmentStage import RunEnrichmentStage
 from .FetchRecentScrobbles import FetchRecentScrobbles
 from .UpdateTrackLoveOnLastfm import UpdateTrackLoveOnLastfm
 from .FetchPlayerPosition import FetchPlayerPosition
 from .UpdateNowPlaying import UpdateNowPlaying
 from .SubmitScrobble import SubmitScrobble
-from .LoadProfileSpotifyArtists import LoadProfileSpotifyArtists
\ No newline at end of file
+from .ProbeConnectivity import ProbeConnectivity
+from .LoadProfileSpotifyArtists import LoadProfileSpotifyArtists
+from .LoadSpilledScrobbles import LoadSpilledScrobbles
\ No newline at end of file
@@ -1,4 +1,6 @@
-from util.lastfm import LastfmApiWrapper
+from typing import Callable
+
+from util.lastfm import LastfmApiWrapper, LastfmAlbum
 from util.spotify_api import SpotifyApiWrapper
 from datatypes.ImageSet import ImageSet
 from .ScrobbleImages import ScrobbleImages
@@ -13,26 +15,13 @@ class ArtProvider:
   def get_album_art(self, artist_name: str, track_title: str=None, album_title: str=None) -> ImageSet:
     '''Get album art from whichever source can find it'''
 
-    album_art = ImageSet(None, None)
-
-    # 1. Try geting album art from Last.fm if there's an album title to work with
-    if album_title:
-      album_art = self.__get_lastfm_album_art(artist_name, album_title)
-
-    if not album_art:
-      # 2. Try geting album art from the Spotify api (doesn't need an album title, has more art)
-      album_art = self.spotify_api.get_track_images(
-        artist_name,
-        track_title,
-        album_title,
-        only_album_art=True # We don't want artist images
-      ).album_art
-
-      if not album_art:
-        # 3. Try geting album art from the iTunes Store api
-        album_art = itunes_store.get_album_art(artist_name, track_title, album_title)
-
-    return album_art
+    return self.__resolve_album_art(
+      artist_name,
+      track_title,
+      album_title,
+      lastfm_album_art=self.__get_lastfm_album_art(artist_name, album_title),
+      get_spotify_album_art=lambda: self.__search_spotify_album_art(artist_name, track_title, album_title)
+    )
 
   def get_scrobble_images(
     self,
@@ -42,40 +31,101 @@ class ArtProvider:
   ) -> ScrobbleImages:
     '''Get Spotify artist images and album art'''
 
-    # 1. Try getting artist images and album art from Spotify
+    # Get artist images and album art from Spotify in one request
     spotify_data = self.spotify_api.get_track_images(artist_name, track_title, album_title)
-    
-    # 2. Try getting album art from Last.fm (we prefer Last.fm art to Spotify art if it exists)
-    album_art = self.__get_lastfm_album_art(artist_name, album_title)
-
-    if not album_art:
-      if spotify_data.album_art:
-        # 3. Use Spotify album art if there is any
-        album_art = spotify_data.album_art
-      else:
-        # 4. Try getting art from the iTunes Store api
-        album_art = itunes_store.get_album_art(artist_name, track_title, album_title)
+
+    album_art = self.__resolve_album_art(
+      artist_name,
+      track_title,
+      album_title,
+      lastfm_album_art=self.__get_lastfm_album_art(artist_name, album_title),
+      get_spotify_album_art=lambda: spotify_data.album_art
+    )
 
     return ScrobbleImages(album_art, spotify_data.artists)
 
+  def get_scrobble_album_art(
+    self,
+    artist_name: str,
+    track_title: str,
+    album_title: str,
+    lastfm_album: LastfmAlbum,
+    spotify_album_art: ImageSet=None,
+    should_search_spotify: bool=False
+  ) -> ImageSet:
+    '''Get album art reusing Last.fm album info and Spotify art that were already loaded'''
+
+    return self.__resolve_album_art(
+      artist_name,
+      track_title,
+      album_title,
+      lastfm_album_art=self.__get_lastfm_album_art(
+        artist_name,
+        album_title,
+        album_info=lastfm_album,
+        should_fetch_album_info=False
+      ),
+      get_spotify_album_art=lambda: spotify_album_art or (
+        self.__search_spotify_album_art(artist_name, track_title, album_title) if should_search_spotify else None
+      )
+    )
+
   # --- Private Methods ---
 
-  def __get_lastfm_album_art(self, artist_name: str, album_title: str) -> ImageSet:
-    '''Get an album's artwork from Last.fm'''
+  def __resolve_album_art(
+    self,
+    artist_name: str,
+    track_title: str,
+    album_title: str,
+    lastfm_album_art: ImageSet,
+    get_spotify_album_art: Callable[[], ImageSet]
+  ) -> ImageSet:
+    '''Pick album art from the first source that has it, the same way for every kind of request'''
+
+    # 1. Use Last.fm album art if there is any (we prefer Last.fm art to Spotify art if it exists)
+    if lastfm_album_art:
+      return lastfm_album_art
+
+    # 2. Use Spotify album art if there is any (doesn't need an album title, has more art)
+    spotify_album_art = get_spotify_album_art()
+
+    if spotify_album_art:
+      return spotify_album_art
+
+    # 3. Try getting art from the iTunes Store api
+    return itunes_store.get_album_art(artist_name, track_title, album_title)
+
+  def __search_spotify_album_art(self, artist_name: str, track_title: str, album_title: str) -> ImageSet:
+    return self.spotify_api.get_track_images(
+      artist_name,
+      track_title,
+      album_title,
+      only_album_art=True # We don't want artist images
+    ).album_art
+
+  def __get_lastfm_album_art(
+    self,
+    artist_name: str,
+    album_title: str,
+    album_info: LastfmAlbum=None,
+    should_fetch_album_info: bool=True
+  ) -> ImageSet:
+    '''Get an album's artwork from Last.fm, loading the album info unless it was already loaded'''
 
-    album_info = self.lastfm.get_album_info(artist_name, album_title)
+    if not album_title:
+      return None
 
-    if not album_info:
-      return
+    if should_fetch_album_info:
+      album_info = self.lastfm.get_album_info(artist_name, album_title)
 
-    if album_info.image_set:
+    if album_info and album_info.image_set:
       return album_info.image_set
 
+    # Try the album without the single suffix
     if ' - Single' in album_title:
       album_info = self.lastfm.get_album_info(artist_name, album_title.replace(' - Single', ''))
 
-      if album_info:
-        if album_info.image_set:
-          return album_info.image_set
+      if album_info and album_info.image_set:
+        return album_info.image_set
 
     return None
\ No newline at end of file
@@ -0,0 +1,89 @@
+import logging
+import os
+
+from PySide2 import QtCore
+
+from tasks import ProbeConnectivity
+from util.network_health import NetworkHealth
+
+class ConnectivityMonitor(QtCore.QObject):
+  '''
+  Check whether the internet can be reached in the background, more often while offline
+
+  Changes noticed by NetworkHealth from the requests the app makes anyway are picked up between probes
+  '''
+
+  is_online_changed = QtCore.Signal(bool)
+
+  # Carry NetworkHealth changes from the thread that made the request over to the thread the monitor lives on
+  __network_health_changed = QtCore.Signal(bool)
+
+  # Intervals (ms) between probes while online, and the range probes back off within while offline
+  __ONLINE_PROBE_INTERVAL = int(os.environ.get('CONNECTIVITY_PROBE_INTERVAL', 60 * 1000))
+  __MIN_OFFLINE_PROBE_INTERVAL = 2 * 1000
+  __MAX_OFFLINE_PROBE_INTERVAL = 60 * 1000
+
+  def __init__(self, parent: QtCore.QObject=None) -> None:
+    QtCore.QObject.__init__(self, parent)
+
+    # Assume the internet can be reached until a probe says otherwise so nothing waits on the first probe
+    self.is_online = True
+
+    self.__is_probing = False
+    self.__offline_probe_interval = ConnectivityMonitor.__MIN_OFFLINE_PROBE_INTERVAL
+
+    self.__probe_timer = QtCore.QTimer(self)
+    self.__probe_timer.setSingleShot(True)
+    self.__probe_timer.timeout.connect(self.probe)
+
+    self.__network_health = NetworkHealth.shared()
+    self.__network_health_changed.connect(self.__set_is_online)
+    self.__network_health.add_listener(self.__network_health_changed.emit)
+
+  def probe(self) -> None:
+    '''Check connectivity now instead of waiting for the next scheduled probe'''
+
+    if self.__is_probing:
+      return
+
+    self.__is_probing = True
+    self.__probe_timer.stop()
+
+    probe_connectivity = ProbeConnectivity()
+    probe_connectivity.finished.connect(self.__handle_probe_finished)
+    QtCore.QThreadPool.globalInstance().start(probe_connectivity)
+
+  # --- Private Methods ---
+
+  def __handle_probe_finished(self, is_online: bool) -> None:
+    self.__is_probing = False
+
+    # Let requests through again right away instead of waiting for NetworkHealth to try one on its own
+    if is_online:
+      self.__network_health.record_success()
+
+    self.__set_is_online(is_online)
+
+  def __set_is_online(self, is_online: bool) -> None:
+    if not self.__is_probing:
+      self.__schedule_probe(is_online)
+
+    if is_online != self.is_online:
+      self.is_online = is_online
+      logging.info('Connection restored' if is_online else 'Connection lost')
+      self.is_online_changed.emit(is_online)
+
+  def __schedule_probe(self, is_online: bool) -> None:
+    if is_online:
+      self.__offline_probe_interval = ConnectivityMonitor.__MIN_OFFLINE_PROBE_INTERVAL
+      self.__probe_timer.start(ConnectivityMonitor.__ONLINE_PROBE_INTERVAL)
+    elif not self.is_online and self.__probe_timer.isActive():
+      # Keep backing off instead of starting over every time a request fails during an outage
+      return
+    else:
+      # Back off so a long outage doesn't mean a probe every few seconds
+      self.__probe_timer.start(self.__offline_probe_interval)
+      self.__offline_probe_interval = min(
+        self.__offline_probe_interval * 2,
+        ConnectivityMonitor.__MAX_OFFLINE_PROBE_INTERVAL
+      )
@@ -0,0 +1 @@
+from .ConnectivityMonitor import ConnectivityMonitor
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from PySide2 import QtCore
+
+class DataChangeBatcher(QtCore.QObject):
+  '''
+  Collect the rows and roles of a list model that changed and tell the view about them once per frame
+
+  Rows that change several times within a frame (like a history row whose data loads in stages) are only
+  re-evaluated once, and neighboring rows with the same changed roles are combined into one dataChanged range
+  '''
+
+  __FLUSH_INTERVAL = int(os.environ.get('DATA_CHANGE_BATCH_INTERVAL', 16)) # About one frame (ms) at 60 fps
+
+  def __init__(self, model: QtCore.QAbstractItemModel) -> None:
+    QtCore.QObject.__init__(self, model)
+    self.__model = model
+
+    # Map each changed row to the roles that changed in it
+    self.__changed_roles_by_row: Dict[int, Set[int]] = {}
+
+    self.__flush_timer = QtCore.QTimer(self)
+    self.__flush_timer.setSingleShot(True)
+    self.__flush_timer.setInterval(DataChangeBatcher.__FLUSH_INTERVAL)
+    self.__flush_timer.timeout.connect(self.flush)
+
+  def mark_changed(self, first_row: int, last_row: int, roles: List[int]) -> None:
+    '''Queue a dataChanged for a range of rows (inclusive) to be sent with the next flush'''
+
+    for row in range(first_row, last_row + 1):
+      self.__changed_roles_by_row.setdefault(row, set()).update(roles)
+
+    if not self.__flush_timer.isActive():
+      self.__flush_timer.start()
+
+  def flush(self) -> None:
+    '''Send every queued change now (before rows move, so the queued rows still point to the right items)'''
+
+    self.__flush_timer.stop()
+
+    if not self.__changed_roles_by_row:
+      return
+
+    ranges = DataChangeBatcher.merge_changes(self.__changed_roles_by_row)
+    self.__changed_roles_by_row = {}
+    row_count = self.__model.rowCount()
+
+    for first_row, last_row, roles in ranges:
+      # Skip rows that were removed since they changed
+      if first_row >= row_count:
+        continue
+
+      self.__model.dataChanged.emit(
+        self.__model.index(first_row, 0),
+        self.__model.index(min(last_row, row_count - 1), 0),
+        sorted(roles)
+      )
+
+  def discard(self) -> None:
+    '''Drop queued changes because the model is being reset'''
+
+    self.__flush_timer.stop()
+    self.__changed_roles_by_row = {}
+
+  @staticmethod
+  def merge_changes(changed_roles_by_row: Dict[int, Set[int]]) -> List[Tuple[int, int, FrozenSet[int]]]:
+    '''
+    Group changed rows into (first, last, roles) ranges of consecutive rows with the same changed roles
+
+    in: {0: {1}, 1: {1}, 2: {1, 2}, 5: {1}}
+    out: [(0, 1, {1}), (2, 2, {1, 2}), (5, 5, {1})]
+    '''
+
+    ranges = []
+
+    for row in sorted(changed_roles_by_row):
+      roles = frozenset(changed_roles_by_row[row])
+
+      if ranges and ranges[-1][1] == row - 1 and ranges[-1][2] == roles:
+        ranges[-1] = (ranges[-1][0], row, roles)
+      else:
+        ranges.append((row, row, roles))
+
+    return ranges
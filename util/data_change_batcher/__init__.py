@@ -0,0 +1 @@
+from .DataChangeBatcher import DataChangeBatcher
\ No newline at end of file
@@ -1,18 +1,37 @@
+import os
 import sys
 import logging
+import threading
+from datetime import datetime
+from typing import Dict, List
 
 from PySide2 import QtCore, QtSql
 
 from util.lastfm.LastfmSession import LastfmSession
+from util.lastfm.LastfmTrack import LastfmTrack
+from util.lastfm.LastfmArtistLink import LastfmArtistLink
+from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
+
+def get_database_path() -> str:
+  if getattr(sys, 'frozen', False):
+    return os.path.join(get_data_directory(), 'LastRedux-db-private-beta-2.sqlite')
+
+  return os.path.join(get_data_directory(), 'db.sqlite')
+
+def get_data_directory() -> str:
+  '''Get the directory the app keeps its database and the rest of its data in'''
+
+  if getattr(sys, 'frozen', False):
+    return QtCore.QDir.homePath()
+
+  # Keep development data in the project directory instead of wherever the app was launched from
+  return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 def connect():
   # Connect to SQLite for the first time
   db = QtSql.QSqlDatabase.addDatabase('QSQLITE')
-
-  if getattr(sys, 'frozen', False):
-    db.setDatabaseName(QtCore.QDir.homePath() + '/LastRedux-db-private-beta-2.sqlite')
-  else:
-    db.setDatabaseName('db.sqlite')
+  db.setDatabaseName(get_database_path())
 
   # Open the database and log connection status
   if db.open():
@@ -112,4 +131,213 @@ def save_default_preferences_to_database(media_player_preference: str):
   insert_query.exec_()
   insert_query.prepare('INSERT INTO preferences (key, value) VALUES ("media_player", :value)')
   insert_query.bindValue(':value', media_player_preference)
-  insert_query.exec_()
\ No newline at end of file
+  insert_query.exec_()
+
+def create_spilled_scrobbles_table():
+  create_table_query = QtSql.QSqlQuery()
+  create_table_query.exec_(
+    'CREATE TABLE IF NOT EXISTS spilled_scrobbles('
+    'position integer primary key, artist_name text, track_title text, album_title text, album_artist_name text, '
+    'timestamp integer, track_url text, artist_url text, is_loved integer, small_image_url text, medium_image_url text)'
+  )
+
+  # Find every spilled scrobble of a track without scanning the table
+  create_index_query = QtSql.QSqlQuery()
+  create_index_query.exec_('CREATE INDEX IF NOT EXISTS spilled_scrobbles_track_url ON spilled_scrobbles(track_url)')
+
+def save_spilled_scrobbles(scrobbles_by_position: Dict[int, Scrobble], should_clear_table: bool=False):
+  '''
+  Save the parts of scrobbles needed to show them in the history list in one transaction, replacing any scrobbles at
+  the same positions (and every other spilled scrobble if should_clear_table is set)
+  '''
+
+  db = QtSql.QSqlDatabase.database()
+  db.transaction()
+
+  if should_clear_table:
+    create_spilled_scrobbles_table()
+    delete_spilled_scrobbles()
+
+  insert_query = QtSql.QSqlQuery()
+  insert_query.prepare(
+    'INSERT OR REPLACE INTO spilled_scrobbles VALUES ('
+    ':position, :artist_name, :track_title, :album_title, :album_artist_name, '
+    ':timestamp, :track_url, :artist_url, :is_loved, :small_image_url, :medium_image_url)'
+  )
+
+  for position, scrobble in scrobbles_by_position.items():
+    insert_query.bindValue(':position', position)
+    insert_query.bindValue(':artist_name', scrobble.artist_name)
+    insert_query.bindValue(':track_title', scrobble.track_title)
+    insert_query.bindValue(':album_title', scrobble.album_title)
+    insert_query.bindValue(':album_artist_name', scrobble.album_artist_name)
+    insert_query.bindValue(':timestamp', int(scrobble.timestamp.timestamp()) if scrobble.timestamp else None)
+    insert_query.bindValue(':track_url', scrobble.lastfm_track.url if scrobble.lastfm_track else None)
+    insert_query.bindValue(':artist_url', scrobble.lastfm_track.artist_link.url if scrobble.lastfm_track else None)
+    insert_query.bindValue(':is_loved', int(bool(scrobble.lastfm_track and scrobble.lastfm_track.is_loved)))
+    insert_query.bindValue(':small_image_url', scrobble.image_set.small_url if scrobble.image_set else None)
+    insert_query.bindValue(':medium_image_url', scrobble.image_set.medium_url if scrobble.image_set else None)
+    insert_query.exec_()
+
+  db.commit()
+
+def save_spilled_scrobble(position: int, scrobble: Scrobble):
+  '''Save the parts of a scrobble needed to show it in the history list, replacing any scrobble at the same position'''
+
+  save_spilled_scrobbles({position: scrobble})
+
+def get_spilled_scrobbles(
+  first_position: int,
+  last_position: int,
+  db: QtSql.QSqlDatabase=None
+) -> Dict[int, Scrobble]:
+  '''Rebuild the spilled scrobbles between two positions (inclusive) keyed by position'''
+
+  query = QtSql.QSqlQuery(db) if db else QtSql.QSqlQuery()
+  query.prepare('SELECT * FROM spilled_scrobbles WHERE position BETWEEN :first_position AND :last_position')
+  query.bindValue(':first_position', first_position)
+  query.bindValue(':last_position', last_position)
+  query.exec_()
+
+  scrobbles = {}
+
+  while query.next():
+    value = lambda key: query.value(query.record().indexOf(key)) or None # Convert empty values to None
+    timestamp = value('timestamp')
+    track_url = value('track_url')
+
+    scrobbles[query.value(query.record().indexOf('position'))] = Scrobble(
+      artist_name=value('artist_name'),
+      track_title=value('track_title'),
+      album_title=value('album_title'),
+      album_artist_name=value('album_artist_name'),
+      timestamp=datetime.fromtimestamp(timestamp) if timestamp else None,
+      image_set=ImageSet(
+        small_url=value('small_image_url'),
+        medium_url=value('medium_image_url')
+      ),
+      lastfm_track=LastfmTrack(
+        url=track_url,
+        title=value('track_title'),
+        artist_link=LastfmArtistLink(
+          url=value('artist_url'),
+          name=value('artist_name')
+        ),
+        is_loved=bool(value('is_loved'))
+      ) if track_url else None,
+      is_loading=False
+    )
+
+  return scrobbles
+
+def get_spilled_scrobbles_in_background(first_position: int, last_position: int) -> Dict[int, Scrobble]:
+  '''Read spilled scrobbles from a background thread, which needs its own connection to the database'''
+
+  # Connections can only be used by the thread that opened them
+  connection_name = f'spilled_scrobbles_{threading.get_ident()}'
+  db = QtSql.QSqlDatabase.addDatabase('QSQLITE', connection_name)
+  db.setDatabaseName(get_database_path())
+
+  # Wait for spilled scrobbles that are being written on the main thread instead of failing
+  db.setConnectOptions('QSQLITE_BUSY_TIMEOUT=1000')
+  scrobbles = {}
+
+  if db.open():
+    scrobbles = get_spilled_scrobbles(first_position, last_position, db)
+    db.close()
+  else:
+    logging.warning(f'Could not read spilled scrobbles: {db.lastError().text()}')
+
+  # The connection can only be removed once nothing refers to it
+  del db
+  QtSql.QSqlDatabase.removeDatabase(connection_name)
+
+  return scrobbles
+
+def set_spilled_scrobbles_is_loved(track_url: str, is_loved: bool):
+  update_query = QtSql.QSqlQuery()
+  update_query.prepare('UPDATE spilled_scrobbles SET is_loved = :is_loved WHERE track_url = :track_url')
+  update_query.bindValue(':is_loved', int(is_loved))
+  update_query.bindValue(':track_url', track_url)
+  update_query.exec_()
+
+def delete_spilled_scrobbles():
+  delete_query = QtSql.QSqlQuery()
+  delete_query.exec_('DELETE FROM spilled_scrobbles')
+
+def create_pending_track_loves_table():
+  # Changes saved before they were tagged with a username can't be sent for the right account, so drop them
+  table_info_query = QtSql.QSqlQuery('PRAGMA table_info(pending_track_loves)')
+  column_names = []
+
+  while table_info_query.next():
+    column_names.append(table_info_query.value(table_info_query.record().indexOf('name')))
+
+  if column_names and 'username' not in column_names:
+    drop_table_query = QtSql.QSqlQuery()
+    drop_table_query.exec_('DROP TABLE pending_track_loves')
+
+  create_table_query = QtSql.QSqlQuery()
+  create_table_query.exec_(
+    'CREATE TABLE IF NOT EXISTS pending_track_loves('
+    'username text, artist_name text, track_title text, is_loved integer, was_loved integer, '
+    'PRIMARY KEY (username, artist_name, track_title))'
+  )
+
+def get_pending_track_loves(username: str) -> Dict[tuple, tuple]:
+  '''Get a user's loved status changes that haven't been sent to Last.fm as {(artist, title): (is_loved, was_loved)}'''
+
+  query = QtSql.QSqlQuery()
+  query.prepare('SELECT * FROM pending_track_loves WHERE username = :username')
+  query.bindValue(':username', username)
+  query.exec_()
+
+  pending_track_loves = {}
+
+  while query.next():
+    value = lambda key: query.value(query.record().indexOf(key))
+    pending_track_loves[(value('artist_name'), value('track_title'))] = (bool(value('is_loved')), bool(value('was_loved')))
+
+  return pending_track_loves
+
+def save_pending_track_love(username: str, artist_name: str, track_title: str, is_loved: bool, was_loved: bool):
+  insert_query = QtSql.QSqlQuery()
+  insert_query.prepare(
+    'INSERT OR REPLACE INTO pending_track_loves '
+    'VALUES (:username, :artist_name, :track_title, :is_loved, :was_loved)'
+  )
+  insert_query.bindValue(':username', username)
+  insert_query.bindValue(':artist_name', artist_name)
+  insert_query.bindValue(':track_title', track_title)
+  insert_query.bindValue(':is_loved', int(is_loved))
+  insert_query.bindValue(':was_loved', int(was_loved))
+  insert_query.exec_()
+
+def delete_pending_track_love(username: str, artist_name: str, track_title: str):
+  delete_query = QtSql.QSqlQuery()
+  delete_query.prepare(
+    'DELETE FROM pending_track_loves '
+    'WHERE username = :username AND artist_name = :artist_name AND track_title = :track_title'
+  )
+  delete_query.bindValue(':username', username)
+  delete_query.bindValue(':artist_name', artist_name)
+  delete_query.bindValue(':track_title', track_title)
+  delete_query.exec_()
+
+def save_history_snapshot(data: bytes):
+  create_table_query = QtSql.QSqlQuery()
+  create_table_query.exec_('CREATE TABLE IF NOT EXISTS history_snapshot(id integer primary key, data blob)')
+
+  # There is only ever one snapshot
+  insert_query = QtSql.QSqlQuery()
+  insert_query.prepare('INSERT OR REPLACE INTO history_snapshot VALUES (0, :data)')
+  insert_query.bindValue(':data', QtCore.QByteArray(data))
+  insert_query.exec_()
+
+def get_history_snapshot() -> bytes:
+  query = QtSql.QSqlQuery('SELECT data FROM history_snapshot WHERE id = 0')
+
+  if query.next():
+    return bytes(query.value(0))
+
+  return None
\ No newline at end of file
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from pypresence import Presence
+from pypresence.exceptions import InvalidID
+
+import util.helpers as helpers
+from util.process_monitor import ProcessMonitor
+
+class DiscordPresenceWorker:
+  '''
+  Keep Discord rich presence in sync with the latest requested state from a background thread
+
+  The thread owns the Discord client, so connecting and sending updates never blocks the UI. Only the newest state is
+  sent when several are requested in a row, and if Discord is closed the state is sent again once it opens
+  '''
+
+  __MAX_RETRIES = 5
+  __RETRY_INTERVAL = 15 # Seconds between attempts while Discord isn't reachable
+  __STOP_TIMEOUT = 2 # Seconds to wait for the thread to disconnect when stopping
+
+  def __init__(self, client_id: str) -> None:
+    self.__client_id = client_id
+
+    # Keep the desired state behind a condition so the thread can sleep until it changes
+    self.__condition = threading.Condition()
+    self.__version = 0
+    self.__is_enabled = False
+    self.__presence: dict = None # Arguments for Presence.update, or None to clear the presence
+    self.__is_stopped = False
+
+    # Only touched from the worker thread
+    self.__client: Presence = None
+    self.__is_connected = False
+
+    self.__thread = threading.Thread(target=self.__run, name='DiscordPresenceWorker', daemon=True)
+    self.__thread.start()
+
+  def set_is_enabled(self, is_enabled: bool) -> None:
+    '''Connect to Discord and show the presence, or disconnect'''
+
+    # Only look for Discord among the running processes while the presence is shown
+    if is_enabled:
+      ProcessMonitor.shared().start()
+    else:
+      ProcessMonitor.shared().stop()
+
+    self.__set_state(is_enabled=is_enabled)
+
+  def update(self, track_title: str, artist_name: str, album_title: str, player_position: float) -> None:
+    '''Show a track as playing from the given position'''
+
+    self.__set_state(presence={
+      'details': track_title,
+      'state': artist_name,
+      'large_image': 'music-logo',
+      'large_text': 'Playing on Music',
+      'small_image': 'lastredux-logo',
+      'small_text': 'Scrobbling on LastRedux',
+      'start': (datetime.now() - timedelta(seconds=player_position)).timestamp() # Don't include track start to accurately reflect timestamp in uncropped track
+    })
+
+  def clear(self) -> None:
+    '''Stop showing a track'''
+
+    self.__set_state(presence=None)
+
+  def stop(self) -> None:
+    '''Disconnect from Discord and end the thread'''
+
+    ProcessMonitor.shared().stop()
+
+    with self.__condition:
+      self.__is_stopped = True
+      self.__condition.notify()
+
+    # Give the thread a chance to close the connection, but don't hold up quitting if Discord is unresponsive
+    self.__thread.join(DiscordPresenceWorker.__STOP_TIMEOUT)
+
+    if self.__thread.is_alive():
+      logging.warning('Discord presence thread did not stop in time')
+
+  # --- Private Methods ---
+
+  def __set_state(self, **changes) -> None:
+    with self.__condition:
+      if 'is_enabled' in changes:
+        self.__is_enabled = changes['is_enabled']
+
+      if 'presence' in changes:
+        self.__presence = changes['presence']
+
+      self.__version += 1
+      self.__condition.notify()
+
+  def __run(self) -> None:
+    # pypresence needs an event loop, and the main thread's loop can't be used from here
+    self.__client = Presence(self.__client_id, loop=asyncio.new_event_loop())
+
+    applied_version = 0
+    was_applied = True
+
+    while True:
+      with self.__condition:
+        # Sleep until the state changes, or until it's time to try again if the last attempt failed
+        if self.__version == applied_version and not self.__is_stopped:
+          self.__condition.wait(None if was_applied else DiscordPresenceWorker.__RETRY_INTERVAL)
+
+        if self.__is_stopped:
+          break
+
+        # Skip straight to the newest state if several were requested while the last one was being sent
+        version = self.__version
+        is_enabled = self.__is_enabled
+        presence = self.__presence
+
+      was_applied = self.__apply(is_enabled, presence)
+      applied_version = version
+
+    self.__disconnect()
+
+  def __apply(self, is_enabled: bool, presence: dict) -> bool:
+    '''Send a state to Discord and return whether it was sent (or there was nothing to send)'''
+
+    if not is_enabled:
+      self.__disconnect()
+      return True
+
+    # Before the first process scan finishes, connecting is how to find out whether Discord is open
+    if helpers.is_discord_open() is False:
+      self.__is_connected = False
+
+      # Try again later if there's a track to show once Discord opens
+      return presence is None
+
+    for retry_number in range(DiscordPresenceWorker.__MAX_RETRIES):
+      try:
+        if not self.__is_connected:
+          self.__client.connect()
+          self.__is_connected = True
+          logging.info('Discord RPC connected')
+
+        if presence:
+          self.__client.update(**presence)
+        else:
+          self.__client.clear()
+
+        return True
+      except InvalidID:
+        # Discord generates a new client ID when it relaunches, so connect again
+        self.__is_connected = False
+        logging.info(f'Discord RPC reconnecting to new client (at retry #{retry_number})')
+      except Exception as err:
+        self.__is_connected = False
+        logging.warning(f'Discord RPC request failed: {err}')
+        return False
+
+    logging.warning('Max retries exceeded on Discord RPC request')
+    return False
+
+  def __disconnect(self) -> None:
+    if not self.__is_connected:
+      return
+
+    self.__is_connected = False
+
+    try:
+      self.__client.close()
+      logging.info('Discord RPC disconnected')
+    except Exception as err:
+      logging.warning(f'Could not disconnect Discord RPC: {err}')
@@ -0,0 +1 @@
+from .DiscordPresenceWorker import DiscordPresenceWorker
\ No newline at end of file
@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+from util.lastfm import LastfmApiWrapper
+from util.art_provider import ArtProvider
+from datatypes.Scrobble import Scrobble
+from datatypes.LoadGeneration import LoadGeneration
+from .EnrichmentStage import EnrichmentStage
+from .EnrichmentRun import EnrichmentRun
+
+class EnrichmentPipeline:
+  '''The stages that load external scrobble data, declared with the stages they depend on'''
+
+  # --- Stage Loaders ---
+
+  @staticmethod
+  def __load_track_info(lastfm: LastfmApiWrapper, art_provider: ArtProvider, scrobble: Scrobble, results: Dict):
+    return lastfm.get_track_info(artist_name=scrobble.artist_name, track_title=scrobble.track_title)
+
+  @staticmethod
+  def __load_artist_info(lastfm: LastfmApiWrapper, art_provider: ArtProvider, scrobble: Scrobble, results: Dict):
+    return lastfm.get_artist_info(scrobble.artist_name)
+
+  @staticmethod
+  def __load_album_info(lastfm: LastfmApiWrapper, art_provider: ArtProvider, scrobble: Scrobble, results: Dict):
+    return lastfm.get_album_info(
+      artist_name=scrobble.album_artist_name or scrobble.artist_name,
+      album_title=scrobble.album_title
+    )
+
+  @staticmethod
+  def __load_spotify_track_images(lastfm: LastfmApiWrapper, art_provider: ArtProvider, scrobble: Scrobble, results: Dict):
+    return art_provider.spotify_api.get_track_images(scrobble.artist_name, scrobble.track_title, scrobble.album_title)
+
+  @staticmethod
+  def __load_album_art(lastfm: LastfmApiWrapper, art_provider: ArtProvider, scrobble: Scrobble, results: Dict):
+    # Only search Spotify again if the Spotify artists stage isn't part of this run
+    has_searched_spotify = 'spotify_artists' in results
+    spotify_track_images = results.get('spotify_artists')
+
+    return art_provider.get_scrobble_album_art(
+      artist_name=scrobble.artist_name,
+      track_title=scrobble.track_title,
+      album_title=scrobble.album_title,
+      lastfm_album=results['album_info'],
+      spotify_album_art=spotify_track_images.album_art if spotify_track_images else None,
+      should_search_spotify=not has_searched_spotify
+    )
+
+  # --- Stages ---
+
+  STAGES: List[EnrichmentStage] = [
+    EnrichmentStage('track_info', __load_track_info.__func__, field='lastfm_track', is_essential=True),
+    EnrichmentStage('artist_info', __load_artist_info.__func__, field='lastfm_artist'),
+    EnrichmentStage('album_info', __load_album_info.__func__, field='lastfm_album'),
+    EnrichmentStage(
+      'spotify_artists',
+      __load_spotify_track_images.__func__,
+      field='spotify_artists',
+      get_field_value=lambda spotify_track_images: spotify_track_images.artists
+    ),
+
+    # Reuse the album info that was already loaded instead of requesting it again, along with Spotify album art if
+    # Spotify artists are being loaded at the same time
+    EnrichmentStage(
+      'album_art',
+      __load_album_art.__func__,
+      inputs=('album_info',),
+      optional_inputs=('spotify_artists',),
+      field='image_set'
+    )
+  ]
+
+  STAGES_BY_NAME: Dict[str, EnrichmentStage] = {stage.name: stage for stage in STAGES}
+
+  # Only what the history list shows (loved status and album art), the rest is loaded when a scrobble is selected
+  ROW_STAGE_NAMES = ['track_info', 'album_art']
+
+  @staticmethod
+  def create_run(
+    scrobble: Scrobble,
+    generation: LoadGeneration,
+    stage_names: List[str]=None,
+    priority: int=0
+  ) -> EnrichmentRun:
+    '''Plan loading the given stages (or every stage) for a scrobble along with the stages they depend on'''
+
+    included_stage_names = set()
+    pending_stage_names = list(stage_names or EnrichmentPipeline.STAGES_BY_NAME)
+
+    while pending_stage_names:
+      stage_name = pending_stage_names.pop()
+
+      # Don't load anything that an earlier run for this scrobble already requested
+      if stage_name not in included_stage_names and stage_name not in scrobble.requested_stages:
+        included_stage_names.add(stage_name)
+        pending_stage_names.extend(EnrichmentPipeline.STAGES_BY_NAME[stage_name].inputs)
+
+    scrobble.requested_stages.extend(included_stage_names)
+    scrobble.loading_stages |= included_stage_names
+
+    return EnrichmentRun(
+      scrobble=scrobble,
+      generation=generation,
+      stages=[stage for stage in EnrichmentPipeline.STAGES if stage.name in included_stage_names], # Keep declared order
+      pipeline_stages_by_name=EnrichmentPipeline.STAGES_BY_NAME,
+      priority=priority
+    )
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set
+
+from datatypes.Scrobble import Scrobble
+from datatypes.LoadGeneration import LoadGeneration
+from .EnrichmentStage import EnrichmentStage
+
+@dataclass(eq=False) # Compare by identity since every scrobble load gets its own run
+class EnrichmentRun:
+  '''Progress of loading a set of enrichment stages for one scrobble (only touched from the main thread)'''
+
+  scrobble: Scrobble
+  generation: LoadGeneration
+  stages: List[EnrichmentStage]
+
+  # Every stage in the pipeline, for looking up the fields of inputs that were loaded by an earlier run
+  pipeline_stages_by_name: Dict[str, EnrichmentStage]
+
+  results: Dict[str, Any] = field(default_factory=dict)
+  started_stage_names: Set[str] = field(default_factory=set)
+
+  # Thread pool priority of the run's stages (higher runs first)
+  priority: int = 0
+
+  @property
+  def is_complete(self) -> bool:
+    return len(self.results) == len(self.stages)
+
+  def start_ready_stages(self) -> List[EnrichmentStage]:
+    '''Get the stages whose inputs have all finished and mark them as started'''
+
+    stage_names = {stage.name for stage in self.stages}
+
+    # Inputs that aren't part of this run were loaded by an earlier one (or aren't wanted at all)
+    ready_stages = [
+      stage for stage in self.stages
+      if stage.name not in self.started_stage_names
+      and all(
+        input_name in self.results or input_name not in stage_names
+        for input_name in stage.inputs + stage.optional_inputs
+      )
+    ]
+
+    self.started_stage_names.update(stage.name for stage in ready_stages)
+
+    return ready_stages
+
+  def get_input_results(self, stage: EnrichmentStage) -> Dict[str, Any]:
+    '''Get the results a stage declared as inputs (optional inputs are left out if they weren't loaded)'''
+
+    input_results = {
+      input_name: self.results[input_name] for input_name in stage.optional_inputs if input_name in self.results
+    }
+
+    for input_name in stage.inputs:
+      if input_name in self.results:
+        input_results[input_name] = self.results[input_name]
+      else:
+        # Use the value an earlier run assigned to the scrobble
+        input_results[input_name] = getattr(self.scrobble, self.pipeline_stages_by_name[input_name].field)
+
+    return input_results
+
+  def complete_stage(self, stage: EnrichmentStage, result: Any) -> None:
+    '''Record a stage's result and assign it to the scrobble field it fills'''
+
+    self.results[stage.name] = result
+    self.scrobble.loading_stages.discard(stage.name)
+
+    if stage.field:
+      value = stage.get_field_value(result) if stage.get_field_value and result is not None else result
+      setattr(self.scrobble, stage.field, value) # Could be None
+      self.scrobble.loaded_fields.append(stage.field)
+
+  def defer_stage(self, stage: EnrichmentStage) -> List[str]:
+    '''
+    Take a stage that couldn't reach the internet out of the run along with the stages still waiting to start
+
+    Returns the names of the removed stages, which are no longer marked as requested so they can be loaded again
+    '''
+
+    deferred_stages = [stage] + [
+      waiting_stage for waiting_stage in self.stages if waiting_stage.name not in self.started_stage_names
+    ]
+
+    self.stages = [run_stage for run_stage in self.stages if run_stage not in deferred_stages]
+
+    for deferred_stage in deferred_stages:
+      self.scrobble.loading_stages.discard(deferred_stage.name)
+
+      if deferred_stage.name in self.scrobble.requested_stages:
+        self.scrobble.requested_stages.remove(deferred_stage.name)
+
+    return [deferred_stage.name for deferred_stage in deferred_stages]
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+@dataclass(frozen=True)
+class EnrichmentStage:
+  '''A piece of external scrobble data, the stages whose results it needs, and how to load it'''
+
+  name: str
+
+  # Called on a background thread with (lastfm, art_provider, scrobble, results of the input stages by name)
+  load: Callable[..., Any]
+
+  # Stages that need to finish first so their results can be reused instead of refetched
+  inputs: Tuple[str, ...] = ()
+
+  # Stages whose results are reused if they are loaded in the same run, but that aren't loaded just for this stage
+  optional_inputs: Tuple[str, ...] = ()
+
+  # The scrobble field the result is assigned to and how to get the field value from the result
+  field: str = None
+  get_field_value: Callable[[Any], Any] = None
+
+  # Whether a failure means the scrobble couldn't be found at all
+  is_essential: bool = False
@@ -0,0 +1,3 @@
+from .EnrichmentStage import EnrichmentStage
+from .EnrichmentRun import EnrichmentRun
+from .EnrichmentPipeline import EnrichmentPipeline
\ No newline at end of file
@@ -0,0 +1,122 @@
+import weakref
+from dataclasses import fields, is_dataclass
+from typing import Callable, List, TypeVar
+
+from util.lastfm.LastfmTrack import LastfmTrack
+from util.lastfm.LastfmArtist import LastfmArtist
+from util.lastfm.LastfmAlbum import LastfmAlbum
+from util.spotify_api import SpotifyArtist
+from datatypes.ImageSet import ImageSet
+
+T = TypeVar('T')
+
+class SharedList(list):
+  '''A list that can be held weakly by the entity store (plain lists can't have weak references)'''
+
+class EntityStore:
+  '''
+  Identity map that hands out one shared object per Last.fm track, artist and album, album art and list of Spotify artists
+
+  Every scrobble of the same track points to the same objects, so a change made through one scrobble (like a play count
+  increment) is seen by all of them and memory scales with the number of distinct entities instead of plays
+
+  Entities are held weakly, so one is dropped along with the last scrobble that uses it (like when its scrobbles are
+  spilled to the database) instead of staying in memory for the rest of the session
+
+  A shared object is refreshed in place when a newer copy arrives, except for data that changed locally since that copy
+  was fetched: play counts keep the higher value and tracks keep loved status changes that haven't reached Last.fm yet
+  '''
+
+  # Fields that only go up (a copy fetched before a local increment would otherwise undo it)
+  __COUNT_FIELD_NAMES = {'plays', 'global_plays'}
+
+  def __init__(
+    self,
+    on_entity_refreshed: Callable[[object], None]=None,
+    get_pending_is_loved: Callable[[str, str], bool]=None
+  ) -> None:
+    # Map (entity kind, key) to the shared object
+    self.__entities = weakref.WeakValueDictionary()
+
+    # Called with a shared object after it was refreshed in place, since every scrobble using it now shows new data
+    self.__on_entity_refreshed = on_entity_refreshed
+
+    # Called with a track's artist name and title to get the loved status that hasn't been sent yet (or None)
+    self.__get_pending_is_loved = get_pending_is_loved
+
+  def __len__(self) -> int:
+    return len(self.__entities)
+
+  def track(self, lastfm_track: LastfmTrack) -> LastfmTrack:
+    # Show loved status changes that haven't reached Last.fm yet instead of what Last.fm returned
+    if lastfm_track and self.__get_pending_is_loved:
+      pending_is_loved = self.__get_pending_is_loved(lastfm_track.artist_link.name, lastfm_track.title)
+
+      if pending_is_loved is not None:
+        lastfm_track.is_loved = pending_is_loved
+
+    return self.__intern('track', lastfm_track.url if lastfm_track else None, lastfm_track)
+
+  def artist(self, lastfm_artist: LastfmArtist) -> LastfmArtist:
+    return self.__intern('artist', lastfm_artist.url if lastfm_artist else None, lastfm_artist)
+
+  def album(self, lastfm_album: LastfmAlbum) -> LastfmAlbum:
+    return self.__intern('album', lastfm_album.url if lastfm_album else None, lastfm_album)
+
+  def image_set(self, artist_name: str, album_or_track_title: str, image_set: ImageSet) -> ImageSet:
+    '''Share album art between scrobbles from the same album (or of the same track if there is no album)'''
+
+    return self.__intern('image_set', EntityStore.__name_key(artist_name, album_or_track_title), image_set)
+
+  def spotify_artists(self, artist_name: str, spotify_artists: List[SpotifyArtist]) -> List[SpotifyArtist]:
+    return self.__intern('spotify_artists', EntityStore.__name_key(artist_name), spotify_artists)
+
+  # --- Private Methods ---
+
+  def __intern(self, kind: str, key: str, entity: T) -> T:
+    if entity is None or not key:
+      return entity
+
+    if isinstance(entity, list) and not isinstance(entity, SharedList):
+      entity = SharedList(entity)
+
+    existing_entity = self.__entities.setdefault((kind, key), entity)
+
+    if existing_entity is not entity:
+      # Refresh the shared object in place so scrobbles that already point to it see the new data
+      EntityStore.__update(existing_entity, entity)
+
+      if self.__on_entity_refreshed:
+        self.__on_entity_refreshed(existing_entity)
+
+    return existing_entity
+
+  @staticmethod
+  def __update(existing_entity: object, entity: object) -> None:
+    if isinstance(existing_entity, list):
+      existing_entity[:] = entity
+      return
+
+    if is_dataclass(existing_entity):
+      for field in fields(existing_entity):
+        value = getattr(entity, field.name)
+
+        # Don't erase data the shared object already has with a less complete copy
+        if value is None:
+          continue
+
+        existing_value = getattr(existing_entity, field.name)
+
+        if field.name in EntityStore.__COUNT_FIELD_NAMES and existing_value is not None:
+          value = max(existing_value, value)
+
+        setattr(existing_entity, field.name, value)
+
+  @staticmethod
+  def __name_key(*names: str) -> str:
+    '''Normalize names so differences in case and surrounding whitespace don't create separate entities'''
+
+    if not all(names):
+      return None
+
+    return '\n'.join(name.strip().lower() for name in names)
@@ -0,0 +1 @@
+from .EntityStore import EntityStore
\ No newline at end of file
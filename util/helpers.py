@@ -1,12 +1,13 @@
 import datetime
 import subprocess
 import json
+from typing import List, Tuple
 
 from AppKit import NSScreen
-import psutil
 
 from util.lastfm.LastfmList import LastfmList
 from util.lastfm.LastfmScrobble import LastfmScrobble
+from util.process_monitor import ProcessMonitor
 
 def get_mock_recent_scrobbles(count: int) -> LastfmList[LastfmScrobble]:
   return LastfmList(
@@ -46,11 +47,29 @@ def generate_system_profile() -> dict:
     'displays': f'''{[f'{int(screen.frame().size.width)}x{int(screen.frame().size.height)} {"(Retina)" if screen.backingScaleFactor() == 2.0 else ""}' for screen in NSScreen.screens()]}'''
   }
 
+def group_consecutive_rows(rows: List[int]) -> List[Tuple[int, int]]:
+  '''
+  Group ascending rows into (first, last) ranges of consecutive rows
+
+  in: [0, 1, 2, 5, 7, 8]
+  out: [(0, 2), (5, 5), (7, 8)]
+  '''
+
+  ranges = []
+
+  for row in rows:
+    if ranges and ranges[-1][1] == row - 1:
+      ranges[-1] = (ranges[-1][0], row)
+    else:
+      ranges.append((row, row))
+
+  return ranges
+
 def is_within_24_hours(date: datetime.datetime) -> bool:
   return (datetime.datetime.now() - date).total_seconds() <= 86400 # 24 hours = 86400 seconds
 
 def is_discord_open() -> bool:
-  '''Check if there is a process named Discord running'''
+  '''Check if there is a process named Discord running, or return None if that isn't known yet'''
 
   # TODO: Find a way to make this less fallible (ie. fake Discord app will crash LastRedux)
-  return 'Discord' in [process.name() for process in psutil.process_iter()]
\ No newline at end of file
+  return ProcessMonitor.shared().is_running('Discord')
\ No newline at end of file
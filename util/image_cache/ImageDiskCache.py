@@ -0,0 +1,349 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict, deque
+from typing import Tuple
+
+class ImageDiskCache:
+  '''
+  Downloaded image files kept on disk by URL between launches, up to a budget of bytes
+
+  Images are appended to one pack file and read back through a memory map, so a read is one copy out of the mapped
+  file instead of a file open per image. An index file maps each URL to where its image is in the pack, and every
+  record in the pack also has a header so the index can be rebuilt from the pack if it's missing or out of date.
+  Evicting an image only removes it from the index, and the pack is compacted once the evicted images take up more
+  space than the budget or at least half of the pack when the cache is closed.
+
+  put only queues the image, it's written (and the pack compacted when needed) from the cache's own thread so the UI
+  never waits on the disk
+  '''
+
+  __DEFAULT_MAX_SIZE = int(os.environ.get('IMAGE_DISK_CACHE_BYTES', 256 * 1024 * 1024))
+
+  __PACK_FILE_NAME = 'images.pack'
+  __INDEX_FILE_NAME = 'images.index'
+
+  # Each record is a header (magic, URL length, data length), the UTF-8 URL, then the image data
+  __RECORD_HEADER = struct.Struct('<4sII')
+  __RECORD_MAGIC = b'LRIM'
+
+  def __init__(self, directory: str, max_size: int=None) -> None:
+    self.max_size = max_size if max_size is not None else ImageDiskCache.__DEFAULT_MAX_SIZE
+    self.__directory = directory
+    self.__pack_path = os.path.join(directory, ImageDiskCache.__PACK_FILE_NAME)
+    self.__index_path = os.path.join(directory, ImageDiskCache.__INDEX_FILE_NAME)
+
+    # Guard the index and the pack map, which the writer thread replaces when the pack grows or is compacted
+    self.__lock = threading.Lock()
+
+    # Map each URL to (data offset, data length) in the pack, ordered from least to most recently read
+    self.__entries = OrderedDict()
+    self.size = 0 # Bytes of image data in the index
+    self.__pack_size = 0
+    self.__indexed_record_size = 0 # Bytes of the pack taken by the records in the index, headers included
+
+    # Map the pack for reads, it's mapped again when a read is past the mapped part because images were appended
+    self.__pack_file = None
+    self.__pack_map: mmap.mmap = None
+
+    # Count how the cache is used so the budget can be tuned
+    self.hit_count = 0
+    self.miss_count = 0
+    self.eviction_count = 0
+
+    # Images waiting to be written by the writer thread
+    self.__write_condition = threading.Condition()
+    self.__pending_writes = deque()
+    self.__is_writing = False
+    self.__is_closing = False
+
+    os.makedirs(directory, exist_ok=True)
+    self.__open_pack()
+
+    self.__writer_thread = threading.Thread(target=self.__run_writer, name='ImageDiskCacheWriter', daemon=True)
+    self.__writer_thread.start()
+
+  def __len__(self) -> int:
+    return len(self.__entries)
+
+  def __contains__(self, url: str) -> bool:
+    with self.__lock:
+      return url in self.__entries
+
+  def get(self, url: str) -> bytes:
+    '''Get the image data for a URL, or None if it isn't cached'''
+
+    with self.__lock:
+      entry = self.__entries.get(url)
+
+      if entry is None:
+        self.miss_count += 1
+        return None
+
+      offset, length = entry
+
+      if not self.__pack_map or offset + length > len(self.__pack_map):
+        self.__map_pack()
+
+      # Check that the record is really for this URL in case the index was saved for a different pack
+      encoded_url = url.encode('utf-8')
+
+      if self.__pack_map[offset - len(encoded_url):offset] != encoded_url:
+        logging.warning(f'Image cache index doesn\'t match the pack for {url}')
+        self.__remove_entry(url)
+        self.miss_count += 1
+        return None
+
+      self.__entries.move_to_end(url)
+      self.hit_count += 1
+
+      # Copy while holding the lock so the writer thread can't unmap the pack under the caller
+      return self.__pack_map[offset:offset + length]
+
+  def put(self, url: str, data: bytes) -> None:
+    '''Queue the image data for a URL to be appended to the pack from the writer thread'''
+
+    if len(data) > self.max_size:
+      return
+
+    with self.__write_condition:
+      if self.__is_closing:
+        return
+
+      self.__pending_writes.append((url, data))
+      self.__write_condition.notify_all()
+
+  def flush(self) -> None:
+    '''Wait until every queued image is written'''
+
+    with self.__write_condition:
+      while self.__pending_writes or self.__is_writing:
+        self.__write_condition.wait()
+
+  def compact(self) -> None:
+    '''Rewrite the pack with only the images in the index'''
+
+    with self.__lock:
+      self.__compact()
+
+  def close(self) -> None:
+    '''
+    Write the queued images, compact the pack if it's mostly evicted images, and save the index so the next launch
+    doesn't need to scan it
+    '''
+
+    with self.__write_condition:
+      self.__is_closing = True
+      self.__write_condition.notify_all()
+
+    self.__writer_thread.join()
+
+    with self.__lock:
+      if self.__get_dead_size() > self.__pack_size / 2:
+        self.__compact()
+
+      self.__save_index()
+      self.__close_pack()
+
+  # --- Private Methods ---
+
+  def __run_writer(self) -> None:
+    while True:
+      with self.__write_condition:
+        while not self.__pending_writes and not self.__is_closing:
+          self.__write_condition.wait()
+
+        # Keep writing until the queue is empty when closing so no downloaded image is lost
+        if not self.__pending_writes:
+          break
+
+        url, data = self.__pending_writes.popleft()
+        self.__is_writing = True
+
+      self.__write(url, data)
+
+      with self.__write_condition:
+        self.__is_writing = False
+        self.__write_condition.notify_all()
+
+  def __write(self, url: str, data: bytes) -> None:
+    '''Append the image data for a URL to the pack, evicting the least recently read images that don't fit anymore'''
+
+    encoded_url = url.encode('utf-8')
+
+    with self.__lock:
+      header = ImageDiskCache.__RECORD_HEADER.pack(ImageDiskCache.__RECORD_MAGIC, len(encoded_url), len(data))
+
+      try:
+        self.__pack_file.seek(self.__pack_size)
+        self.__pack_file.write(header + encoded_url)
+        self.__pack_file.write(data)
+        self.__pack_file.flush()
+      except OSError as err:
+        logging.warning(f'Could not write {url} to the image cache: {err}')
+        return
+
+      self.__remove_entry(url)
+      self.__add_entry(url, self.__pack_size + len(header) + len(encoded_url), len(data))
+      self.__pack_size += len(header) + len(encoded_url) + len(data)
+
+      while self.size > self.max_size:
+        self.__remove_entry(next(iter(self.__entries)))
+        self.eviction_count += 1
+
+      # Keep the pack from growing far past the budget in long sessions
+      if self.__get_dead_size() > self.max_size:
+        self.__compact()
+
+  def __open_pack(self) -> None:
+    # Don't open in append mode since new records are written where the last complete record ends
+    if not os.path.exists(self.__pack_path):
+      open(self.__pack_path, 'wb').close()
+
+    self.__pack_file = open(self.__pack_path, 'r+b')
+    self.__pack_size = self.__pack_file.seek(0, os.SEEK_END)
+    self.__load_index()
+
+  def __close_pack(self) -> None:
+    self.__unmap_pack()
+
+    if self.__pack_file:
+      self.__pack_file.close()
+      self.__pack_file = None
+
+  def __map_pack(self) -> None:
+    self.__unmap_pack()
+    self.__pack_map = mmap.mmap(self.__pack_file.fileno(), 0, access=mmap.ACCESS_READ) if self.__pack_size else None
+
+  def __unmap_pack(self) -> None:
+    if not self.__pack_map:
+      return
+
+    self.__pack_map.close()
+    self.__pack_map = None
+
+  def __load_index(self) -> None:
+    '''Read the saved index, then add the images that were appended to the pack after it was saved'''
+
+    indexed_pack_size = 0
+
+    try:
+      with open(self.__index_path, 'r') as index_file:
+        index = json.load(index_file)
+
+      if index['pack_size'] <= self.__pack_size:
+        for url, offset, length in index['entries']:
+          self.__add_entry(url, offset, length)
+
+        indexed_pack_size = index['pack_size']
+    except (OSError, ValueError, KeyError, TypeError):
+      # Fall back to scanning the whole pack
+      self.__entries.clear()
+      self.size = 0
+      self.__indexed_record_size = 0
+
+    self.__scan_pack(indexed_pack_size)
+
+    while self.size > self.max_size:
+      self.__remove_entry(next(iter(self.__entries)))
+
+  def __scan_pack(self, offset: int) -> None:
+    '''Add every record from an offset to the end of the pack to the index'''
+
+    self.__map_pack()
+    header_size = ImageDiskCache.__RECORD_HEADER.size
+
+    while offset + header_size <= self.__pack_size:
+      magic, url_length, data_length = ImageDiskCache.__RECORD_HEADER.unpack_from(self.__pack_map, offset)
+      data_offset = offset + header_size + url_length
+
+      # Stop at a record that was only partly written (like when the app quit during a write)
+      if magic != ImageDiskCache.__RECORD_MAGIC or data_offset + data_length > self.__pack_size:
+        logging.warning(f'Image cache pack is damaged at byte {offset}, ignoring the rest of it')
+        break
+
+      url = self.__pack_map[offset + header_size:data_offset].decode('utf-8', errors='replace')
+      self.__remove_entry(url)
+      self.__add_entry(url, data_offset, data_length)
+      offset = data_offset + data_length
+
+    # Write new records over a damaged end
+    if offset < self.__pack_size:
+      self.__unmap_pack()
+      self.__pack_file.truncate(offset)
+      self.__pack_size = offset
+      self.__map_pack()
+
+  def __save_index(self) -> None:
+    temporary_path = self.__index_path + '.tmp'
+
+    try:
+      with open(temporary_path, 'w') as index_file:
+        json.dump({
+          'pack_size': self.__pack_size,
+          'entries': [[url, offset, length] for url, (offset, length) in self.__entries.items()]
+        }, index_file)
+
+      os.replace(temporary_path, self.__index_path)
+    except OSError as err:
+      logging.warning(f'Could not save the image cache index: {err}')
+
+  def __compact(self) -> None:
+    '''Copy the images in the index to a new pack in read order and swap it in'''
+
+    if not self.__pack_map or len(self.__pack_map) < self.__pack_size:
+      self.__map_pack()
+
+    temporary_path = self.__pack_path + '.tmp'
+    new_entries = OrderedDict()
+    new_pack_size = 0
+
+    try:
+      with open(temporary_path, 'wb') as new_pack_file:
+        for url, (offset, length) in self.__entries.items():
+          encoded_url = url.encode('utf-8')
+          header = ImageDiskCache.__RECORD_HEADER.pack(ImageDiskCache.__RECORD_MAGIC, len(encoded_url), length)
+          new_pack_file.write(header + encoded_url)
+          new_pack_file.write(self.__pack_map[offset:offset + length])
+          new_entries[url] = (new_pack_size + len(header) + len(encoded_url), length)
+          new_pack_size += len(header) + len(encoded_url) + length
+
+      # The pack can't be replaced while it's open on Windows
+      self.__close_pack()
+      os.replace(temporary_path, self.__pack_path)
+    except OSError as err:
+      logging.warning(f'Could not compact the image cache: {err}')
+    else:
+      logging.debug(f'Compacted the image cache from {self.__pack_size} to {new_pack_size} bytes')
+      self.__entries = new_entries
+      self.__pack_size = new_pack_size
+
+    if not self.__pack_file:
+      self.__pack_file = open(self.__pack_path, 'r+b')
+
+    self.__map_pack()
+    self.__save_index()
+
+  def __add_entry(self, url: str, offset: int, length: int) -> None:
+    self.__entries[url] = (offset, length)
+    self.size += length
+    self.__indexed_record_size += ImageDiskCache.__get_record_size(url, length)
+
+  def __remove_entry(self, url: str) -> None:
+    entry = self.__entries.pop(url, None)
+
+    if entry:
+      self.size -= entry[1]
+      self.__indexed_record_size -= ImageDiskCache.__get_record_size(url, entry[1])
+
+  def __get_dead_size(self) -> int:
+    '''Get how many bytes of the pack are taken by images that aren't in the index anymore'''
+
+    return self.__pack_size - self.__indexed_record_size
+
+  @staticmethod
+  def __get_record_size(url: str, length: int) -> int:
+    return ImageDiskCache.__RECORD_HEADER.size + len(url.encode('utf-8')) + length
@@ -0,0 +1,81 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+class ImageMemoryCache:
+  '''
+  Decoded images kept in memory by URL, up to a budget of bytes
+
+  When the budget is exceeded the images that were displayed least recently are dropped first, so a long session only
+  keeps the art that's likely to be shown again instead of every image it ever loaded. Every method holds a lock so one
+  cache can be shared by all image views
+  '''
+
+  __DEFAULT_MAX_SIZE = int(os.environ.get('IMAGE_MEMORY_CACHE_BYTES', 64 * 1024 * 1024))
+
+  def __init__(self, get_size: Callable[[Any], int], max_size: int=None) -> None:
+    self.__get_size = get_size
+    self.max_size = max_size if max_size is not None else ImageMemoryCache.__DEFAULT_MAX_SIZE
+    self.__lock = threading.Lock()
+
+    # Map each URL to (image, size in bytes), ordered from least to most recently displayed
+    self.__images = OrderedDict()
+    self.size = 0
+
+    # Count how the cache is used so the budget can be tuned
+    self.hit_count = 0
+    self.miss_count = 0
+    self.eviction_count = 0
+
+  def __len__(self) -> int:
+    return len(self.__images)
+
+  def __contains__(self, url: str) -> bool:
+    with self.__lock:
+      return url in self.__images
+
+  def get(self, url: str) -> Any:
+    '''Get the image for a URL and mark it as just displayed, or None if it isn't cached'''
+
+    with self.__lock:
+      entry = self.__images.get(url)
+
+      if entry is None:
+        self.miss_count += 1
+        return None
+
+      self.__images.move_to_end(url)
+      self.hit_count += 1
+
+      return entry[0]
+
+  def put(self, url: str, image: Any) -> None:
+    '''Add the image for a URL, dropping the least recently displayed images that don't fit anymore'''
+
+    image_size = self.__get_size(image)
+
+    with self.__lock:
+      previous_entry = self.__images.pop(url, None)
+
+      if previous_entry:
+        self.size -= previous_entry[1]
+
+      # Don't let one huge image push every other image out
+      if image_size > self.max_size:
+        logging.debug(f'Not caching {url} in memory ({image_size} bytes is over the {self.max_size} byte budget)')
+        return
+
+      self.__images[url] = (image, image_size)
+      self.size += image_size
+
+      while self.size > self.max_size:
+        _, (_, evicted_size) = self.__images.popitem(last=False)
+        self.size -= evicted_size
+        self.eviction_count += 1
+
+  def clear(self) -> None:
+    with self.__lock:
+      self.__images.clear()
+      self.size = 0
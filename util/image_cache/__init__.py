@@ -0,0 +1,2 @@
+from .ImageMemoryCache import ImageMemoryCache
+from .ImageDiskCache import ImageDiskCache
\ No newline at end of file
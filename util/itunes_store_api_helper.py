@@ -1,8 +1,7 @@
 import urllib
 
-import requests
-
 from datatypes.ImageSet import ImageSet
+from util.network_health import NetworkHealth
 
 def get_album_art(artist_name: str, track_title: str, album_title: str=None) -> ImageSet:
   '''Get album art for Apple Music tracks through the iTunes Search API'''
@@ -11,7 +10,10 @@ def get_album_art(artist_name: str, track_title: str, album_title: str=None) ->
   escaped_search_term = urllib.parse.quote(f'{artist_name} {track_title} {album_title}')
 
   # Do a generic search for music with the track, artist, and album name
-  track_response = requests.get(f'https://itunes.apple.com/search?media=music&limit=1&term={escaped_search_term}')
+  track_response = NetworkHealth.shared().request(
+    'GET',
+    f'https://itunes.apple.com/search?media=music&limit=1&term={escaped_search_term}'
+  )
 
   if not track_response.ok:
     raise Exception(f'Error getting iTunes store images: {track_response.text}')
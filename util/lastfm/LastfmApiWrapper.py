@@ -23,6 +23,7 @@ from .LastfmArtistLink import LastfmArtistLink
 from datatypes.CachedResource import CachedResource
 from datatypes.ImageSet import ImageSet
 from datatypes.FriendScrobble import FriendScrobble
+from util.network_health import NetworkHealth, NetworkUnavailableError
 import util.helpers as helpers
 
 class LastfmApiWrapper:
@@ -59,7 +60,8 @@ class LastfmApiWrapper:
     self,
     limit: int,
     from_date: datetime=None,
-    username: str=None
+    username: str=None,
+    to_date: datetime=None
   ) -> LastfmList[LastfmScrobble]:
     def lastfm_track_to_scrobble(track: dict) -> LastfmScrobble:
       return LastfmScrobble(
@@ -94,6 +96,9 @@ class LastfmApiWrapper:
     if from_date:
       args['from'] = int(from_date.timestamp()) # Convert to int to trim decimal points (Last.fm doesn't like them)
 
+    if to_date:
+      args['to'] = int(to_date.timestamp())
+
     return self.__lastfm_request(args,
       main_key_getter=lambda response: response['recenttracks']['track'],
       return_value_builder=return_value_builder
@@ -339,8 +344,10 @@ class LastfmApiWrapper:
       if album_artist_name:
         args['albumArtist'] = album_artist_name
 
+    # Scrobbles aren't saved anywhere to be sent again, so don't drop them because earlier requests failed
     return self.__lastfm_request(args,
       http_method='POST',
+      should_attempt_while_offline=True,
       main_key_getter=lambda response: response['scrobbles']['scrobble'],
       return_value_builder=lambda status, response: LastfmSubmissionStatus(
         accepted_count=response['scrobbles']['@attr']['accepted'],
@@ -463,7 +470,8 @@ class LastfmApiWrapper:
     main_key_getter=None,
     return_value_builder=None,
     http_method='GET',
-    cache=False
+    cache=False,
+    should_attempt_while_offline=False
   ) -> dict:
     # Convert request arguments to string to use as a key to the cache
     request_string = json.dumps(args, sort_keys=True)
@@ -499,13 +507,17 @@ class LastfmApiWrapper:
       resp_json = None
       
       try:
-        resp = requests.request(
+        resp = NetworkHealth.shared().request(
           method=http_method,
           url='https://ws.audioscrobbler.com/2.0/', 
           headers={'user-agent': LastfmApiWrapper.USER_AGENT},
           params=params if http_method == 'GET' else None,
-          data=params if http_method == 'POST' else None
+          data=params if http_method == 'POST' else None,
+          should_attempt_while_offline=should_attempt_while_offline
         )
+      except NetworkUnavailableError:
+        # Don't use up the retries when the internet can't be reached
+        raise
       except requests.exceptions.ConnectionError:
         # Retry request since Last.fm drops connections randomly
         continue
@@ -0,0 +1,197 @@
+import errno
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Tuple
+
+import requests
+
+class NetworkUnavailableError(requests.exceptions.ConnectionError):
+  '''Raised instead of making a request while recent requests show the internet can't be reached'''
+
+class NetworkHealth:
+  '''
+  Work out whether the internet can be reached from the outcomes of the requests the app makes anyway
+
+  Every API wrapper sends its requests through request() so connection failures from any of them count. While
+  offline, new requests fail immediately instead of each one waiting on its own timeouts and retries
+  '''
+
+  # Seconds that connectivity failures are remembered for, and how many in a row mean the app is offline
+  __FAILURE_WINDOW = float(os.environ.get('NETWORK_FAILURE_WINDOW', 30))
+  __FAILURE_THRESHOLD = int(os.environ.get('NETWORK_FAILURE_THRESHOLD', 3))
+
+  # Seconds between requests that are let through while offline to find out if the connection is back
+  __TRIAL_INTERVAL = 10
+
+  __REQUEST_TIMEOUT = 15 # Seconds
+
+  # The numbers differ between platforms, so use the ones of the platform the app is running on
+  __UNREACHABLE_ERRNOS = {errno.ENETUNREACH, errno.EHOSTUNREACH}
+
+  __shared_instance: 'NetworkHealth' = None
+  __shared_instance_lock = threading.Lock()
+
+  @staticmethod
+  def shared() -> 'NetworkHealth':
+    '''Get the network health shared by every API wrapper'''
+
+    with NetworkHealth.__shared_instance_lock:
+      if not NetworkHealth.__shared_instance:
+        NetworkHealth.__shared_instance = NetworkHealth()
+
+      return NetworkHealth.__shared_instance
+
+  def __init__(self) -> None:
+    self.__lock = threading.Lock()
+    self.__is_online = True
+
+    # Store (monotonic time, failure kind) for connectivity failures since the last request that went through
+    self.__failures: Deque[Tuple[float, str]] = deque()
+    self.__last_trial_time = 0
+
+    # Functions to call with the new state when the app goes offline or comes back online (from any thread)
+    self.__listeners: List[Callable[[bool], None]] = []
+
+  @property
+  def is_online(self) -> bool:
+    return self.__is_online
+
+  def add_listener(self, listener: Callable[[bool], None]) -> None:
+    '''Call a function with whether the app is online every time that changes (on the thread that noticed)'''
+
+    with self.__lock:
+      self.__listeners.append(listener)
+
+  def request(self, method: str, url: str, should_attempt_while_offline: bool=False, **kwargs) -> requests.Response:
+    '''
+    Make a request with requests, recording whether it reached the server
+
+    Requests that can't be made again later, like scrobble submissions, can be attempted while offline
+    '''
+
+    if not should_attempt_while_offline and not self.__should_attempt_request():
+      raise NetworkUnavailableError(f'Not requesting {url} while offline')
+
+    kwargs.setdefault('timeout', NetworkHealth.__REQUEST_TIMEOUT)
+
+    try:
+      resp = requests.request(method, url, **kwargs)
+    except requests.exceptions.RequestException as err:
+      failure_kind = NetworkHealth.classify_failure(err)
+
+      if failure_kind:
+        self.record_failure(failure_kind)
+
+        # Stop callers from retrying a request that can't go through
+        if not self.__is_online:
+          raise NetworkUnavailableError(f'Could not reach {url} ({failure_kind})') from err
+
+      raise
+
+    # Any response at all (even an error status) means the server could be reached
+    self.record_success()
+
+    return resp
+
+  def record_success(self) -> None:
+    '''Record that a request reached its server'''
+
+    with self.__lock:
+      self.__failures.clear()
+
+    self.__set_is_online(True)
+
+  def record_failure(self, failure_kind: str) -> None:
+    '''Record a failure that suggests the internet can't be reached (see classify_failure)'''
+
+    now = time.monotonic()
+
+    with self.__lock:
+      self.__failures.append((now, failure_kind))
+
+      # Forget failures that are too old to say anything about the connection now
+      while self.__failures and now - self.__failures[0][0] > NetworkHealth.__FAILURE_WINDOW:
+        self.__failures.popleft()
+
+      is_offline = len(self.__failures) >= NetworkHealth.__FAILURE_THRESHOLD
+
+    if is_offline:
+      self.__set_is_online(False)
+
+  @staticmethod
+  def classify_failure(err: Exception) -> str:
+    '''
+    Get the kind of connectivity failure a request exception was caused by, or None if it wasn't one
+
+    Failures like dropped connections are left out since they mean the server could be reached
+    '''
+
+    if isinstance(err, requests.exceptions.Timeout):
+      return 'timeout'
+
+    if not isinstance(err, requests.exceptions.ConnectionError):
+      return None
+
+    # Find the socket error underneath the layers of requests and urllib3 exceptions
+    for cause in NetworkHealth.__get_causes(err):
+      if isinstance(cause, socket.gaierror):
+        return 'dns'
+      elif isinstance(cause, ConnectionRefusedError):
+        return 'refused'
+      elif isinstance(cause, socket.timeout):
+        return 'timeout'
+      elif isinstance(cause, OSError) and cause.errno in NetworkHealth.__UNREACHABLE_ERRNOS:
+        return 'unreachable'
+
+    return None
+
+  # --- Private Methods ---
+
+  @staticmethod
+  def __get_causes(err: Exception) -> List[Exception]:
+    causes = []
+    pending = [err]
+
+    # Follow exception chains and the wrapped exceptions urllib3 keeps in reason and args
+    while pending and len(causes) < 20:
+      cause = pending.pop()
+
+      if not isinstance(cause, BaseException) or any(cause is seen for seen in causes):
+        continue
+
+      causes.append(cause)
+      pending.extend([cause.__cause__, cause.__context__, getattr(cause, 'reason', None), *cause.args[:1]])
+
+    return causes
+
+  def __should_attempt_request(self) -> bool:
+    if self.__is_online:
+      return True
+
+    # Let one request through every so often to check whether the connection is back
+    with self.__lock:
+      now = time.monotonic()
+
+      if now - self.__last_trial_time >= NetworkHealth.__TRIAL_INTERVAL:
+        self.__last_trial_time = now
+        return True
+
+    return False
+
+  def __set_is_online(self, is_online: bool) -> None:
+    with self.__lock:
+      if is_online == self.__is_online:
+        return
+
+      self.__is_online = is_online
+      self.__last_trial_time = time.monotonic()
+      listeners = list(self.__listeners)
+
+    logging.info('Requests are going through again' if is_online else 'Requests are failing, treating the app as offline')
+
+    for listener in listeners:
+      listener(is_online)
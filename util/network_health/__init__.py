@@ -0,0 +1 @@
+from .NetworkHealth import NetworkHealth, NetworkUnavailableError
\ No newline at end of file
@@ -0,0 +1,104 @@
+import logging
+import os
+import time
+
+from PySide2 import QtCore
+
+from util.lastfm import LastfmApiWrapper
+from datatypes.MediaPlayerState import MediaPlayerState
+from tasks import UpdateNowPlaying
+
+class NowPlayingManager(QtCore.QObject):
+  '''
+  Send now playing updates to Last.fm without repeating ones that are still showing
+
+  Updates run one at a time on a dedicated thread. While one is in flight, only the newest update waits to be sent
+  since any older ones would be replaced immediately anyway
+  '''
+
+  # How long (seconds) an update is assumed to last when the track length is unknown
+  __DEFAULT_VALIDITY_WINDOW = int(os.environ.get('NOW_PLAYING_VALIDITY_WINDOW', 300))
+
+  def __init__(self, parent: QtCore.QObject=None) -> None:
+    QtCore.QObject.__init__(self, parent)
+
+    # Keep now playing requests off the shared pool used for loading data
+    self.__thread_pool = QtCore.QThreadPool(self)
+    self.__thread_pool.setMaxThreadCount(1)
+
+    self.reset()
+
+  def reset(self) -> None:
+    '''Forget what was announced so the next update is always sent'''
+
+    # Remember the last update Last.fm accepted and when it stops showing
+    self.__announced_key: tuple = None
+    self.__announced_expiry: float = None
+
+    # Hold the update that's being sent and the newest one waiting behind it
+    self.__sending_key: tuple = None
+    self.__pending_update: tuple = None
+
+  def announce(self, lastfm: LastfmApiWrapper, media_player_state: MediaPlayerState) -> None:
+    '''Update now playing on Last.fm unless the same track is already showing'''
+
+    key = NowPlayingManager.__key(media_player_state)
+
+    if key == self.__sending_key or (
+      key == self.__announced_key and time.monotonic() < self.__announced_expiry
+    ):
+      logging.debug(f'Skipping redundant now playing update for "{media_player_state.track_title}"')
+      return
+
+    if self.__sending_key:
+      # Replace anything else that was waiting
+      self.__pending_update = (lastfm, media_player_state)
+      return
+
+    self.__send(lastfm, media_player_state)
+
+  # --- Private Methods ---
+
+  def __send(self, lastfm: LastfmApiWrapper, media_player_state: MediaPlayerState) -> None:
+    key = NowPlayingManager.__key(media_player_state)
+    duration = media_player_state.track_crop.finish - media_player_state.track_crop.start
+    self.__sending_key = key
+
+    update_now_playing = UpdateNowPlaying(
+      lastfm=lastfm,
+      artist_name=media_player_state.artist_name,
+      track_title=media_player_state.track_title,
+      album_title=media_player_state.album_title,
+      album_artist_name=media_player_state.album_artist_name,
+      duration=duration
+    )
+    update_now_playing.finished.connect(
+      lambda was_successful: self.__handle_update_finished(key, duration, was_successful)
+    )
+    self.__thread_pool.start(update_now_playing)
+
+  def __handle_update_finished(self, key: tuple, duration: float, was_successful: bool) -> None:
+    # Ignore updates that finished after a reset
+    if key != self.__sending_key:
+      return
+
+    self.__sending_key = None
+
+    if was_successful:
+      # Last.fm shows a now playing track for about as long as the track is
+      self.__announced_key = key
+      self.__announced_expiry = time.monotonic() + (duration or NowPlayingManager.__DEFAULT_VALIDITY_WINDOW)
+
+    if self.__pending_update:
+      lastfm, media_player_state = self.__pending_update
+      self.__pending_update = None
+      self.announce(lastfm, media_player_state)
+
+  @staticmethod
+  def __key(media_player_state: MediaPlayerState) -> tuple:
+    return (
+      media_player_state.artist_name,
+      media_player_state.track_title,
+      media_player_state.album_title,
+      media_player_state.album_artist_name
+    )
@@ -0,0 +1 @@
+from .NowPlayingManager import NowPlayingManager
\ No newline at end of file
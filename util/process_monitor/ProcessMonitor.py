@@ -0,0 +1,87 @@
+import logging
+import os
+import threading
+from typing import FrozenSet
+
+import psutil
+
+class ProcessMonitor:
+  '''
+  Answer whether an app is running from a list of process names that's refreshed in the background
+
+  The process table is only scanned between start() and stop(), so nothing runs while no feature needs the answer
+  '''
+
+  __REFRESH_INTERVAL = float(os.environ.get('PROCESS_MONITOR_INTERVAL', 5)) # Seconds between process table scans
+
+  __shared_instance: 'ProcessMonitor' = None
+  __shared_instance_lock = threading.Lock()
+
+  @staticmethod
+  def shared() -> 'ProcessMonitor':
+    '''Get the monitor shared by the whole app'''
+
+    with ProcessMonitor.__shared_instance_lock:
+      if not ProcessMonitor.__shared_instance:
+        ProcessMonitor.__shared_instance = ProcessMonitor(ProcessMonitor.__REFRESH_INTERVAL)
+
+      return ProcessMonitor.__shared_instance
+
+  def __init__(self, refresh_interval: float) -> None:
+    self.__refresh_interval = refresh_interval
+    self.__lock = threading.Lock()
+
+    # Replaced as a whole on every scan so readers never see a half-built set (None until the first scan finishes)
+    self.__process_names: FrozenSet[str] = None
+
+    # Set to end the scanning thread (each thread gets its own so a restarted monitor never waits on an old one)
+    self.__stop_event: threading.Event = None
+
+  def start(self) -> None:
+    '''Start scanning the process table in the background (does nothing if it's already running)'''
+
+    with self.__lock:
+      if self.__stop_event:
+        return
+
+      self.__stop_event = threading.Event()
+      threading.Thread(target=self.__run, args=(self.__stop_event,), name='ProcessMonitor', daemon=True).start()
+
+  def stop(self) -> None:
+    '''Stop scanning and forget the last scan, which would only get more out of date'''
+
+    with self.__lock:
+      if not self.__stop_event:
+        return
+
+      self.__stop_event.set()
+      self.__stop_event = None
+      self.__process_names = None
+
+  def is_running(self, process_name: str) -> bool:
+    '''
+    Check if there is a process with this exact name running (as of the last scan)
+
+    Returns None if the processes haven't been scanned yet, so callers never wait on a scan
+    '''
+
+    process_names = self.__process_names
+
+    return process_name in process_names if process_names is not None else None
+
+  # --- Private Methods ---
+
+  def __run(self, stop_event: threading.Event) -> None:
+    while not stop_event.is_set():
+      try:
+        # Only ask psutil for names so it doesn't read any other process info
+        process_names = frozenset(process.info['name'] for process in psutil.process_iter(['name']))
+      except Exception as err:
+        logging.warning(f'Could not scan running processes: {err}')
+      else:
+        with self.__lock:
+          # Don't bring back a result after the monitor was stopped during the scan
+          if not stop_event.is_set():
+            self.__process_names = process_names
+
+      stop_event.wait(self.__refresh_interval)
@@ -0,0 +1 @@
+from .ProcessMonitor import ProcessMonitor
\ No newline at end of file
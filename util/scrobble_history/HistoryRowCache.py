@@ -0,0 +1,117 @@
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+from .ScrobbleColumns import ScrobbleColumns
+
+class HistoryRowCache:
+  '''
+  Records of what the history list shows for the rows around the visible ones, built from the scrobble columns
+
+  The columns only keep integers for each row, so the records are where timestamps are formatted. Records are built
+  again for rows that were invalidated because their columns changed
+  '''
+
+  # Positions of each value in a record
+  TRACK_TITLE = 0
+  ARTIST_NAME = 1
+  TIMESTAMP = 2
+  LASTFM_IS_LOVED = 3
+  ALBUM_IMAGE_URL = 4
+  HAS_LASTFM_DATA = 5
+
+  # How many built records are kept for the rows around the visible ones, which the list reads over and over
+  __MAX_CACHED_RECORDS = 256
+
+  # Timestamps are formatted like 1/2/21 3:04:05 PM
+  # strftime is slow enough to dominate building a record, so only dates go through it (once per day) and times are
+  # put together from precomputed parts
+  __DATE_FORMAT = '%#m/%#d/%y' if sys.platform == 'win32' else '%-m/%-d/%y'
+  __HOUR_TEXTS = [str(hour % 12 or 12) for hour in range(24)]
+  __AM_PM_TEXTS = [datetime(2000, 1, 1, hour).strftime('%p') for hour in range(24)]
+  __TWO_DIGIT_TEXTS = [f'{number:02}' for number in range(60)]
+  __date_texts: Dict[int, str] = {} # Formatted dates by ordinal
+
+  def __init__(self, get_columns: Callable[[], ScrobbleColumns], on_record_built: Callable[[int], None]) -> None:
+    self.__get_columns = get_columns
+
+    # Called with the row each time a record is built, which is when the row scrolls into view
+    self.__on_record_built = on_record_built
+
+    # Store the most recently read records by row (the least recently read is dropped first)
+    self.__records: Dict[int, Tuple] = OrderedDict()
+
+    # The list reads every role of a row one after another, so keep the last record at hand
+    self.__last_row: int = None
+    self.__last_record: Tuple = None
+
+  def get(self, row: int) -> Tuple:
+    '''Get the record of a row, building it from the columns if needed'''
+
+    if row == self.__last_row:
+      return self.__last_record
+
+    records = self.__records
+    record = records.get(row)
+
+    if record is not None:
+      records.move_to_end(row)
+      self.__last_row = row
+      self.__last_record = record
+      return record
+
+    self.__on_record_built(row)
+    row_view = self.__get_columns().row(row)
+    record = (
+      row_view.track_title,
+      row_view.artist_name,
+      HistoryRowCache.__format_timestamp(row_view.timestamp) if row_view.timestamp else '',
+      row_view.is_loved,
+      row_view.small_image_url,
+      row_view.has_lastfm_data
+    )
+    records[row] = record
+
+    if len(records) > HistoryRowCache.__MAX_CACHED_RECORDS:
+      records.popitem(last=False)
+
+    self.__last_row = row
+    self.__last_record = record
+
+    return record
+
+  def reset(self) -> None:
+    '''Forget every record after rows were inserted or replaced'''
+
+    self.__records.clear()
+    self.__last_row = None
+
+  def invalidate_rows(self, first_row: int, last_row: int) -> None:
+    '''Build the records of a range of rows (inclusive) from the columns again the next time they are read'''
+
+    for row in range(first_row, last_row + 1):
+      self.__records.pop(row, None)
+
+    if self.__last_row is not None and first_row <= self.__last_row <= last_row:
+      self.__last_row = None
+
+  # --- Private Methods ---
+
+  @staticmethod
+  def __format_timestamp(timestamp: int) -> str:
+    time = datetime.fromtimestamp(timestamp)
+    day = time.toordinal()
+    date_text = HistoryRowCache.__date_texts.get(day)
+
+    if date_text is None:
+      date_text = time.strftime(HistoryRowCache.__DATE_FORMAT)
+      HistoryRowCache.__date_texts[day] = date_text
+
+    hour = time.hour
+    two_digit_texts = HistoryRowCache.__TWO_DIGIT_TEXTS
+
+    return (
+      f'{date_text} {HistoryRowCache.__HOUR_TEXTS[hour]}:{two_digit_texts[time.minute]}:'
+      f'{two_digit_texts[time.second]} {HistoryRowCache.__AM_PM_TEXTS[hour]}'
+    )
\ No newline at end of file
@@ -0,0 +1,39 @@
+import logging
+import pickle
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+from datatypes.Scrobble import Scrobble
+
+@dataclass
+class HistorySnapshot:
+  '''Enriched history scrobbles saved on disk so the next launch can show them before anything is fetched'''
+
+  # Bump this whenever Scrobble or any of the dataclasses it holds change shape so old snapshots are ignored
+  VERSION = 2
+
+  username: str
+  scrobbles: List[Scrobble]
+  newest_fetched_timestamp: datetime
+
+  def to_bytes(self) -> bytes:
+    # Pickle stores the track, artist and album objects that scrobbles share only once
+    return zlib.compress(pickle.dumps((HistorySnapshot.VERSION, self), protocol=pickle.HIGHEST_PROTOCOL))
+
+  @staticmethod
+  def from_bytes(data: bytes) -> 'HistorySnapshot':
+    '''Read a snapshot, or return None if it's unreadable or from an older version of the app'''
+
+    try:
+      version, snapshot = pickle.loads(zlib.decompress(data))
+    except Exception as err:
+      logging.warning(f'Could not read history snapshot: {err}')
+      return None
+
+    if version != HistorySnapshot.VERSION:
+      logging.info(f'Ignoring history snapshot from version {version}')
+      return None
+
+    return snapshot
@@ -0,0 +1,251 @@
+from array import array
+from typing import Dict, List, NamedTuple, Tuple
+
+from datatypes.Scrobble import Scrobble
+
+class ScrobbleRowView(NamedTuple):
+  '''What the history list shows for a row, read from the columns'''
+
+  track_title: str
+  artist_name: str
+  timestamp: int # Unix timestamp, or 0 if unknown
+  is_loved: bool
+  small_image_url: str
+  has_lastfm_data: bool
+  album_title: str
+  track_url: str # Last.fm URL, or '' if the row has no Last.fm data
+
+class ScrobbleColumns:
+  '''
+  Store what the history list shows for every row in flat arrays instead of one object per row
+
+  Strings are interned into tables and stored as integer ids and flags are packed into bitsets, so a row costs about
+  24 bytes no matter how many scrobbles share its artist, album or art. Timestamps are kept as integers and formatted
+  by whatever shows them
+
+  Rows are added at the top (new scrobbles) and at the bottom (older pages), so each column is split into a top half
+  stored bottom up and a bottom half stored top down. Both ends are then appends and no row is ever moved
+  '''
+
+  # Which half of a column a row is in
+  __TOP = 0
+  __BOTTOM = 1
+
+  def __init__(self) -> None:
+    self.reset()
+
+  def __len__(self) -> int:
+    return len(self.__timestamps[ScrobbleColumns.__TOP]) + len(self.__timestamps[ScrobbleColumns.__BOTTOM])
+
+  def reset(self) -> None:
+    '''Remove every row'''
+
+    # Seconds since 1970 fit in 32 bits until 2106
+    self.__timestamps = (array('I'), array('I'))
+    self.__track_title_ids = (array('I'), array('I'))
+    self.__artist_name_ids = (array('I'), array('I'))
+    self.__album_title_ids = (array('I'), array('I'))
+    self.__small_image_url_ids = (array('I'), array('I'))
+    self.__track_url_ids = (array('I'), array('I'))
+
+    # One bit per row in 64 bit words
+    self.__is_loved_bits = (array('Q'), array('Q'))
+    self.__has_lastfm_data_bits = (array('Q'), array('Q'))
+
+    # Id 0 is the empty string so rows without a value don't need a separate flag
+    self.__strings: List[str] = ['']
+    self.__string_ids: Dict[str, int] = {'': 0}
+
+  def prepend(self, scrobble: Scrobble) -> None:
+    '''Add a row for a scrobble above the first row'''
+
+    self.__add(ScrobbleColumns.__TOP, scrobble)
+
+  def extend(self, scrobbles: List[Scrobble]) -> None:
+    '''Add rows for scrobbles after the last row'''
+
+    for scrobble in scrobbles:
+      self.__add(ScrobbleColumns.__BOTTOM, scrobble)
+
+  def set_row(self, row: int, scrobble: Scrobble) -> None:
+    '''Copy what the list shows for a row from its scrobble again after it changed'''
+
+    half, index = self.__locate(row)
+
+    self.__timestamps[half][index] = int(scrobble.timestamp.timestamp()) if scrobble.timestamp else 0
+    self.__track_title_ids[half][index] = self.__intern(scrobble.track_title)
+    self.__artist_name_ids[half][index] = self.__intern(scrobble.artist_name)
+    self.__album_title_ids[half][index] = self.__intern(scrobble.album_title)
+    self.__small_image_url_ids[half][index] = self.__intern(scrobble.image_set.small_url if scrobble.image_set else None)
+    self.__track_url_ids[half][index] = self.__intern(scrobble.lastfm_track.url if scrobble.lastfm_track else None)
+    ScrobbleColumns.__set_bit(
+      self.__is_loved_bits[half], index, bool(scrobble.lastfm_track and scrobble.lastfm_track.is_loved)
+    )
+    ScrobbleColumns.__set_bit(self.__has_lastfm_data_bits[half], index, scrobble.lastfm_track is not None)
+
+  def set_is_loved(self, row: int, is_loved: bool) -> None:
+    half, index = self.__locate(row)
+    ScrobbleColumns.__set_bit(self.__is_loved_bits[half], index, is_loved)
+
+  def row(self, row: int) -> ScrobbleRowView:
+    '''Get what the list shows for a row'''
+
+    half, index = self.__locate(row)
+    strings = self.__strings
+    word_index = index >> 6
+    bit = 1 << (index & 63)
+
+    # Build the tuple directly and read the bits inline since this runs for every row the list shows
+    return tuple.__new__(ScrobbleRowView, (
+      strings[self.__track_title_ids[half][index]],
+      strings[self.__artist_name_ids[half][index]],
+      self.__timestamps[half][index],
+      bool(self.__is_loved_bits[half][word_index] & bit),
+      strings[self.__small_image_url_ids[half][index]],
+      bool(self.__has_lastfm_data_bits[half][word_index] & bit),
+      strings[self.__album_title_ids[half][index]],
+      strings[self.__track_url_ids[half][index]]
+    ))
+
+  def rows_by_timestamp(self, newest_first: bool=True) -> List[int]:
+    '''Get every row ordered by timestamp (rows without one sort as the oldest)'''
+
+    top_timestamps, bottom_timestamps = self.__timestamps
+
+    # Put the timestamps in row order (the top half is stored bottom up)
+    timestamps = top_timestamps[::-1] + bottom_timestamps
+
+    return sorted(range(len(timestamps)), key=timestamps.__getitem__, reverse=newest_first)
+
+  def rows_matching(
+    self,
+    artist_name: str=None,
+    album_title: str=None,
+    track_url: str=None,
+    is_loved: bool=None
+  ) -> List[int]:
+    '''Get the rows (in ascending order) that match every given value'''
+
+    rows = []
+
+    for half in [ScrobbleColumns.__TOP, ScrobbleColumns.__BOTTOM]:
+      indexes = None
+
+      # Compare integer ids instead of strings, and skip the scan if a string isn't in any row
+      for columns, value in [
+        (self.__artist_name_ids, artist_name),
+        (self.__album_title_ids, album_title),
+        (self.__track_url_ids, track_url)
+      ]:
+        if value is None:
+          continue
+
+        string_id = self.__string_ids.get(value)
+
+        if string_id is None:
+          return []
+
+        column = columns[half]
+
+        if indexes is None:
+          indexes = [index for index, row_string_id in enumerate(column) if row_string_id == string_id]
+        else:
+          indexes = [index for index in indexes if column[index] == string_id]
+
+      if indexes is None:
+        indexes = range(len(self.__timestamps[half]))
+
+      if is_loved is not None:
+        words = self.__is_loved_bits[half]
+        indexes = [index for index in indexes if ScrobbleColumns.__get_bit(words, index) == is_loved]
+
+      rows.extend(self.__row_of(half, index) for index in indexes)
+
+    # The top half is stored bottom up
+    rows.sort()
+
+    return rows
+
+  def get_memory_size(self) -> int:
+    '''Get the bytes used by the row columns (not counting the strings they refer to)'''
+
+    return sum(
+      half.itemsize * len(half)
+      for columns in [
+        self.__timestamps,
+        self.__track_title_ids,
+        self.__artist_name_ids,
+        self.__album_title_ids,
+        self.__small_image_url_ids,
+        self.__track_url_ids,
+        self.__is_loved_bits,
+        self.__has_lastfm_data_bits
+      ]
+      for half in columns
+    )
+
+  # --- Private Methods ---
+
+  def __add(self, half: int, scrobble: Scrobble) -> None:
+    for columns in [
+      self.__timestamps,
+      self.__track_title_ids,
+      self.__artist_name_ids,
+      self.__album_title_ids,
+      self.__small_image_url_ids,
+      self.__track_url_ids
+    ]:
+      columns[half].append(0)
+
+    index = len(self.__timestamps[half]) - 1
+
+    # Start a new word every 64 rows
+    if index % 64 == 0:
+      self.__is_loved_bits[half].append(0)
+      self.__has_lastfm_data_bits[half].append(0)
+
+    self.set_row(self.__row_of(half, index), scrobble)
+
+  def __locate(self, row: int) -> Tuple[int, int]:
+    top_count = len(self.__timestamps[ScrobbleColumns.__TOP])
+
+    # Check the row since a negative index would read from the other end of a column
+    if row < 0 or row >= top_count + len(self.__timestamps[ScrobbleColumns.__BOTTOM]):
+      raise IndexError('Scrobble column row out of range')
+
+    if row < top_count:
+      return ScrobbleColumns.__TOP, top_count - 1 - row
+
+    return ScrobbleColumns.__BOTTOM, row - top_count
+
+  def __row_of(self, half: int, index: int) -> int:
+    top_count = len(self.__timestamps[ScrobbleColumns.__TOP])
+
+    if half == ScrobbleColumns.__TOP:
+      return top_count - 1 - index
+
+    return top_count + index
+
+  @staticmethod
+  def __get_bit(words: array, index: int) -> bool:
+    return bool(words[index >> 6] >> (index & 63) & 1)
+
+  @staticmethod
+  def __set_bit(words: array, index: int, value: bool) -> None:
+    if value:
+      words[index >> 6] |= 1 << (index & 63)
+    else:
+      words[index >> 6] &= ~(1 << (index & 63)) & 0xFFFFFFFFFFFFFFFF
+
+  def __intern(self, string: str) -> int:
+    if not string:
+      return 0
+
+    string_id = self.__string_ids.get(string)
+
+    if string_id is None:
+      string_id = len(self.__strings)
+      self.__strings.append(string)
+      self.__string_ids[string] = string_id
+
+    return string_id
@@ -0,0 +1,485 @@
+import weakref
+from datetime import datetime
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Set, Tuple
+
+from PySide2 import QtCore
+
+from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
+from util import db_helper
+from tasks import LoadSpilledScrobbles
+from .ScrobbleColumns import ScrobbleColumns
+
+class ScrobbleHistory:
+  '''
+  Scrobbles in the history view (newest first) with an index from scrobble identity and Last.fm URLs to rows
+
+  What the history list shows for every row is kept in columns, which are all the list reads. Only the newest
+  scrobbles are kept in memory as well. Older ones are spilled to the database and are paged back in when they are
+  read, in the background when read with get_if_loaded. Spills are written a page at a time in one transaction, so the
+  scrobbles waiting to be written are read from memory until then
+  '''
+
+  # How many spilled scrobbles are read from (and written to) the database at once, and how many pages stay in memory
+  PAGE_SIZE = 50
+  MAX_CACHED_PAGES = 4
+
+  def __init__(
+    self,
+    capacity: int,
+    scrobbles: List[Scrobble]=None,
+    on_rows_loaded: Callable[[List[int]], None]=None
+  ) -> None:
+    # Store the newest scrobbles in memory (anything past capacity is spilled)
+    self.__capacity = capacity
+    self.__scrobbles: Deque[Scrobble] = deque()
+    self.__spilled_count = 0
+
+    # Store what the list shows for every row, including spilled ones
+    self.columns = ScrobbleColumns()
+
+    # Store spilled scrobbles that haven't been written to the database yet by position
+    self.__pending_spills: Dict[int, Scrobble] = {}
+
+    # The table still holds rows from an earlier history until the first write clears it
+    self.__is_spill_table_cleared = False
+
+    # Store recently read pages of spilled scrobbles by page number
+    self.__cached_pages: OrderedDict[int, Dict[int, Scrobble]] = OrderedDict()
+
+    # Map the numbers of pages being read in the background to the positions that were asked for meanwhile
+    self.__loading_pages: Dict[int, Set[int]] = {}
+
+    # Called with the rows that were asked for with get_if_loaded once their page has been read
+    self.__on_rows_loaded = on_rows_loaded
+
+    # Pages read in the background are dropped if the history was reset or read again if spills were written meanwhile
+    self.__reset_count = 0
+    self.__spill_write_count = 0
+
+    # Every scrobble gets a position number that doesn't change when rows are inserted above it
+    # The row of a scrobble is its position minus the position of the first row
+    self.__first_position = 0
+
+    # Map scrobble identities and Last.fm URLs to positions
+    self.__positions_by_scrobble_id: Dict[int, int] = {}
+    self.__positions_by_track_url: Dict[str, Set[int]] = {}
+    self.__positions_by_artist_url: Dict[str, Set[int]] = {}
+
+    # Map the identities of shared album art objects to positions, since art isn't keyed by a URL
+    self.__positions_by_image_set_id: Dict[int, Set[int]] = {}
+
+    # Remember which keys each position was indexed under so they can be removed when the scrobble changes
+    self.__keys_by_position: Dict[int, Tuple[str, str, int]] = {}
+
+    # Remember the positions of spilled scrobbles that were paged back in (or spilled while still in use) for as long
+    # as anything holds them, so changes to them are saved and shown even after their page is dropped
+    self.__paged_scrobbles: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+    self.__paged_positions_by_scrobble_id: Dict[int, int] = {}
+
+    self.reset(scrobbles or [])
+
+  def __len__(self) -> int:
+    return len(self.__scrobbles) + self.__spilled_count
+
+  def __getitem__(self, row: int) -> Scrobble:
+    if row < 0:
+      row += len(self)
+
+    if not 0 <= row < len(self):
+      raise IndexError('Scrobble history row out of range')
+
+    if row < len(self.__scrobbles):
+      return self.__scrobbles[row]
+
+    return self.__get_spilled_scrobble(self.__first_position + row)
+
+  def get_if_loaded(self, row: int) -> Scrobble:
+    '''
+    Get the scrobble at a row without waiting on the database
+
+    Returns None if the row's page has to be read first. It's read in the background along with the next page, and
+    on_rows_loaded is called with the row once it's ready
+    '''
+
+    if not 0 <= row < len(self):
+      raise IndexError('Scrobble history row out of range')
+
+    if row < len(self.__scrobbles):
+      return self.__scrobbles[row]
+
+    position = self.__first_position + row
+    page_number = position // ScrobbleHistory.PAGE_SIZE
+
+    if page_number in self.__cached_pages:
+      return self.__get_spilled_scrobble(position)
+
+    # Spilled scrobbles that haven't been written yet are still in memory
+    pending_scrobble = self.__pending_spills.get(position)
+
+    if pending_scrobble is not None:
+      if self.__paged_scrobbles.get(position) is not pending_scrobble:
+        self.__track_paged_scrobble(position, pending_scrobble)
+
+      return pending_scrobble
+
+    self.__load_page(page_number, [position])
+
+    # Rows are usually read while scrolling down, so have the next page ready too
+    self.__load_page(page_number + 1)
+
+    return None
+
+  def __iter__(self) -> Iterator[Scrobble]:
+    for row in range(len(self)):
+      yield self[row]
+
+  def resident_scrobbles(self) -> Iterator[Scrobble]:
+    '''Iterate over the newest scrobbles that are held in memory without reading spilled ones'''
+
+    return iter(self.__scrobbles)
+
+  @property
+  def resident_count(self) -> int:
+    '''How many of the newest scrobbles are held in memory'''
+
+    return len(self.__scrobbles)
+
+  def first_resident_row_older_than(self, timestamp: datetime) -> int:
+    '''Find the first row held in memory that's older than a timestamp with a binary search (rows are newest first)'''
+
+    scrobbles = self.__scrobbles
+    low = 0
+    high = len(scrobbles)
+
+    while low < high:
+      middle = (low + high) // 2
+      middle_timestamp = scrobbles[middle].timestamp
+
+      # Rows without a timestamp are treated as newer than any other
+      if middle_timestamp and middle_timestamp < timestamp:
+        high = middle
+      else:
+        low = middle + 1
+
+    return low
+
+  def is_resident(self, row: int) -> bool:
+    '''Check whether a row is held in memory with all of its data (spilled rows only have list data)'''
+
+    return row < len(self.__scrobbles)
+
+  def reset(self, scrobbles: List[Scrobble]) -> None:
+    '''Replace every scrobble in the history'''
+
+    self.__scrobbles = deque()
+    self.__spilled_count = 0
+    self.columns.reset()
+    self.__pending_spills = {}
+    self.__is_spill_table_cleared = False
+    self.__cached_pages = OrderedDict()
+    self.__loading_pages = {}
+    self.__reset_count += 1
+    self.__first_position = 0
+    self.__positions_by_scrobble_id = {}
+    self.__positions_by_track_url = {}
+    self.__positions_by_artist_url = {}
+    self.__positions_by_image_set_id = {}
+    self.__keys_by_position = {}
+    self.__paged_scrobbles = weakref.WeakValueDictionary()
+    self.__paged_positions_by_scrobble_id = {}
+
+    self.extend(scrobbles)
+
+  def insert(self, row: int, scrobble: Scrobble) -> None:
+    '''
+    Insert a scrobble at the top (row 0) or the bottom (row == len) of the history
+
+    Both are O(1) since the new scrobble just takes the position before the first row or after the last one. Rows in
+    between can't be inserted at without giving every row above them a new position, so that raises an IndexError
+    '''
+
+    if row == len(self):
+      self.extend([scrobble])
+      return
+
+    if row != 0:
+      raise IndexError('Scrobbles can only be inserted at the top or bottom of the history')
+
+    self.__first_position -= 1
+    self.__scrobbles.appendleft(scrobble)
+    self.__index(scrobble, 0)
+    self.columns.prepend(scrobble)
+
+    # Keep memory use bounded by moving the oldest scrobble in memory to the database
+    if len(self.__scrobbles) > self.__capacity:
+      self.__spill_last_resident_scrobble()
+
+  def extend(self, scrobbles: List[Scrobble]) -> None:
+    '''Add scrobbles after the last row, writing the ones that are spilled together'''
+
+    for scrobble in scrobbles:
+      self.__append(scrobble)
+
+    self.columns.extend(scrobbles)
+    self.__write_full_pending_spills()
+
+  def reindex(self, scrobble: Scrobble) -> None:
+    '''Update the columns and URL index (or the spilled copy) of a scrobble whose data changed'''
+
+    row = self.row_of(scrobble)
+
+    if row is None:
+      return
+
+    self.columns.set_row(row, scrobble)
+    paged_position = self.__paged_positions_by_scrobble_id.get(id(scrobble))
+
+    # Save changes made to spilled scrobbles that were paged back in (ones that weren't written yet are saved as is)
+    if paged_position is not None:
+      if paged_position not in self.__pending_spills:
+        db_helper.save_spilled_scrobble(paged_position, scrobble)
+
+      return
+
+    self.__unindex(self.__first_position + row)
+    self.__index(scrobble, row)
+
+  def refresh_rows(self, rows: List[int]) -> None:
+    '''Copy resident rows into the columns again after data they share with other scrobbles changed in place'''
+
+    for row in rows:
+      if row < len(self.__scrobbles):
+        self.columns.set_row(row, self.__scrobbles[row])
+
+  def row_of(self, scrobble: Scrobble) -> int:
+    '''Get the row of this exact scrobble object, or None if it isn't in the history'''
+
+    position = self.__positions_by_scrobble_id.get(id(scrobble))
+
+    if position is None:
+      position = self.__paged_positions_by_scrobble_id.get(id(scrobble))
+
+    if position is None:
+      return None
+
+    return position - self.__first_position
+
+  def rows_for_track_url(self, url: str, should_include_spilled: bool=True) -> List[int]:
+    '''Get the rows of every scrobble of a Last.fm track in ascending order'''
+
+    rows = self.__rows(self.__positions_by_track_url.get(url))
+
+    # Spilled rows are only indexed in the columns
+    if should_include_spilled and self.__spilled_count and url:
+      rows += [row for row in self.columns.rows_matching(track_url=url) if row >= len(self.__scrobbles)]
+
+    return rows
+
+  def set_track_is_loved(self, url: str, is_loved: bool) -> None:
+    '''Show a loved status change in every row of a Last.fm track and save it to the spilled ones'''
+
+    if not url:
+      return
+
+    # Resident scrobbles share the track object that was changed, but the columns hold a copy for every row
+    for row in self.columns.rows_matching(track_url=url):
+      self.columns.set_is_loved(row, is_loved)
+
+    if not self.__spilled_count:
+      return
+
+    if self.__is_spill_table_cleared:
+      db_helper.set_spilled_scrobbles_is_loved(url, is_loved)
+
+    for scrobble in [*self.__paged_scrobbles.values(), *self.__pending_spills.values()]:
+      if scrobble.lastfm_track and scrobble.lastfm_track.url == url:
+        scrobble.lastfm_track.is_loved = is_loved
+
+  def rows_for_artist_url(self, url: str) -> List[int]:
+    '''Get the rows of every scrobble by a Last.fm artist in ascending order'''
+
+    return self.__rows(self.__positions_by_artist_url.get(url))
+
+  def rows_for_image_set(self, image_set: ImageSet) -> List[int]:
+    '''Get the rows of every scrobble held in memory that shares an album art object in ascending order'''
+
+    return self.__rows(self.__positions_by_image_set_id.get(id(image_set)))
+
+  # --- Private Methods ---
+
+  def __append(self, scrobble: Scrobble) -> None:
+    '''Add a scrobble after the last row (the caller adds it to the columns)'''
+
+    # Rows can only be held in memory if every row above them is
+    if not self.__spilled_count and len(self.__scrobbles) < self.__capacity:
+      self.__scrobbles.append(scrobble)
+      self.__index(scrobble, len(self.__scrobbles) - 1)
+      return
+
+    self.__spill(self.__first_position + len(self), scrobble)
+
+  def __spill_last_resident_scrobble(self) -> None:
+    position = self.__first_position + len(self.__scrobbles) - 1
+    scrobble = self.__scrobbles.pop()
+
+    self.__unindex(position)
+    del self.__positions_by_scrobble_id[id(scrobble)]
+
+    # The popped scrobble becomes the first spilled row
+    self.__spill(position, scrobble)
+    self.__track_paged_scrobble(position, scrobble)
+    self.__write_full_pending_spills()
+
+  def __spill(self, position: int, scrobble: Scrobble) -> None:
+    self.__pending_spills[position] = scrobble
+    self.__spilled_count += 1
+
+    # The page holding this position is out of date if it was read before
+    self.__cached_pages.pop(position // ScrobbleHistory.PAGE_SIZE, None)
+
+  def __write_full_pending_spills(self) -> None:
+    if len(self.__pending_spills) < ScrobbleHistory.PAGE_SIZE:
+      return
+
+    # Rows left behind by an earlier history (or a session that didn't shut down cleanly) are cleared in the same
+    # transaction as the first write
+    db_helper.save_spilled_scrobbles(self.__pending_spills, should_clear_table=not self.__is_spill_table_cleared)
+    self.__is_spill_table_cleared = True
+    self.__pending_spills = {}
+    self.__spill_write_count += 1
+
+  def __get_spilled_scrobble(self, position: int) -> Scrobble:
+    page_number = position // ScrobbleHistory.PAGE_SIZE
+
+    if page_number in self.__cached_pages:
+      self.__cached_pages.move_to_end(page_number)
+    else:
+      first_position = page_number * ScrobbleHistory.PAGE_SIZE
+      last_position = first_position + ScrobbleHistory.PAGE_SIZE - 1
+      page = db_helper.get_spilled_scrobbles(first_position, last_position) if self.__is_spill_table_cleared else {}
+      self.__cache_page(page_number, page)
+
+    return self.__cached_pages[page_number][position]
+
+  def __load_page(self, page_number: int, requested_positions: Iterable[int]=()) -> None:
+    '''Read a page of spilled scrobbles in the background unless it's in memory or past the last row'''
+
+    first_position = page_number * ScrobbleHistory.PAGE_SIZE
+
+    if page_number in self.__cached_pages or first_position >= self.__first_position + len(self):
+      return
+
+    if page_number not in self.__loading_pages:
+      self.__loading_pages[page_number] = set()
+
+      reset_count = self.__reset_count
+      spill_write_count = self.__spill_write_count
+      load_spilled_scrobbles = LoadSpilledScrobbles(first_position, first_position + ScrobbleHistory.PAGE_SIZE - 1)
+      load_spilled_scrobbles.finished.connect(
+        lambda page: self.__handle_page_loaded(page_number, page, reset_count, spill_write_count)
+      )
+      QtCore.QThreadPool.globalInstance().start(load_spilled_scrobbles)
+
+    self.__loading_pages[page_number].update(requested_positions)
+
+  def __handle_page_loaded(
+    self,
+    page_number: int,
+    page: Dict[int, Scrobble],
+    reset_count: int,
+    spill_write_count: int
+  ) -> None:
+    # The page is from a history that has since been replaced
+    if reset_count != self.__reset_count:
+      return
+
+    requested_positions = self.__loading_pages.pop(page_number, set())
+
+    # Indexing the history reads pages right away, so this one could already be in memory
+    if page_number not in self.__cached_pages:
+      # Scrobbles that were written while the page was read could be missing from it
+      if spill_write_count != self.__spill_write_count:
+        self.__load_page(page_number, requested_positions)
+        return
+
+      self.__cache_page(page_number, page)
+
+    if requested_positions and self.__on_rows_loaded:
+      self.__on_rows_loaded(sorted(position - self.__first_position for position in requested_positions))
+
+  def __cache_page(self, page_number: int, page: Dict[int, Scrobble]) -> None:
+    first_position = page_number * ScrobbleHistory.PAGE_SIZE
+    last_position = first_position + ScrobbleHistory.PAGE_SIZE - 1
+
+    for pending_position, scrobble in self.__pending_spills.items():
+      if first_position <= pending_position <= last_position:
+        page[pending_position] = scrobble
+
+    for page_position, scrobble in page.items():
+      # Keep handing out the object that's still in use for a position so edits to it aren't split across copies
+      existing_scrobble = self.__paged_scrobbles.get(page_position)
+
+      if existing_scrobble is not None:
+        page[page_position] = existing_scrobble
+      else:
+        self.__track_paged_scrobble(page_position, scrobble)
+
+    self.__cached_pages[page_number] = page
+
+    # Drop the least recently read page
+    if len(self.__cached_pages) > ScrobbleHistory.MAX_CACHED_PAGES:
+      self.__cached_pages.popitem(last=False)
+
+  def __track_paged_scrobble(self, position: int, scrobble: Scrobble) -> None:
+    scrobble_id = id(scrobble)
+    self.__paged_scrobbles[position] = scrobble
+    self.__paged_positions_by_scrobble_id[scrobble_id] = position
+
+    # Forget the position once nothing holds the scrobble (its id can't be reused before then)
+    paged_positions_by_scrobble_id = self.__paged_positions_by_scrobble_id
+    weakref.finalize(scrobble, paged_positions_by_scrobble_id.pop, scrobble_id, None)
+
+  def __rows(self, positions: Set[int]) -> List[int]:
+    if not positions:
+      return []
+
+    return sorted(position - self.__first_position for position in positions)
+
+  def __index(self, scrobble: Scrobble, row: int) -> None:
+    position = self.__first_position + row
+    track_url = scrobble.lastfm_track.url if scrobble.lastfm_track else None
+    artist_url = scrobble.lastfm_artist.url if scrobble.lastfm_artist else None
+    image_set_id = id(scrobble.image_set) if scrobble.image_set is not None else None
+
+    self.__positions_by_scrobble_id[id(scrobble)] = position
+    self.__keys_by_position[position] = (track_url, artist_url, image_set_id)
+
+    if track_url:
+      self.__positions_by_track_url.setdefault(track_url, set()).add(position)
+
+    if artist_url:
+      self.__positions_by_artist_url.setdefault(artist_url, set()).add(position)
+
+    if image_set_id:
+      self.__positions_by_image_set_id.setdefault(image_set_id, set()).add(position)
+
+  def __unindex(self, position: int) -> None:
+    track_url, artist_url, image_set_id = self.__keys_by_position.pop(position, (None, None, None))
+
+    ScrobbleHistory.__discard_position(self.__positions_by_track_url, track_url, position)
+    ScrobbleHistory.__discard_position(self.__positions_by_artist_url, artist_url, position)
+    ScrobbleHistory.__discard_position(self.__positions_by_image_set_id, image_set_id, position)
+
+  @staticmethod
+  def __discard_position(positions_by_key: Dict[object, Set[int]], key: object, position: int) -> None:
+    if not key or key not in positions_by_key:
+      return
+
+    positions = positions_by_key[key]
+    positions.discard(position)
+
+    # Don't keep empty sets around for tracks, artists and art that are no longer in the history
+    if not positions:
+      del positions_by_key[key]
@@ -0,0 +1,4 @@
+from .ScrobbleHistory import ScrobbleHistory
+from .HistorySnapshot import HistorySnapshot
+from .ScrobbleColumns import ScrobbleColumns, ScrobbleRowView
+from .HistoryRowCache import HistoryRowCache
\ No newline at end of file
@@ -5,12 +5,12 @@ import os
 from typing import Dict, List
 
 from unidecode import unidecode
-import requests
 
 from datatypes.ImageSet import ImageSet
 from .SpotifySongData import SpotifySongData
 from .SpotifyArtist import SpotifyArtist
 from datatypes.CachedResource import CachedResource
+from util.network_health import NetworkHealth
 
 class SpotifyApiWrapper:
   CLIENT_ID = '26452cc6850d4d1abbd2adb5a6ffccb4'
@@ -139,7 +139,8 @@ class SpotifyApiWrapper:
       self.__access_token = self.__get_access_token()
     
     try:
-      resp = requests.get(
+      resp = NetworkHealth.shared().request(
+        method='GET',
         url=url,
         params=args, 
         headers={
@@ -210,7 +211,7 @@ class SpotifyApiWrapper:
   def __get_access_token() -> dict:
     '''Get an access token from Spotify using client credentials authentication'''
 
-    return requests.post('https://accounts.spotify.com/api/token', data={
+    return NetworkHealth.shared().request('POST', 'https://accounts.spotify.com/api/token', data={
       'grant_type': 'client_credentials'
     }, auth=(SpotifyApiWrapper.CLIENT_ID, SpotifyApiWrapper.CLIENT_SECRET)).json()['access_token']
 
@@ -0,0 +1,159 @@
+import logging
+import os
+from typing import Dict, Tuple
+
+from PySide2 import QtCore
+
+from util.lastfm import LastfmApiWrapper
+from util import db_helper
+from tasks import UpdateTrackLoveOnLastfm
+
+class TrackLoveQueue(QtCore.QObject):
+  '''
+  Save loved status changes locally and send them to Last.fm in the background
+
+  Repeated toggles of a track are combined into its final state (or dropped if they cancel out) before anything is sent.
+  Changes are kept in the database until Last.fm accepts them, so they are retried after failures and restarts.
+  They are saved per Last.fm user so changes left over from one account are never sent with another account's session
+  '''
+
+  # How long (ms) to wait for more toggles before sending, and the longest wait between retries
+  __FLUSH_DELAY = int(os.environ.get('TRACK_LOVE_FLUSH_DELAY', 2000))
+  __MAX_RETRY_DELAY = 5 * 60 * 1000
+
+  def __init__(self, parent: QtCore.QObject=None) -> None:
+    QtCore.QObject.__init__(self, parent)
+    self.__lastfm: LastfmApiWrapper = None
+    self.__username: str = None
+    self.__is_paused = False
+
+    # Map (artist name, track title) to (loved status to send, loved status on Last.fm before the first toggle)
+    self.__pending_track_loves: Dict[Tuple[str, str], Tuple[bool, bool]] = {}
+
+    # Keep track of the tracks being sent and their sent values so newer toggles made meanwhile aren't lost
+    self.__sending_track_loves: Dict[Tuple[str, str], bool] = {}
+
+    self.__retry_delay = TrackLoveQueue.__FLUSH_DELAY
+
+    # Whether the flush timer is waiting to retry failed changes rather than for more toggles
+    self.__is_retry_scheduled = False
+
+    self.__flush_timer = QtCore.QTimer(self)
+    self.__flush_timer.setSingleShot(True)
+    self.__flush_timer.timeout.connect(self.__flush)
+
+  def start(self, lastfm: LastfmApiWrapper) -> None:
+    '''Load changes left over from previous sessions and start sending them'''
+
+    self.__lastfm = lastfm
+    self.__username = lastfm.username
+
+    db_helper.create_pending_track_loves_table()
+    self.__pending_track_loves = db_helper.get_pending_track_loves(self.__username)
+    self.__sending_track_loves = {}
+    self.__retry_delay = TrackLoveQueue.__FLUSH_DELAY
+    self.__is_retry_scheduled = False
+
+    if self.__pending_track_loves:
+      logging.info(f'Sending {len(self.__pending_track_loves)} loved status changes from a previous session')
+      self.__flush_timer.start(TrackLoveQueue.__FLUSH_DELAY)
+
+  def stop(self) -> None:
+    '''Stop sending changes (they stay saved for the next start)'''
+
+    self.__flush_timer.stop()
+    self.__is_retry_scheduled = False
+    self.__lastfm = None
+    self.__username = None
+
+    # Forget the stopped user's changes so they can't show up for whoever logs in next
+    self.__pending_track_loves = {}
+    self.__sending_track_loves = {}
+
+  def set_is_paused(self, is_paused: bool) -> None:
+    '''Hold changes while offline and send them as soon as the connection is back'''
+
+    self.__is_paused = is_paused
+
+    if is_paused:
+      self.__flush_timer.stop()
+    elif self.__pending_track_loves:
+      self.__retry_delay = TrackLoveQueue.__FLUSH_DELAY
+      self.__is_retry_scheduled = False
+      self.__flush_timer.start(0)
+
+  def set_is_loved(self, artist_name: str, track_title: str, is_loved: bool, was_loved: bool) -> None:
+    '''Queue a loved status change for a track that was shown as was_loved'''
+
+    key = (artist_name, track_title)
+
+    # Keep the loved status from before the first pending toggle
+    if key in self.__pending_track_loves:
+      was_loved = self.__pending_track_loves[key][1]
+
+    if is_loved == was_loved and key not in self.__sending_track_loves:
+      # The toggles cancelled out, so there's nothing to send
+      self.__pending_track_loves.pop(key, None)
+      db_helper.delete_pending_track_love(self.__username, artist_name, track_title)
+      return
+
+    self.__pending_track_loves[key] = (is_loved, was_loved)
+    db_helper.save_pending_track_love(self.__username, artist_name, track_title, is_loved, was_loved)
+
+    # Wait for more toggles before sending (unless a retry is already scheduled)
+    if not self.__is_retry_scheduled:
+      self.__flush_timer.start(TrackLoveQueue.__FLUSH_DELAY)
+
+  def get_pending_is_loved(self, artist_name: str, track_title: str) -> bool:
+    '''Get the loved status that hasn't been sent yet for a track, or None if there isn't one'''
+
+    pending_track_love = self.__pending_track_loves.get((artist_name, track_title))
+
+    return pending_track_love[0] if pending_track_love else None
+
+  # --- Private Methods ---
+
+  def __flush(self) -> None:
+    self.__is_retry_scheduled = False
+
+    if not self.__lastfm or self.__is_paused:
+      return
+
+    for key, (is_loved, was_loved) in self.__pending_track_loves.items():
+      # Send one change per track at a time
+      if key in self.__sending_track_loves:
+        continue
+
+      self.__sending_track_loves[key] = is_loved
+
+      update_track_love = UpdateTrackLoveOnLastfm(self.__lastfm, *key, is_loved)
+      update_track_love.finished.connect(
+        lambda was_successful, key=key, is_loved=is_loved: self.__handle_track_love_sent(key, is_loved, was_successful)
+      )
+      QtCore.QThreadPool.globalInstance().start(update_track_love)
+
+  def __handle_track_love_sent(self, key: Tuple[str, str], is_loved: bool, was_successful: bool) -> None:
+    if self.__sending_track_loves.get(key) != is_loved:
+      return
+
+    del self.__sending_track_loves[key]
+
+    if not was_successful:
+      # Back off so retries don't pile up while offline or while Last.fm is down
+      self.__retry_delay = min(self.__retry_delay * 2, TrackLoveQueue.__MAX_RETRY_DELAY)
+      self.__is_retry_scheduled = True
+      self.__flush_timer.start(self.__retry_delay)
+      return
+
+    self.__retry_delay = TrackLoveQueue.__FLUSH_DELAY
+    pending_track_love = self.__pending_track_loves.get(key)
+
+    if pending_track_love and pending_track_love[0] == is_loved:
+      # Last.fm is now up to date with this track
+      del self.__pending_track_loves[key]
+      db_helper.delete_pending_track_love(self.__username, *key)
+    elif pending_track_love:
+      # The track was toggled while the change was being sent, so what's on Last.fm is the new starting point
+      self.__pending_track_loves[key] = (pending_track_love[0], is_loved)
+      db_helper.save_pending_track_love(self.__username, *key, pending_track_love[0], is_loved)
+      self.__flush_timer.start(TrackLoveQueue.__FLUSH_DELAY)
@@ -0,0 +1 @@
+from .TrackLoveQueue import TrackLoveQueue
\ No newline at end of file
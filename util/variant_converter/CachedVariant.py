@@ -0,0 +1,46 @@
+from typing import Any, Callable
+
+from PySide2 import QtCore
+
+from .VariantConverter import VariantConverter
+
+class CachedVariant:
+  '''
+  The QML value of one view model property, converted on the first read after each change signal
+
+  Every binding that reads the property after a change gets the same result, so a refresh only walks the object once
+  to find out what changed. Create it before QML binds to the property so its slot runs before the bindings re-read
+  '''
+
+  def __init__(self, get_value: Callable[[], Any], changed_signal: QtCore.Signal) -> None:
+    self.__get_value = get_value
+    self.__value = None
+    self.__variant = None
+    self.__is_valid = False
+
+    changed_signal.connect(self.invalidate)
+
+  def get(self) -> Any:
+    value = self.__get_value()
+
+    # Also convert again if the property was pointed at another object without the change signal
+    if not self.__is_valid or value is not self.__value:
+      self.__value = value
+      self.__variant = VariantConverter.shared().convert(value)
+      self.__is_valid = True
+
+    return self.__variant
+
+  def has_changed(self) -> bool:
+    '''Check whether the property would read differently now, converting only the parts of the value that changed'''
+
+    if not self.__is_valid:
+      return True
+
+    value = self.__get_value()
+
+    # Compare with == since lists are rebuilt every time, and unchanged parts are the same objects so this is fast
+    return value is not self.__value or VariantConverter.shared().convert(value) != self.__variant
+
+  def invalidate(self) -> None:
+    self.__is_valid = False
@@ -0,0 +1,134 @@
+import weakref
+from dataclasses import fields
+from operator import attrgetter
+from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+
+class VariantConverter:
+  '''
+  Convert dataclasses into the dicts and lists that QML reads as QVariantMaps and QVariantLists, remembering the
+  result for every object in the tree
+
+  asdict looks up the fields of every object and deep copies every value each time a binding reads a property. This
+  looks up each type's fields once, the first time the type is seen, and reuses an
+  object's result until its version changes. An object's version is a tuple of its field values with the results
+  of the objects inside it, so changing any object (even one shared between scrobbles, or a list changed in place)
+  only rebuilds the results of it and the objects above it
+
+  Only use it from the main thread, where QML reads properties
+  '''
+
+  # Values that can be passed to QML as they are
+  __PLAIN_TYPES = frozenset([str, int, float, bool, type(None), datetime])
+
+  __shared_instance: 'VariantConverter' = None
+
+  @staticmethod
+  def shared() -> 'VariantConverter':
+    '''Get the converter shared by every view model, so objects they both show are only converted once'''
+
+    if not VariantConverter.__shared_instance:
+      VariantConverter.__shared_instance = VariantConverter()
+
+    return VariantConverter.__shared_instance
+
+  def __init__(self) -> None:
+    # Map each dataclass type to the functions that get the version of an object and build its result from that
+    self.__converters: Dict[type, Tuple[Callable, Callable]] = {}
+
+    # Map the id of each converted object to a weak reference to it, its version, and its result
+    self.__entries: Dict[int, Tuple[weakref.ref, Tuple, Dict[str, Any]]] = {}
+
+    # Count how often results were reused so the memoization can be measured
+    self.built_count = 0
+    self.reused_count = 0
+
+  def convert(self, value: Any) -> Any:
+    '''Get the QML value for a dataclass (or list of them), reusing the last result if nothing in it changed'''
+
+    return self.__to_variant(self.__get_version_value(value))
+
+  # --- Private Methods ---
+
+  def __get_version_value(self, value: Any) -> Any:
+    '''Get what a value contributes to the version of the object it's in'''
+
+    if value.__class__ in VariantConverter.__PLAIN_TYPES:
+      return value
+
+    if hasattr(value.__class__, '__dataclass_fields__'):
+      return self.__convert_dataclass(value)
+
+    if isinstance(value, (list, tuple)):
+      # Use a tuple so a list that is changed in place is compared against a copy of its old items
+      return tuple(self.__get_version_value(item) for item in value)
+
+    if isinstance(value, dict):
+      # Dicts are converted right away like dataclasses are, so their version value is already what QML reads
+      return {key: self.convert(item) for key, item in value.items()}
+
+    return value
+
+  def __convert_dataclass(self, dataclass_object: Any) -> Dict[str, Any]:
+    get_version, build_variant = self.__converters.get(dataclass_object.__class__) or self.__create_converter(
+      dataclass_object.__class__
+    )
+
+    version = get_version(dataclass_object, self.__get_version_value)
+    entry = self.__entries.get(id(dataclass_object))
+
+    # Compare the reference too since the id of a deleted object can be reused before its entry is removed
+    if entry and entry[0]() is dataclass_object and entry[1] == version:
+      self.reused_count += 1
+      return entry[2]
+
+    variant = build_variant(version, self.__to_variant)
+    self.__entries[id(dataclass_object)] = (
+      weakref.ref(dataclass_object, self.__create_entry_remover(id(dataclass_object))),
+      version,
+      variant
+    )
+    self.built_count += 1
+
+    return variant
+
+  def __create_entry_remover(self, object_id: int) -> Callable[[weakref.ref], None]:
+    def remove_entry(reference: weakref.ref) -> None:
+      entry = self.__entries.get(object_id)
+
+      # Keep the entry if a new object with the same id replaced it
+      if entry and entry[0] is reference:
+        del self.__entries[object_id]
+
+    return remove_entry
+
+  def __create_converter(self, dataclass_type: type) -> Tuple[Callable, Callable]:
+    '''Create functions that read the fields of a dataclass type, closing over its field names'''
+
+    field_names = tuple(field.name for field in fields(dataclass_type))
+    plain_types = VariantConverter.__PLAIN_TYPES
+
+    # attrgetter reads every field in one call, but returns the value itself when there's only one
+    get_field_values = attrgetter(*field_names) if len(field_names) > 1 else (
+      lambda o: (getattr(o, field_names[0]),) if field_names else ()
+    )
+
+    # Plain values are checked inline since most fields hold them and a call per field would cost more than the check
+    def get_version(o: Any, v: Callable[[Any], Any]) -> Tuple:
+      return tuple([x if x.__class__ in plain_types else v(x) for x in get_field_values(o)])
+
+    def build_variant(version: Tuple, to_variant: Callable[[Any], Any]) -> Dict[str, Any]:
+      return dict(zip(field_names, map(to_variant, version)))
+
+    self.__converters[dataclass_type] = (get_version, build_variant)
+
+    return get_version, build_variant
+
+  @staticmethod
+  def __to_variant(version_value: Any) -> Any:
+    '''Turn the tuples in a version back into lists for QML'''
+
+    if version_value.__class__ is tuple:
+      return [VariantConverter.__to_variant(item) for item in version_value]
+
+    return version_value
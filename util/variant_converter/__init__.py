@@ -0,0 +1,2 @@
+from .VariantConverter import VariantConverter
+from .CachedVariant import CachedVariant
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+from util.lastfm import LastfmArtistLink, LastfmList, LastfmTrack
+from util.lastfm.LastfmAlbum import LastfmAlbum
+from util.lastfm.LastfmArtist import LastfmArtist
+from util.lastfm.LastfmTag import LastfmTag
+from util.spotify_api import SpotifyArtist
+from util.variant_converter import VariantConverter
+from datatypes.Scrobble import Scrobble
+from datatypes.ImageSet import ImageSet
+
+# Measure the conversions the details pane triggers when it refreshes, where every binding that reads
+# viewModel.scrobble converts the whole selected scrobble again
+BINDING_READS = int(os.environ.get('BINDING_READS', 32)) # Reads of viewModel.scrobble in views/Details.qml
+REFRESHES = int(os.environ.get('REFRESHES', 200))
+
+def create_scrobble() -> Scrobble:
+  '''Build a scrobble with every section of the details pane loaded'''
+
+  artist_link = LastfmArtistLink('https://www.last.fm/music/Artist', 'Artist')
+  tags = [LastfmTag(f'Tag {i}', f'https://www.last.fm/tag/{i}') for i in range(5)]
+
+  return Scrobble(
+    artist_name='Artist',
+    track_title='Track',
+    album_title='Album',
+    album_artist_name=None,
+    timestamp=datetime.now(),
+    image_set=ImageSet('https://lastfm.freetls.fastly.net/i/u/64s/0.png', 'https://lastfm.freetls.fastly.net/i/u/300x300/0.png'),
+    lastfm_track=LastfmTrack('https://www.last.fm/music/Artist/_/Track', 'Track', artist_link, 12, False, 40000, 250000, tags),
+    lastfm_artist=LastfmArtist(
+      url='https://www.last.fm/music/Artist',
+      name='Artist',
+      plays=340,
+      bio='Lorem ipsum dolor sit amet. ' * 80,
+      global_listeners=900000,
+      global_plays=25000000,
+      tags=tags,
+      similar_artists=LastfmList(
+        [LastfmArtist(f'https://www.last.fm/music/Similar+{i}', f'Similar {i}') for i in range(5)],
+        5
+      )
+    ),
+    lastfm_album=LastfmAlbum('https://www.last.fm/music/Artist/Album', 'Album', artist_link, None, 80, 300000, 2000000, tags),
+    spotify_artists=[
+      SpotifyArtist(f'https://open.spotify.com/artist/{i}', f'Artist {i}', f'https://i.scdn.co/image/{i}') for i in range(3)
+    ],
+    is_loading=False,
+    requested_stages=['lastfm_track', 'lastfm_artist', 'lastfm_album', 'spotify_artists'],
+    loaded_fields=['lastfm_track', 'lastfm_artist', 'lastfm_album', 'spotify_artists']
+  )
+
+def time_refreshes(convert, before_refresh=None, read_count=BINDING_READS) -> float:
+  '''Get the average ms one details pane refresh spends converting the scrobble'''
+
+  start_time = time.perf_counter()
+
+  for _ in range(REFRESHES):
+    if before_refresh:
+      before_refresh()
+
+    for _ in range(read_count):
+      convert(scrobble)
+
+  return (time.perf_counter() - start_time) / REFRESHES * 1000
+
+scrobble = create_scrobble()
+converter = VariantConverter()
+
+assert converter.convert(scrobble) == asdict(scrobble)
+
+def toggle_loved():
+  scrobble.lastfm_track.is_loved = not scrobble.lastfm_track.is_loved
+
+def select_new_scrobble():
+  global scrobble
+  scrobble = create_scrobble()
+
+print(f'\n***** DETAILS PANE REFRESH ({BINDING_READS} property reads per refresh, {REFRESHES} refreshes) *****\n')
+
+for refresh_name, before_refresh in [
+  ('Nothing changed', None),
+  ('Loved status toggled', toggle_loved),
+  ('New scrobble selected', select_new_scrobble)
+]:
+  asdict_time = time_refreshes(asdict, before_refresh)
+  converter_time = time_refreshes(converter.convert, before_refresh)
+
+  # CachedVariant converts on the first read after the change signal and returns that result to the other bindings
+  cached_time = time_refreshes(converter.convert, before_refresh, read_count=1)
+
+  print(f'{refresh_name}:')
+  print(f'  asdict on every read: {asdict_time:.3f} ms')
+  print(f'  VariantConverter on every read: {converter_time:.3f} ms')
+  print(f'  VariantConverter once per change (CachedVariant): {cached_time:.3f} ms')
+
+print(f'\nVariantConverter built {converter.built_count} results and reused {converter.reused_count}')
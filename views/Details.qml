@@ -11,15 +11,15 @@ Item {
   // Store reference to view model counterpart that can be set from main.qml
   property DetailsViewModel viewModel
 
-  property bool canDisplayScrobble: !!(viewModel && viewModel.scrobble)
+  property bool canDisplayScrobble: !!(viewModel && viewModel.hasScrobble)
 
   // Check if all remote scrobble data from Last.fm has loaded
-  property bool hasLastfmTrackData: canDisplayScrobble && !!viewModel.scrobble.lastfm_track
-  property bool hasLastfmArtistData: canDisplayScrobble && !!viewModel.scrobble.lastfm_artist
+  property bool hasLastfmTrackData: canDisplayScrobble && !!viewModel.track
+  property bool hasLastfmArtistData: canDisplayScrobble && !!viewModel.artist
   property bool isTrackNotFound: (
-    canDisplayScrobble && !viewModel.scrobble.lastfm_track && !viewModel.scrobble.is_loading
+    canDisplayScrobble && !viewModel.track && !viewModel.isLoading
   )
-  property bool hasTrackLoadingError: canDisplayScrobble && viewModel.scrobble.has_error
+  property bool hasTrackLoadingError: canDisplayScrobble && viewModel.hasError
   property bool isInMiniMode: false
   property bool isOffline: viewModel && viewModel.isOffline
   property bool shouldShowMediaPlayerName: true
@@ -106,27 +106,27 @@ Item {
         TrackDetails {
           property bool hasLastfmAlbum: (
             canDisplayScrobble
-            && !!viewModel.scrobble.lastfm_track
-            && !!viewModel.scrobble.lastfm_album
+            && !!viewModel.track
+            && !!viewModel.album
           )
           
           id: trackDetails
 
           isCurrentlyScrobbling: canDisplayScrobble && viewModel.isCurrentScrobble
-          title: canDisplayScrobble && viewModel.scrobble.track_title
-          lastfmUrl: hasLastfmTrackData && viewModel.scrobble.lastfm_track.url
-          lastfmGlobalListeners: hasLastfmTrackData && viewModel.scrobble.lastfm_track.global_listeners
-          lastfmGlobalPlays: hasLastfmTrackData && viewModel.scrobble.lastfm_track.global_plays
-          lastfmPlays: hasLastfmTrackData && viewModel.scrobble.lastfm_track.plays
-          lastfmTags: hasLastfmTrackData && viewModel.scrobble.lastfm_track.tags
-          artistName: canDisplayScrobble && viewModel.scrobble.artist_name
-          artistLastfmUrl: hasLastfmTrackData && viewModel.scrobble.lastfm_track.artist_link.url
-          albumTitle: canDisplayScrobble && viewModel.scrobble.album_title
-          albumLastfmUrl: hasLastfmAlbum && viewModel.scrobble.lastfm_album.url
+          title: canDisplayScrobble && viewModel.trackTitle
+          lastfmUrl: hasLastfmTrackData && viewModel.track.url
+          lastfmGlobalListeners: hasLastfmTrackData && viewModel.track.global_listeners
+          lastfmGlobalPlays: hasLastfmTrackData && viewModel.track.global_plays
+          lastfmPlays: hasLastfmTrackData && viewModel.track.plays
+          lastfmTags: hasLastfmTrackData && viewModel.track.tags
+          artistName: canDisplayScrobble && viewModel.artistName
+          artistLastfmUrl: hasLastfmTrackData && viewModel.track.artist_link.url
+          albumTitle: canDisplayScrobble && viewModel.albumTitle
+          albumLastfmUrl: hasLastfmAlbum && viewModel.album.url
           albumImageUrl: (
             canDisplayScrobble
-            && !!viewModel.scrobble.image_set
-            && viewModel.scrobble.image_set.medium_url
+            && !!viewModel.images
+            && viewModel.images.medium_url
           )
           isTrackNotFound: root.isTrackNotFound
           isPlayerPaused: viewModel && viewModel.isPlayerPaused
@@ -138,19 +138,19 @@ Item {
         ArtistDetails {
           // visible: !isTrackNotFound
 
-          name: canDisplayScrobble && viewModel.scrobble.artist_name
-          bio: hasLastfmArtistData && viewModel.scrobble.lastfm_artist.bio
-          lastfmUrl: hasLastfmArtistData && viewModel.scrobble.lastfm_artist.url
+          name: canDisplayScrobble && viewModel.artistName
+          bio: hasLastfmArtistData && viewModel.artist.bio
+          lastfmUrl: hasLastfmArtistData && viewModel.artist.url
           lastfmGlobalListeners: (
-            hasLastfmArtistData && viewModel.scrobble.lastfm_artist.global_listeners
+            hasLastfmArtistData && viewModel.artist.global_listeners
           )
           lastfmGlobalPlays: (
-            hasLastfmArtistData && viewModel.scrobble.lastfm_artist.global_plays
+            hasLastfmArtistData && viewModel.artist.global_plays
           )
-          lastfmPlays: hasLastfmArtistData && viewModel.scrobble.lastfm_artist.plays
-          lastfmTags: hasLastfmArtistData ? viewModel.scrobble.lastfm_artist.tags : []
-          spotifyArtists: canDisplayScrobble && viewModel.scrobble.spotify_artists
-          isReadMoreLinkVisible: hasLastfmArtistData && viewModel.scrobble.lastfm_artist.bio
+          lastfmPlays: hasLastfmArtistData && viewModel.artist.plays
+          lastfmTags: hasLastfmArtistData ? viewModel.artist.tags : []
+          spotifyArtists: canDisplayScrobble && viewModel.spotifyArtists
+          isReadMoreLinkVisible: hasLastfmArtistData && viewModel.artist.bio
           hasLastfmData: hasLastfmArtistData
           isInMiniMode: root.isInMiniMode
 
@@ -163,7 +163,7 @@ Item {
           visible: (
             !isInMiniMode
             && hasLastfmArtistData
-            && viewModel.scrobble.lastfm_artist.similar_artists.length
+            && viewModel.artist.similar_artists.length
           )
 
           width: column.width
@@ -217,7 +217,7 @@ Item {
             }
 
             Repeater {
-              model: hasLastfmArtistData && viewModel.scrobble.lastfm_artist.similar_artists
+              model: hasLastfmArtistData && viewModel.artist.similar_artists
 
               delegate: Tag {
                 name: modelData.name